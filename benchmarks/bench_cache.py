@@ -0,0 +1,94 @@
+import functools
+import random
+import sys
+from collections import OrderedDict
+
+from benchmarks.common import best_of, parse_sizes, peak_memory, print_table
+from look_up.cache import LFUCache, LRUCache, TTLCache, memoize
+
+"""
+    get-or-put on a Zipf-like key stream (80% of the requests hit 20% of the keys) for caches
+    holding 10% of the keys: LRUCache, LFUCache and TTLCache against an OrderedDict LRU, plus
+    memoize against functools.lru_cache on the same stream. Peak memory is measured while
+    filling a cache with n entries.
+    Run with `python -m benchmarks.bench_cache 1000000`.
+"""
+
+def key_stream(n, seed):
+    rng = random.Random(seed)
+    hot = max(1, n // 5)
+    return [rng.randrange(hot) if rng.random() < 0.8 else rng.randrange(n) for _ in range(n)]
+
+
+def ordered_dict_lru(capacity, keys):
+    cache, hits = OrderedDict(), 0
+    for key in keys:
+        if key in cache:
+            cache.move_to_end(key)
+            hits += 1
+        else:
+            cache[key] = key
+            if len(cache) > capacity:
+                cache.popitem(last=False)
+    return hits
+
+
+def structure(cache, keys):
+    get, put, missing = cache.get, cache.put, object()
+    for key in keys:
+        if get(key, missing) is missing:
+            put(key, key)
+    return cache.hits
+
+
+def fill(make, n):
+    cache = make(n)
+    for key in range(n):
+        cache.put(key, key)
+    return cache
+
+
+def fill_ordered_dict(n):
+    cache = OrderedDict()
+    for key in range(n):
+        cache[key] = key
+    return cache
+
+
+def main(sizes) -> None:
+    rows = []
+    for n in sizes:
+        keys = key_stream(n, n)
+        capacity = max(1, n // 10)
+        candidates = [
+            ('OrderedDict LRU', lambda: ordered_dict_lru(capacity, keys), lambda: fill_ordered_dict(n)),
+            ('LRUCache', lambda: structure(LRUCache(capacity), keys), lambda: fill(LRUCache, n)),
+            ('LFUCache', lambda: structure(LFUCache(capacity), keys), lambda: fill(LFUCache, n)),
+            ('TTLCache', lambda: structure(TTLCache(capacity, ttl=3600), keys),
+             lambda: fill(lambda size: TTLCache(size, ttl=3600), n)),
+        ]
+        for name, run, build in candidates:
+            hits = run()
+            seconds = best_of(run, repeat=1)
+            _, peak = peak_memory(build)
+            rows.append((name, n, capacity, hits / n, seconds, peak / n))
+
+        def memoized(decorate):
+            fn = decorate(lambda x: x)
+            for key in keys:
+                fn(key)
+            return fn
+        for name, decorate in (('functools.lru_cache', functools.lru_cache(maxsize=capacity)),
+                               ('memoize(lru)', memoize(maxsize=capacity)),
+                               ('memoize(lru, thread_safe)', memoize(maxsize=capacity, thread_safe=True)),
+                               ('memoize(lfu)', memoize(maxsize=capacity, policy='lfu'))):
+            fn = memoized(decorate)
+            info = fn.cache_info()
+            hits = info.hits if hasattr(info, 'hits') else info['hits']
+            seconds = best_of(lambda: memoized(decorate), repeat=1)
+            rows.append((name, n, capacity, hits / n, seconds, ''))
+    print_table(('cache', 'requests', 'capacity', 'hit rate', 'seconds', 'bytes/entry'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**5, 10**6)))
@@ -0,0 +1,58 @@
+import queue
+import sys
+import threading
+import time
+
+from benchmarks.common import parse_sizes, print_table
+from priority_queue.concurrent_heap import ConcurrentRemovableHeapQ
+
+"""
+    Contention benchmark of ConcurrentRemovableHeapQ against queue.PriorityQueue with the same
+    number of producer and consumer threads. The churn rows also remove every other item before it
+    is consumed, which queue.PriorityQueue cannot do at all.
+    Run with `python -m benchmarks.bench_concurrent_heap 200000`.
+"""
+
+def run(q, items, threads, remove):
+    per_thread = items // threads
+    consumed = [0] * threads
+
+    def produce(offset):
+        for i in range(offset, offset + per_thread):
+            q.put(i)
+            if remove and i % 2:
+                q.remove(i)
+
+    def consume(index):
+        while True:
+            try:
+                q.get(timeout=0.1)
+            except queue.Empty:
+                return
+            consumed[index] += 1
+
+    workers = [threading.Thread(target=produce, args=(t * per_thread,)) for t in range(threads)]
+    workers += [threading.Thread(target=consume, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    # Consumers wait one timeout before noticing the end of the stream
+    return time.perf_counter() - start - 0.1, sum(consumed)
+
+
+def main(sizes) -> None:
+    rows = []
+    for items in sizes:
+        for threads in (1, 2, 4, 8):
+            for name, make, remove in (('PriorityQueue', queue.PriorityQueue, False),
+                                       ('ConcurrentRemovableHeapQ', ConcurrentRemovableHeapQ, False),
+                                       ('ConcurrentRemovableHeapQ churn', ConcurrentRemovableHeapQ, True)):
+                seconds, consumed = run(make(), items, threads, remove)
+                rows.append((name, threads, items, consumed, items / seconds))
+    print_table(('queue', 'threads per side', 'puts', 'gets', 'puts/s'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (200000,)))
@@ -0,0 +1,95 @@
+import heapq
+import random
+import sys
+
+from benchmarks.common import best_of, parse_sizes, print_table
+from priority_queue.heap_engines import ENGINES, make_engine
+
+"""
+    Runs the same operation traces through every priority queue engine and checks that they all
+    pop the same items, so the fastest engine can be picked per workload. Traces:
+    dijkstra - monotone integer priorities, pops interleaved with adds of popped + weight
+    churn    - random priorities where most added items are removed before they are popped
+    fill     - add everything, then pop everything
+    ties     - fill with only 10 distinct priorities, so most pops break a tie
+    Run with `python -m benchmarks.bench_heap_engines 1000000`.
+"""
+
+def dijkstra_trace(n, rng):
+    # A plain heap follows the trace so that new priorities build on the really popped one
+    trace, frontier = [], []
+    for step in range(n // 4):
+        item = (rng.randrange(100), step)
+        heapq.heappush(frontier, item)
+        trace.append(('add', item))
+    step = n // 4
+    while len(trace) < n and frontier:
+        last = heapq.heappop(frontier)[0]
+        trace.append(('pop', None))
+        for _ in range(rng.randrange(3)):
+            step += 1
+            item = (last + rng.randrange(1, 100), step)
+            heapq.heappush(frontier, item)
+            trace.append(('add', item))
+    return trace
+
+
+def churn_trace(n, rng):
+    trace, live = [], []
+    for step in range(n):
+        roll = rng.random()
+        if roll < 0.5 or not live:
+            item = (rng.randrange(10**9), step)
+            live.append(item)
+            trace.append(('add', item))
+        elif roll < 0.9:
+            index = rng.randrange(len(live))
+            live[index], live[-1] = live[-1], live[index]
+            trace.append(('remove', live.pop()))
+        else:
+            trace.append(('pop', None))
+    return trace
+
+
+def fill_trace(n, rng):
+    return [('add', (rng.randrange(10**9), i)) for i in range(n // 2)] + [('pop', None)] * (n // 2)
+
+
+def ties_trace(n, rng):
+    return [('add', (rng.randrange(10), i)) for i in range(n // 2)] + [('pop', None)] * (n // 2)
+
+
+def replay(engine, trace):
+    add, remove, pop = engine.add, engine.remove, engine.pop
+    popped = []
+    for op, item in trace:
+        if op == 'add':
+            add(item)
+        elif op == 'remove':
+            remove(item)
+        else:
+            popped.append(pop())
+    return popped
+
+
+def main(sizes) -> None:
+    rows = []
+    for n in sizes:
+        for trace_name, build in (('dijkstra', dijkstra_trace), ('churn', churn_trace), ('fill', fill_trace),
+                                    ('ties', ties_trace)):
+            trace = build(n, random.Random(n))
+            expected = None
+            for name in ENGINES:
+                if name == 'radix' and trace_name not in ('dijkstra', 'ties'):
+                    # Non monotone traces are outside what a radix heap supports
+                    continue
+                popped = replay(make_engine(name), trace)
+                expected = expected or popped
+                assert popped == expected, f'{name} diverged on {trace_name}'
+                seconds = best_of(lambda: replay(make_engine(name), trace), repeat=1)
+                rows.append((trace_name, name, n, seconds, n / seconds))
+    print_table(('trace', 'engine', 'ops', 'seconds', 'ops/s'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**5, 10**6)))
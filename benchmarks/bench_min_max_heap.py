@@ -0,0 +1,72 @@
+import heapq
+import random
+import sys
+
+from benchmarks.common import best_of, parse_sizes, print_table
+from priority_queue.min_max_heap import MinMaxHeapQ
+from priority_queue.removable_heap import RemovableHeapQ
+
+"""
+    Streaming top-N maintenance: n random updates into a catalog bounded to N items that needs both
+    ends (the cheapest and the most expensive live item). MinMaxHeapQ with a capacity against two
+    mirrored RemovableHeapQs (one holding negated keys) masked in sync, the former approach, and
+    against heapq.heappushpop, which keeps the top N but cannot answer the maximum or remove.
+    Run with `python -m benchmarks.bench_min_max_heap 1000000`.
+"""
+
+def min_max(items, capacity):
+    heap = MinMaxHeapQ(capacity=capacity)
+    for item in items:
+        heap.add(item)
+        heap.peek_max()
+    return heap
+
+
+def mirrored(items, capacity):
+    low, high = RemovableHeapQ(), RemovableHeapQ()
+    size = 0
+    for item in items:
+        if size == capacity:
+            worst = low.peek_k(1)[0]
+            if not worst < item:
+                continue
+            low.pop()
+            high.remove((-worst[0], worst[1]))
+            size -= 1
+        low.add(item)
+        high.add((-item[0], item[1]))
+        size += 1
+        high.peek_k(1)
+    return low
+
+
+def heapq_top_n(items, capacity):
+    heap = []
+    for item in items:
+        if len(heap) < capacity:
+            heapq.heappush(heap, item)
+        elif heap[0] < item:
+            heapq.heappushpop(heap, item)
+    return heap
+
+
+def main(sizes) -> None:
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        items = [(rng.random(), i) for i in range(n)]
+        for capacity in (1000, 100000):
+            expected = sorted(heapq_top_n(items, capacity))
+            for name, run in (('MinMaxHeapQ(capacity)', min_max), ('mirrored RemovableHeapQ', mirrored),
+                              ('heapq.heappushpop (min only)', heapq_top_n)):
+                result = run(items, capacity)
+                kept = result.heap if not isinstance(result, list) else result
+                assert sorted(item for item in kept if not isinstance(result, RemovableHeapQ)
+                              or item not in result.masked) == expected
+                seconds = best_of(lambda: run(items, capacity), repeat=1)
+                rows.append((name, n, capacity, seconds, n / seconds))
+    print_table(('structure', 'updates', 'N', 'seconds', 'updates/s'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**5, 10**6)))
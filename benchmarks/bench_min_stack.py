@@ -0,0 +1,54 @@
+import random
+import sys
+
+from benchmarks.common import best_of, parse_sizes, peak_memory, print_table
+from queue_and_stack.min_stack import CompactMinStack, MinStack
+
+"""
+    Peak memory (tracemalloc) and push time of MinStack against CompactMinStack, with list and
+    typed array storage, on increasing, decreasing and random sequences. The plain rows use the
+    defaults (min only). The +max rows also track the max, which on an increasing sequence changes
+    on every push and then costs more than MinStack.
+    Run with `python -m benchmarks.bench_min_stack 10000000`.
+"""
+
+def fill_min_stack(values):
+    stack = MinStack()
+    for value in values:
+        stack.push(value)
+    return stack
+
+
+def fill_compact(values, typecode=None, **options):
+    stack = CompactMinStack(typecode=typecode, **options)
+    stack.push_many(values)
+    return stack
+
+
+def sequences(n):
+    rng = random.Random(n)
+    yield 'increasing', range(n)
+    yield 'decreasing', range(n, 0, -1)
+    yield 'random', [rng.randrange(2**40) for _ in range(n)]
+
+
+def main(sizes) -> None:
+    rows = []
+    for n in sizes:
+        for name, values in sequences(n):
+            values = list(values)
+            for label, fill in (('MinStack', fill_min_stack),
+                                ('CompactMinStack', fill_compact),
+                                ("CompactMinStack('q')", lambda v: fill_compact(v, 'q')),
+                                ("CompactMinStack('q') +max", lambda v: fill_compact(v, 'q', track_max=True)),
+                                ('CompactMinStack +max', lambda v: fill_compact(v, track_max=True))):
+                stack, peak = peak_memory(lambda: fill(values))
+                runs = len(stack.min.values) if isinstance(stack, CompactMinStack) else len(stack.min)
+                del stack
+                seconds = best_of(lambda: fill(values), repeat=1)
+                rows.append((name, n, label, runs, peak / 2**20, seconds))
+    print_table(('sequence', 'values', 'stack', 'min entries', 'peak MiB', 'push s'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**6,)))
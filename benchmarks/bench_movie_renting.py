@@ -0,0 +1,64 @@
+import random
+import sys
+
+from benchmarks.common import best_of, parse_sizes, print_table
+from priority_queue import example_removable_heap, example_sorted_list
+
+"""
+    Query throughput of both MovieRentingSystem implementations on a catalog of random entries:
+    the RemovableHeapQ based one, whose read only queries use peek_k, and the SortedList based one.
+    pop_push_report() reproduces the former pop five and push them back approach on the heap
+    system as a baseline.
+    Run with `python -m benchmarks.bench_movie_renting 1000000`.
+"""
+
+def build_catalog(n, movies, seed):
+    rng = random.Random(seed)
+    entries = {}
+    while len(entries) < n:
+        entries[(rng.randrange(n // 10 + 1), rng.randrange(movies))] = rng.randrange(1, 10**4)
+    return [[shop, movie, price] for (shop, movie), price in entries.items()]
+
+
+def pop_push_report(system):
+    found = []
+    for _ in range(5):
+        res = system.cheapestRentedHeapQ.pop()
+        if not res:
+            break
+        found.append(res)
+    for item in found:
+        system.cheapestRentedHeapQ.add(item)
+    return [(shop, movie) for _, shop, movie in found]
+
+
+def rent_and_drop(system, rented):
+    for shop, movie, _ in rented:
+        system.rent(shop, movie)
+    # Drop half of them again so the heap system carries masked entries
+    for shop, movie, _ in rented[::2]:
+        system.drop(shop, movie)
+
+
+def main(sizes) -> None:
+    rows = []
+    for n in sizes:
+        entries = build_catalog(n, 1000, n)
+        rng = random.Random(1)
+        rented = rng.sample(entries, n // 10)
+        queries = 10**5
+        movies = [rng.randrange(1000) for _ in range(queries)]
+        for module in (example_removable_heap, example_sorted_list):
+            system = module.MovieRentingSystem(n, entries)
+            updates = best_of(lambda: rent_and_drop(system, rented), repeat=1)
+            search = best_of(lambda: [system.search(movie) for movie in movies], repeat=1)
+            report = best_of(lambda: [system.report() for _ in range(queries)], repeat=1)
+            rows.append((module.__name__.split('.')[-1], n, 1.5 * len(rented) / updates,
+                         queries / search, queries / report))
+            if module is example_removable_heap:
+                baseline = best_of(lambda: [pop_push_report(system) for _ in range(queries)], repeat=1)
+                rows.append(('pop+push report baseline', n, '', '', queries / baseline))
+    print_table(('system', 'entries', 'rent+drop ops/s', 'search q/s', 'report q/s'), rows)
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**5, 10**6)))
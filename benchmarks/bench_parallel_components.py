@@ -0,0 +1,32 @@
+import random
+import sys
+import time
+from array import array
+
+from benchmarks.common import parse_sizes, print_table
+from look_up.parallel_components import connected_components
+
+"""
+    Scaling of connected_components() with 1, 2, 4 and 8 worker processes on random graphs with
+    as many edges as nodes. Speedups are bounded by the number of cores of the machine, so record
+    os.cpu_count() next to the numbers. Run with `python -m benchmarks.bench_parallel_components 10000000`.
+"""
+
+def main(sizes) -> None:
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        xs = array('q', (rng.randrange(n) for _ in range(n)))
+        ys = array('q', (rng.randrange(n) for _ in range(n)))
+        baseline = None
+        for workers in (1, 2, 4, 8):
+            start = time.perf_counter()
+            connected_components(n, xs, ys, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            rows.append((n, workers, elapsed, baseline / elapsed))
+    print_table(('nodes', 'workers', 'seconds', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**6,)))
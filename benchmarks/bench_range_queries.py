@@ -0,0 +1,110 @@
+import itertools
+import random
+import sys
+
+from benchmarks.common import best_of, parse_sizes, print_table
+from look_up.fenwick_tree import FenwickTree, RangeFenwickTree
+from look_up.segment_tree import ADD, ADD_TO_SUM, MIN, SUM, LazySegmentTree
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+"""
+    Range sums over n values with point and range updates: rescanning a list, prefix sums from
+    itertools.accumulate (rebuilt after every update), FenwickTree, RangeFenwickTree and
+    LazySegmentTree, plus range min on the segment tree against min() over a slice.
+    Naive rows run fewer operations, every row reports microseconds per operation.
+    Run with `python -m benchmarks.bench_range_queries 10000000`.
+"""
+
+def per_op(seconds, ops):
+    return seconds / ops * 1e6
+
+
+def main(sizes) -> None:
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        values = [rng.randrange(1000) for _ in range(n)]
+        batch = np.array(values, dtype=np.int64) if np is not None else values
+        ranges = []
+        for _ in range(10**4):
+            lo, hi = sorted((rng.randrange(n + 1), rng.randrange(n + 1)))
+            ranges.append((lo, hi))
+        los, his = [lo for lo, _ in ranges], [hi for _, hi in ranges]
+        points = [rng.randrange(n) for _ in range(10**4)]
+
+        accumulate_build = best_of(lambda: list(itertools.accumulate(values, initial=0)), repeat=1)
+        fenwick_build = best_of(lambda: FenwickTree(batch), repeat=1)
+        segment_build = best_of(lambda: LazySegmentTree(batch, SUM, ADD_TO_SUM, typecode='q'), repeat=1)
+        rows.append(('build', 'itertools.accumulate', n, 1, accumulate_build * 1e6))
+        rows.append(('build', 'FenwickTree', n, 1, fenwick_build * 1e6))
+        rows.append(('build', 'LazySegmentTree', n, 1, segment_build * 1e6))
+
+        few = ranges[:20]
+        naive = best_of(lambda: [sum(values[lo:hi]) for lo, hi in few], repeat=1)
+        prefix = list(itertools.accumulate(values, initial=0))
+        static = best_of(lambda: [prefix[hi] - prefix[lo] for lo, hi in ranges], repeat=1)
+        fenwick, segment = FenwickTree(batch), LazySegmentTree(batch, SUM, ADD_TO_SUM, typecode='q')
+        scalar = best_of(lambda: [fenwick.range_sum(lo, hi) for lo, hi in ranges], repeat=1)
+        batched = best_of(lambda: fenwick.query_many(los, his), repeat=1)
+        segment_query = best_of(lambda: [segment.query(lo, hi) for lo, hi in ranges], repeat=1)
+        rows.append(('range sum', 'sum(slice)', n, len(few), per_op(naive, len(few))))
+        rows.append(('range sum', 'accumulate prefix (static)', n, len(ranges), per_op(static, len(ranges))))
+        rows.append(('range sum', 'FenwickTree.range_sum', n, len(ranges), per_op(scalar, len(ranges))))
+        rows.append(('range sum', 'FenwickTree.query_many', n, len(ranges), per_op(batched, len(ranges))))
+        rows.append(('range sum', 'LazySegmentTree.query', n, len(ranges), per_op(segment_query, len(ranges))))
+
+        # Alternating point update and range sum, where prefix sums must be rebuilt every time
+        def rebuild_prefix(ops):
+            for (lo, hi), i in ops:
+                values[i] += 1
+                rebuilt = list(itertools.accumulate(values, initial=0))
+                rebuilt[hi] - rebuilt[lo]
+        def fenwick_mixed(ops):
+            for (lo, hi), i in ops:
+                fenwick.add(i, 1)
+                fenwick.range_sum(lo, hi)
+        mixed = list(zip(ranges, points))
+        rebuild = best_of(lambda: rebuild_prefix(mixed[:3]), repeat=1)
+        dynamic = best_of(lambda: fenwick_mixed(mixed), repeat=1)
+        batched_updates = best_of(lambda: fenwick.update_many(points, [1] * len(points)), repeat=1)
+        rows.append(('update+sum', 'accumulate rebuild', n, 3, per_op(rebuild, 3)))
+        rows.append(('update+sum', 'FenwickTree', n, len(mixed), per_op(dynamic, len(mixed))))
+        rows.append(('point update', 'FenwickTree.update_many', n, len(points), per_op(batched_updates, len(points))))
+
+        # Range add + range sum / range min
+        ranged = RangeFenwickTree(batch)
+        def range_fenwick(ops):
+            for lo, hi in ops:
+                ranged.add(lo, hi, 1)
+                ranged.range_sum(lo, hi)
+        def segment_sum(ops):
+            for lo, hi in ops:
+                segment.update(lo, hi, 1)
+                segment.query(lo, hi)
+        def naive_add(ops):
+            for lo, hi in ops:
+                values[lo:hi] = [value + 1 for value in values[lo:hi]]
+                sum(values[lo:hi])
+        rows.append(('range add+sum', 'list slices', n, 3, per_op(best_of(lambda: naive_add(few[:3]), repeat=1), 3)))
+        rows.append(('range add+sum', 'RangeFenwickTree', n, len(ranges),
+                     per_op(best_of(lambda: range_fenwick(ranges), repeat=1), len(ranges))))
+        rows.append(('range add+sum', 'LazySegmentTree', n, len(ranges),
+                     per_op(best_of(lambda: segment_sum(ranges), repeat=1), len(ranges))))
+        minimum = LazySegmentTree(batch, MIN, ADD, typecode='d')
+        def segment_min(ops):
+            for lo, hi in ops:
+                minimum.update(lo, hi, 1)
+                minimum.query(lo, hi)
+        naive_min = best_of(lambda: [min(values[lo:hi], default=None) for lo, hi in few], repeat=1)
+        rows.append(('range min', 'min(slice)', n, len(few), per_op(naive_min, len(few))))
+        rows.append(('range add+min', 'LazySegmentTree', n, len(ranges),
+                     per_op(best_of(lambda: segment_min(ranges), repeat=1), len(ranges))))
+    print_table(('workload', 'method', 'values', 'ops', 'us/op'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**6,)))
@@ -0,0 +1,63 @@
+import random
+import sys
+
+from benchmarks.common import best_of, parse_sizes, print_table
+from priority_queue.indexed_heap import IndexedHeapQ
+from priority_queue.removable_heap import RemovableHeapQ
+
+"""
+    Heavy remove churn on RemovableHeapQ for several compaction thresholds, next to IndexedHeapQ.
+    Most removed items never reach the top, which is the case that made the lazy heap grow.
+    Run with `python -m benchmarks.bench_removable_heap 1000000`.
+"""
+
+def churn(heap, operations):
+    for op, item in operations:
+        if op == 0:
+            heap.add(item)
+        elif op == 1:
+            heap.remove(item)
+        else:
+            heap.pop()
+    return heap
+
+
+def build_operations(n, seed):
+    rng = random.Random(seed)
+    live, operations = [], []
+    for step in range(n):
+        roll = rng.random()
+        if roll < 0.5 or not live:
+            item = (rng.random(), step)
+            live.append(item)
+            operations.append((0, item))
+        elif roll < 0.95:
+            index = rng.randrange(len(live))
+            live[index], live[-1] = live[-1], live[index]
+            operations.append((1, live.pop()))
+        else:
+            operations.append((2, None))
+    return operations
+
+
+def main(sizes) -> None:
+    rows = []
+    for n in sizes:
+        operations = build_operations(n, n)
+        candidates = [('RemovableHeapQ', None), ('RemovableHeapQ', 0.75), ('RemovableHeapQ', 0.5),
+                      ('RemovableHeapQ', 0.25), ('IndexedHeapQ', None)]
+        for name, threshold in candidates:
+            make = (lambda: RemovableHeapQ(compaction_threshold=threshold)) if name == 'RemovableHeapQ' \
+                else IndexedHeapQ
+            seconds = best_of(lambda: churn(make(), operations), repeat=1)
+            heap = churn(make(), operations)
+            stats = heap.stats() if name == 'RemovableHeapQ' else \
+                {'heap_size': len(heap.heap), 'compaction_count': 0, 'compaction_seconds': 0.0}
+            rows.append((name, threshold, n, seconds, len(heap), stats['heap_size'],
+                         stats['compaction_count'], stats['compaction_seconds']))
+    print_table(('structure', 'threshold', 'ops', 'seconds', 'live', 'heap size', 'compactions',
+                 'compaction s'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**5, 10**6)))
@@ -0,0 +1,43 @@
+import sys
+from array import array
+from collections import deque
+
+from benchmarks.common import best_of, parse_sizes, print_table
+from queue_and_stack.ring_buffer import RingBuffer
+
+"""
+    Throughput of RingBuffer against collections.deque when telemetry arrives in bursts: batches
+    of `burst` floats are written and then drained in batches of the same size.
+    Run with `python -m benchmarks.bench_ring_buffer 10000000`.
+"""
+
+def run_deque(total, burst):
+    queue = deque()
+    batch = array('d', range(burst))
+    for _ in range(total // burst):
+        queue.extend(batch)
+        [queue.popleft() for _ in range(burst)]
+
+
+def run_ring(total, burst, typecode):
+    ring = RingBuffer(burst, typecode=typecode)
+    batch = array('d', range(burst)) if typecode else list(map(float, range(burst)))
+    for _ in range(total // burst):
+        ring.extend(batch)
+        ring.pop_many(burst)
+
+
+def main(sizes) -> None:
+    rows = []
+    for total in sizes:
+        for burst in (16, 256, 4096):
+            deque_seconds = best_of(lambda: run_deque(total, burst), repeat=1)
+            rows.append(('deque', burst, total / deque_seconds))
+            for typecode in (None, 'd'):
+                seconds = best_of(lambda: run_ring(total, burst, typecode), repeat=1)
+                rows.append((f'RingBuffer typecode={typecode}', burst, total / seconds))
+    print_table(('structure', 'burst', 'items/s'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**6,)))
@@ -0,0 +1,81 @@
+import multiprocessing
+import sys
+import time
+
+from benchmarks.common import parse_sizes, print_table
+from queue_and_stack.circular_queue import SharedCircularQueue
+
+"""
+    Messages/sec and latency percentiles of SharedCircularQueue against multiprocessing.Queue for
+    one producer process and one consumer (this process). Every message carries the
+    time.perf_counter_ns() of its send, which is a system wide monotonic clock on Linux.
+    Run with `python -m benchmarks.bench_shared_queue 1000000`.
+"""
+
+def produce_shared(name, count):
+    queue = SharedCircularQueue.attach(name)
+    put, clock, sent = queue.put, time.perf_counter_ns, 0
+    while sent < count:
+        if put(sent, clock()):
+            sent += 1
+        else:
+            time.sleep(0)
+    queue.close()
+
+
+def produce_mp(queue, count):
+    for sent in range(count):
+        queue.put((sent, time.perf_counter_ns()))
+
+
+def percentiles(latencies):
+    latencies.sort()
+    return [latencies[int(len(latencies) * q)] / 1000 for q in (0.5, 0.9, 0.99)] + [latencies[-1] / 1000]
+
+
+def consume_shared(count):
+    queue = SharedCircularQueue(4096, record_format='<qq')
+    try:
+        producer = multiprocessing.Process(target=produce_shared, args=(queue.name, count))
+        start = time.perf_counter()
+        producer.start()
+        latencies, get, clock = [], queue.get, time.perf_counter_ns
+        while len(latencies) < count:
+            record = get()
+            if record is None:
+                time.sleep(0)
+                continue
+            latencies.append(clock() - record[1])
+        elapsed = time.perf_counter() - start
+        producer.join()
+        return elapsed, latencies
+    finally:
+        queue.close()
+        queue.unlink()
+
+
+def consume_mp(count):
+    queue = multiprocessing.Queue(4096)
+    producer = multiprocessing.Process(target=produce_mp, args=(queue, count))
+    start = time.perf_counter()
+    producer.start()
+    latencies, clock = [], time.perf_counter_ns
+    for _ in range(count):
+        _, sent = queue.get()
+        latencies.append(clock() - sent)
+    elapsed = time.perf_counter() - start
+    producer.join()
+    return elapsed, latencies
+
+
+def main(sizes) -> None:
+    rows = []
+    for count in sizes:
+        for name, consume in (('multiprocessing.Queue', consume_mp), ('SharedCircularQueue', consume_shared)):
+            elapsed, latencies = consume(count)
+            rows.append((name, count, count / elapsed, *percentiles(latencies)))
+    print_table(('queue', 'messages', 'msg/s', 'p50 us', 'p90 us', 'p99 us', 'max us'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**5, 10**6)))
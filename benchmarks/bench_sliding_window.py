@@ -0,0 +1,44 @@
+import random
+import sys
+
+from benchmarks.common import best_of, parse_sizes, print_table
+from queue_and_stack.sliding_window import SlidingWindow, rolling
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+"""
+    Rolling min and sum with naive per window recomputation, the streaming SlidingWindow and the
+    batch rolling() (vectorized when NumPy is installed).
+    Run with `python -m benchmarks.bench_sliding_window 1000000`.
+"""
+
+def naive(values, window, fold):
+    return [fold(values[i:i + window]) for i in range(len(values) - window + 1)]
+
+
+def streaming(values, window, op):
+    sliding = SlidingWindow(window, op)
+    return [sliding.push(value) for value in values]
+
+
+def main(sizes) -> None:
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        values = [rng.randrange(10**6) for _ in range(n)]
+        batch = np.array(values) if np is not None else values
+        for window in (16, 256):
+            for op, fold in (('min', min), ('sum', sum)):
+                naive_seconds = best_of(lambda: naive(values, window, fold), repeat=1)
+                stream_seconds = best_of(lambda: streaming(values, window, op), repeat=1)
+                batch_seconds = best_of(lambda: rolling(batch, window, op), repeat=1)
+                rows.append((op, n, window, naive_seconds, stream_seconds, batch_seconds,
+                             naive_seconds / batch_seconds))
+    print_table(('op', 'values', 'window', 'naive s', 'SlidingWindow s', 'rolling s', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**5, 10**6)))
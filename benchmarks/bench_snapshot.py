@@ -0,0 +1,83 @@
+import os
+import pickle
+import random
+import sys
+import tempfile
+
+from benchmarks.common import best_of, parse_sizes, print_table
+from look_up.union_find import CompactUnionFind
+from priority_queue.indexed_heap import IndexedHeapQ
+from priority_queue.removable_heap import RemovableHeapQ
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+"""
+    Restoring a CompactUnionFind and the heaps from a snapshot against rebuilding them from their
+    input. The union find is rebuilt with union_many from n random edges and restored with
+    load() (mmap and plain read) and with pickle protocol 5 and out-of-band buffers. The mmap row
+    includes touching every page with one find per 1024 nodes, since mapping alone costs nothing.
+    Run with `python -m benchmarks.bench_snapshot 10000000`.
+"""
+
+def build_union_find(n, xs, ys):
+    uf = CompactUnionFind(n)
+    uf.union_many(xs, ys)
+    return uf
+
+
+def touch(uf):
+    for x in range(0, len(uf), 1024):
+        uf.find(x)
+    return uf
+
+
+def build_heap(make, items):
+    heap = make()
+    for item in items:
+        heap.add(item)
+    return heap
+
+
+def main(sizes) -> None:
+    rows = []
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        for n in sizes:
+            rng = random.Random(n)
+            if np is not None:
+                edges = np.random.default_rng(n).integers(0, n, size=(2, n))
+                xs, ys = edges[0], edges[1]
+            else:
+                xs = [rng.randrange(n) for _ in range(n)]
+                ys = [rng.randrange(n) for _ in range(n)]
+            uf = build_union_find(n, xs, ys)
+            uf.dump(path)
+            buffers = []
+            data = pickle.dumps(uf, protocol=5, buffer_callback=buffers.append)
+            raw = [bytearray(buffer.raw()) for buffer in buffers]
+            rebuild = best_of(lambda: build_union_find(n, xs, ys), repeat=1)
+            for label, restore in (('load(mmap)', lambda: touch(CompactUnionFind.load(path))),
+                                   ('load(read)', lambda: CompactUnionFind.load(path, use_mmap=False)),
+                                   ('pickle 5 out-of-band', lambda: pickle.loads(data, buffers=raw))):
+                seconds = best_of(restore, repeat=3)
+                rows.append(('CompactUnionFind', n, label, rebuild, seconds, rebuild / seconds))
+            del uf, buffers, raw
+
+            items = [(rng.random(), i) for i in range(n // 10)]
+            for make in (RemovableHeapQ, IndexedHeapQ):
+                heap = build_heap(make, items)
+                data = pickle.dumps(heap, protocol=5)
+                rebuild = best_of(lambda: build_heap(make, items), repeat=1)
+                seconds = best_of(lambda: pickle.loads(data), repeat=1)
+                rows.append((make.__name__, len(items), 'pickle', rebuild, seconds, rebuild / seconds))
+    finally:
+        os.remove(path)
+    print_table(('structure', 'size', 'restore', 'rebuild s', 'restore s', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**6, 10**7)))
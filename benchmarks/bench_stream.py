@@ -0,0 +1,92 @@
+import collections
+import heapq
+import random
+import sys
+
+from benchmarks.common import best_of, parse_sizes, peak_memory, print_table
+from priority_queue.removable_heap import RemovableHeapQ
+from priority_queue.stream import TopK, TopKArray, merge, np
+
+"""
+    Streaming pipelines over n generated values, which are never held in a list. A k-way merge of
+    64 sorted sources with stream.merge and heapq.merge against loading every value into a
+    RemovableHeapQ and popping it empty, and the top 100 of a random stream with TopK,
+    heapq.nlargest, TopKArray over NumPy batches and the load-everything RemovableHeapQ.
+    Peak memory is measured with tracemalloc. Run with `python -m benchmarks.bench_stream 1000000`.
+"""
+
+SOURCES = 64
+K = 100
+BATCH = 65536
+
+
+def sources(n):
+    # Every source is an ascending run of random steps, generated lazily
+    def source(seed, count):
+        rng, value = random.Random(seed), 0.0
+        for _ in range(count):
+            value += rng.random()
+            yield value
+    return [source(seed, n // SOURCES) for seed in range(SOURCES)]
+
+
+def values(n):
+    rng = random.Random(n)
+    return (rng.random() for _ in range(n))
+
+
+def drain(iterator):
+    collections.deque(iterator, maxlen=0)
+
+
+def load_all_merge(n):
+    heap = RemovableHeapQ(compaction_threshold=None)
+    for source in sources(n):
+        for value in source:
+            heap.add(value)
+    while heap.pop() is not None:
+        pass
+
+
+def load_all_top_k(n):
+    heap = RemovableHeapQ(compaction_threshold=None)
+    for value in values(n):
+        heap.add(-value)
+    return [-value for value in heap.peek_k(K)]
+
+
+def top_k(n):
+    accumulator = TopK(K)
+    accumulator.extend(values(n))
+    return accumulator.items()
+
+
+def top_k_array(n):
+    accumulator = TopKArray(K)
+    rng = np.random.default_rng(n)
+    for start in range(0, n, BATCH):
+        accumulator.push_batch(rng.random(min(BATCH, n - start)))
+    return accumulator.result()
+
+
+def main(sizes) -> None:
+    rows = []
+    for n in sizes:
+        cases = [('merge', 'stream.merge', lambda: drain(merge(*sources(n)))),
+                 ('merge', 'heapq.merge', lambda: drain(heapq.merge(*sources(n)))),
+                 ('merge', 'RemovableHeapQ load all', lambda: load_all_merge(n)),
+                 ('top 100', 'TopK', lambda: top_k(n)),
+                 ('top 100', 'heapq.nlargest', lambda: heapq.nlargest(K, values(n))),
+                 ('top 100', 'RemovableHeapQ load all', lambda: load_all_top_k(n))]
+        if np is not None:
+            cases.append(('top 100', f'TopKArray, batches of {BATCH}', lambda: top_k_array(n)))
+        assert top_k(n) == heapq.nlargest(K, values(n)) == load_all_top_k(n)
+        for task, name, run in cases:
+            seconds = best_of(run, repeat=1)
+            _, peak = peak_memory(run)
+            rows.append((task, name, n, seconds, n / seconds, peak / 2**20))
+    print_table(('task', 'approach', 'values', 'seconds', 'values/s', 'peak MiB'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**5, 10**6)))
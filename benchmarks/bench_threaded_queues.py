@@ -0,0 +1,69 @@
+import queue
+import sys
+import threading
+import time
+
+from benchmarks.common import parse_sizes, print_table
+from queue_and_stack.threaded_queues import BoundedQueue, SPSCQueue
+
+"""
+    Items/sec and tail latency of SPSCQueue and BoundedQueue against queue.Queue at several thread
+    counts. Every item carries its send time; consumers of BoundedQueue drain with get_many.
+    Run with `python -m benchmarks.bench_threaded_queues 200000`.
+"""
+
+def run(make, producers, consumers, items, batch):
+    q = make()
+    per_producer = items // producers
+    latencies = [[] for _ in range(consumers)]
+    remaining = [per_producer * producers]
+    lock = threading.Lock()
+
+    def produce():
+        clock = time.perf_counter
+        for _ in range(per_producer):
+            q.put(clock())
+
+    def consume(index):
+        clock, out = time.perf_counter, latencies[index]
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+            try:
+                sent = q.get_many(batch, timeout=0.05) if batch else [q.get(timeout=0.05)]
+            except queue.Empty:
+                continue
+            now = clock()
+            out.extend(now - stamp for stamp in sent)
+            with lock:
+                remaining[0] -= len(sent)
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    threads += [threading.Thread(target=consume, args=(i,)) for i in range(consumers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    merged = sorted(latency for part in latencies for latency in part)
+    return len(merged) / elapsed, merged[len(merged) // 2] * 1e6, merged[int(len(merged) * 0.99)] * 1e6
+
+
+def main(sizes) -> None:
+    rows = []
+    for items in sizes:
+        rows.append(('queue.Queue', '1/1', *run(lambda: queue.Queue(1024), 1, 1, items, 0)))
+        rows.append(('SPSCQueue', '1/1', *run(lambda: SPSCQueue(1024), 1, 1, items, 0)))
+        for threads in (1, 2, 4, 8):
+            label = f'{threads}/{threads}'
+            rows.append(('queue.Queue', label, *run(lambda: queue.Queue(1024), threads, threads, items, 0)))
+            rows.append(('BoundedQueue', label, *run(lambda: BoundedQueue(1024), threads, threads, items, 0)))
+            rows.append(('BoundedQueue get_many(64)', label,
+                         *run(lambda: BoundedQueue(1024), threads, threads, items, 64)))
+    print_table(('queue', 'producers/consumers', 'items/s', 'p50 us', 'p99 us'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (200000,)))
@@ -0,0 +1,50 @@
+import random
+import sys
+from array import array
+
+from benchmarks.common import best_of, parse_sizes, peak_memory, print_table
+from look_up.union_find import UnionFind, CompactUnionFind
+
+"""
+    Compares the list based UnionFind with the array based CompactUnionFind: peak memory of
+    construction and time of a random union/find workload, then the edges/sec of union() called
+    per edge against union_many() over the same edge arrays. Pass node counts as arguments,
+    e.g. `python -m benchmarks.bench_union_find 10000000`.
+"""
+
+def run_workload(uf, edges, queries) -> None:
+    for x, y in edges:
+        uf.union(x, y)
+    for x in queries:
+        uf.find(x)
+
+
+def main(sizes) -> None:
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        edges = [(rng.randrange(n), rng.randrange(n)) for _ in range(min(n, 10**6))]
+        queries = [rng.randrange(n) for _ in range(min(n, 10**6))]
+        for cls in (UnionFind, CompactUnionFind):
+            _, peak = peak_memory(lambda: cls(n))
+            build = best_of(lambda: cls(n), repeat=1)
+            uf = cls(n)
+            ops = best_of(lambda: run_workload(uf, edges, queries), repeat=1)
+            rows.append((cls.__name__, n, peak / 2**20, build, ops))
+    print_table(('structure', 'nodes', 'peak MiB', 'build s', 'workload s'), rows)
+    print()
+
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        m = min(n, 10**6)
+        xs = array('q', (rng.randrange(n) for _ in range(m)))
+        ys = array('q', (rng.randrange(n) for _ in range(m)))
+        scalar = best_of(lambda: [uf.union(x, y) for uf in [CompactUnionFind(n)] for x, y in zip(xs, ys)], repeat=1)
+        batched = best_of(lambda: CompactUnionFind(n).union_many(xs, ys), repeat=1)
+        rows.append((n, m, m / scalar, m / batched, scalar / batched))
+    print_table(('nodes', 'edges', 'union edges/s', 'union_many edges/s', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**5, 10**6)))
@@ -0,0 +1,60 @@
+import random
+import sys
+from collections import deque
+
+from benchmarks.common import best_of, parse_sizes, print_table
+from look_up.union_find import WeightedUnionFind
+
+"""
+    Relative offset queries with WeightedUnionFind against the BFS baseline, which groups the
+    nodes first and then walks every component to assign offsets before answering queries.
+    Run with `python -m benchmarks.bench_weighted_union_find 1000000`.
+"""
+
+def bfs_offsets(n, relations, queries):
+    graph = [[] for _ in range(n)]
+    for x, y, w in relations:
+        graph[x].append((y, w))
+        graph[y].append((x, -w))
+    component, offset = [-1] * n, [0] * n
+    for start in range(n):
+        if component[start] != -1:
+            continue
+        component[start] = start
+        frontier = deque([start])
+        while frontier:
+            node = frontier.popleft()
+            for neighbour, w in graph[node]:
+                if component[neighbour] == -1:
+                    component[neighbour] = start
+                    offset[neighbour] = offset[node] + w
+                    frontier.append(neighbour)
+    return [offset[y] - offset[x] if component[x] == component[y] else None for x, y in queries]
+
+
+def weighted_offsets(n, relations, queries):
+    uf = WeightedUnionFind(n)
+    for x, y, w in relations:
+        uf.union(x, y, w)
+    return [uf.diff(x, y) if uf.connected(x, y) else None for x, y in queries]
+
+
+def main(sizes) -> None:
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        truth = [rng.randrange(10**6) for _ in range(n)]
+        relations = []
+        for _ in range(n):
+            x, y = rng.randrange(n), rng.randrange(n)
+            relations.append((x, y, truth[y] - truth[x]))
+        queries = [(rng.randrange(n), rng.randrange(n)) for _ in range(n)]
+        assert bfs_offsets(n, relations, queries) == weighted_offsets(n, relations, queries)
+        bfs = best_of(lambda: bfs_offsets(n, relations, queries), repeat=1)
+        weighted = best_of(lambda: weighted_offsets(n, relations, queries), repeat=1)
+        rows.append((n, bfs, weighted, bfs / weighted))
+    print_table(('nodes', 'bfs s', 'weighted uf s', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main(parse_sizes(sys.argv[1:], (10**5, 10**6)))
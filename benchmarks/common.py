@@ -0,0 +1,45 @@
+import time
+import tracemalloc
+from typing import Callable, Iterable, List, Sequence, Tuple
+
+"""
+    Small helpers shared by the benchmark scripts in this folder. Every script can be run
+    from the repository root, e.g. `python -m benchmarks.bench_union_find`.
+"""
+
+def best_of(fn: Callable[[], object], repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(fn: Callable[[], object]) -> Tuple[object, int]:
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def print_table(header: Sequence[str], rows: Iterable[Sequence[object]]) -> None:
+    rows = [[_format(cell) for cell in row] for row in rows]
+    widths = [max(len(str(h)), *(len(row[i]) for row in rows)) if rows else len(str(h))
+              for i, h in enumerate(header)]
+    print('  '.join(str(h).ljust(w) for h, w in zip(header, widths)))
+    for row in rows:
+        print('  '.join(cell.ljust(w) for cell, w in zip(row, widths)))
+
+
+def _format(cell: object) -> str:
+    if isinstance(cell, float):
+        return f'{cell:.4g}'
+    return str(cell)
+
+
+def parse_sizes(argv: List[str], default: Sequence[int]) -> List[int]:
+    return [int(arg) for arg in argv] or list(default)
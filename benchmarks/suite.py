@@ -0,0 +1,236 @@
+import argparse
+import fnmatch
+import json
+import platform
+import random
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.bench_movie_renting import build_catalog
+from benchmarks.bench_removable_heap import build_operations, churn
+from benchmarks.common import best_of, peak_memory, print_table
+from look_up.union_find import UnionFind
+from priority_queue.example_removable_heap import MovieRentingSystem
+from priority_queue.removable_heap import RemovableHeapQ
+from queue_and_stack.circular_queue import CircularQueue
+from queue_and_stack.min_stack import CompactMinStack, MinStack
+
+"""
+    Benchmark suite and regression gate for the core data structures.
+
+    Every case prepares its input outside the timed region and returns a callable that replays
+    a fixed op mix, so a case is deterministic for a given size. `run` times each case (best of
+    --repeat), measures its tracemalloc peak in a separate run and writes the results as JSON.
+    `compare` checks a results file, or a fresh run, against a stored baseline and exits with
+    status 1 when a case got slower or bigger than the baseline by more than the threshold, or
+    when a baseline case matching --case has no current result.
+
+        python -m benchmarks.suite run --sizes 10000 100000 --output baseline.json
+        python -m benchmarks.suite compare baseline.json --threshold 0.2
+        python -m benchmarks.suite compare baseline.json current.json --case 'heap.*'
+
+    Timings are only comparable on the same machine and interpreter, the metadata stored with
+    every run is there to make a mismatch visible.
+"""
+
+CASES: Dict[str, Callable[[int, int], Callable[[], Any]]] = {}
+
+
+def case(name: str) -> Callable:
+    def register(setup: Callable[[int, int], Callable[[], Any]]) -> Callable:
+        CASES[name] = setup
+        return setup
+    return register
+
+
+@case('union_find.union_connected')
+def union_find_union_connected(n: int, seed: int) -> Callable[[], Any]:
+    # Half unions, half connectivity queries, the usual Kruskal / grouping workload
+    rng = random.Random(seed)
+    ops = [(rng.random() < 0.5, rng.randrange(n), rng.randrange(n)) for _ in range(n)]
+
+    def run():
+        uf = UnionFind(n)
+        for is_union, x, y in ops:
+            if is_union:
+                uf.union(x, y)
+            else:
+                uf.find(x) == uf.find(y)
+        return uf
+    return run
+
+
+@case('heap.remove_churn')
+def heap_remove_churn(n: int, seed: int) -> Callable[[], Any]:
+    # 50% add, 45% remove of random live items, 5% pop
+    operations = build_operations(n, seed)
+    return lambda: churn(RemovableHeapQ(), operations)
+
+
+@case('heap.push_pop')
+def heap_push_pop(n: int, seed: int) -> Callable[[], Any]:
+    rng = random.Random(seed)
+    items = [(rng.random(), i) for i in range(n)]
+
+    def run():
+        heap = RemovableHeapQ()
+        for item in items:
+            heap.add(item)
+        while heap.pop():
+            pass
+        return heap
+    return run
+
+
+@case('movie_renting.query_mix')
+def movie_renting_query_mix(n: int, seed: int) -> Callable[[], Any]:
+    entries = build_catalog(n, 1000, seed)
+    rng = random.Random(seed)
+    rented = rng.sample(entries, max(1, n // 10))
+    movies = [rng.randrange(1000) for _ in range(n // 10)]
+
+    def run():
+        system = MovieRentingSystem(n, entries)
+        for shop, movie, _ in rented:
+            system.rent(shop, movie)
+        for movie in movies:
+            system.search(movie)
+            system.report()
+        for shop, movie, _ in rented[::2]:
+            system.drop(shop, movie)
+        return system
+    return run
+
+
+@case('circular_queue.enqueue_dequeue')
+def circular_queue_enqueue_dequeue(n: int, seed: int) -> Callable[[], Any]:
+    # A random walk between empty and full, so both boundaries are hit
+    rng = random.Random(seed)
+    enqueues = [rng.random() < 0.5 for _ in range(n)]
+
+    def run():
+        queue = CircularQueue(1024)
+        for i, enqueue in enumerate(enqueues):
+            if enqueue:
+                queue.enQueue(i)
+            else:
+                queue.deQueue()
+        return queue
+    return run
+
+
+@case('min_stack.push_pop')
+def min_stack_push_pop(n: int, seed: int) -> Callable[[], Any]:
+    return _stack_mix(MinStack, n, seed)
+
+
+@case('min_stack.compact_push_pop')
+def compact_min_stack_push_pop(n: int, seed: int) -> Callable[[], Any]:
+    return _stack_mix(lambda: CompactMinStack(), n, seed)
+
+
+def _stack_mix(make: Callable[[], Any], n: int, seed: int) -> Callable[[], Any]:
+    # Pushes outnumber pops so the stack grows to about n / 3
+    rng = random.Random(seed)
+    ops = [rng.randrange(10**6) if rng.random() < 2 / 3 else None for _ in range(n)]
+
+    def run():
+        stack = make()
+        for value in ops:
+            if value is None:
+                stack.pop()
+            else:
+                stack.push(value)
+            stack.getMin()
+        return stack
+    return run
+
+
+def run_suite(sizes: List[int], pattern: str = '*', repeat: int = 3, seed: int = 0) -> Dict[str, Any]:
+    results = []
+    for name, setup in CASES.items():
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+        for n in sizes:
+            bench = setup(n, seed)
+            _, peak = peak_memory(bench)
+            seconds = best_of(bench, repeat=repeat)
+            results.append({'case': name, 'size': n, 'seconds': seconds, 'peak_bytes': peak})
+    return {'meta': {'python': platform.python_version(),
+                     'implementation': platform.python_implementation(),
+                     'machine': platform.machine(), 'platform': platform.platform(),
+                     'repeat': repeat, 'seed': seed},
+            'results': results}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1,
+            memory_threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+    memory_threshold = threshold if memory_threshold is None else memory_threshold
+    old = {(row['case'], row['size']): row for row in baseline['results']}
+    rows = []
+    for row in current['results']:
+        base = old.pop((row['case'], row['size']), None)
+        if base is None:
+            continue
+        time_change = row['seconds'] / base['seconds'] - 1 if base['seconds'] else 0.0
+        memory_change = row['peak_bytes'] / base['peak_bytes'] - 1 if base['peak_bytes'] else 0.0
+        rows.append({'case': row['case'], 'size': row['size'],
+                     'time_change': time_change, 'memory_change': memory_change, 'missing': False,
+                     'regression': time_change > threshold or memory_change > memory_threshold})
+    # A baseline case without a current result was removed or crashed, which must not pass silently
+    for case, size in old:
+        rows.append({'case': case, 'size': size, 'time_change': None, 'memory_change': None,
+                     'missing': True, 'regression': True})
+    return rows
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+    for command in ('run', 'compare'):
+        sub = commands.add_parser(command)
+        sub.add_argument('--sizes', type=int, nargs='+', default=[10**4, 10**5])
+        sub.add_argument('--case', default='*', help='glob over case names, e.g. "heap.*"')
+        sub.add_argument('--repeat', type=int, default=3)
+        sub.add_argument('--seed', type=int, default=0)
+        if command == 'run':
+            sub.add_argument('--output', help='write the JSON results here instead of stdout')
+        else:
+            sub.add_argument('baseline')
+            sub.add_argument('current', nargs='?', help='results file, a fresh run when omitted')
+            sub.add_argument('--threshold', type=float, default=0.1,
+                             help='allowed relative slowdown, 0.1 is 10%%')
+            sub.add_argument('--memory-threshold', type=float, default=None,
+                             help='allowed relative peak memory growth, defaults to --threshold')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run_suite(args.sizes, args.case, args.repeat, args.seed)
+        text = json.dumps(results, indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(text + '\n')
+        else:
+            print(text)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        sizes = sorted({row['size'] for row in baseline['results']}) or args.sizes
+        current = run_suite(sizes, args.case, args.repeat, baseline['meta'].get('seed', args.seed))
+    current['results'] = [row for row in current['results'] if fnmatch.fnmatch(row['case'], args.case)]
+    baseline['results'] = [row for row in baseline['results'] if fnmatch.fnmatch(row['case'], args.case)]
+    rows = compare(baseline, current, args.threshold, args.memory_threshold)
+    print_table(('case', 'size', 'time', 'memory', ''),
+                [(row['case'], row['size'], 'missing', 'missing', 'MISSING') if row['missing'] else
+                 (row['case'], row['size'], f"{row['time_change']:+.1%}", f"{row['memory_change']:+.1%}",
+                  'REGRESSION' if row['regression'] else '') for row in rows])
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,40 @@
+import unittest
+
+from benchmarks.suite import CASES, compare, run_suite
+
+
+class TestSuite(unittest.TestCase):
+
+    def test_run_covers_every_case(self):
+        """Tests that a small run yields one timed result per case and size."""
+        results = run_suite([50], repeat=1)
+        self.assertEqual([row['case'] for row in results['results']], list(CASES))
+        for row in results['results']:
+            self.assertGreater(row['seconds'], 0)
+            self.assertGreater(row['peak_bytes'], 0)
+
+    def test_compare_flags_regressions(self):
+        """Tests the time and memory thresholds of compare()."""
+        baseline = {'results': [{'case': 'a', 'size': 10, 'seconds': 1.0, 'peak_bytes': 100},
+                                {'case': 'b', 'size': 10, 'seconds': 1.0, 'peak_bytes': 100}]}
+        current = {'results': [{'case': 'a', 'size': 10, 'seconds': 1.05, 'peak_bytes': 130},
+                               {'case': 'b', 'size': 10, 'seconds': 1.5, 'peak_bytes': 100},
+                               {'case': 'c', 'size': 10, 'seconds': 9.0, 'peak_bytes': 900}]}
+        rows = compare(baseline, current, threshold=0.1)
+        self.assertEqual([(row['case'], row['regression']) for row in rows], [('a', True), ('b', True)])
+        rows = compare(baseline, current, threshold=0.1, memory_threshold=0.5)
+        self.assertEqual([row['regression'] for row in rows], [False, True])
+        self.assertAlmostEqual(rows[1]['time_change'], 0.5)
+
+    def test_compare_fails_missing_cases(self):
+        """Tests that a baseline case missing from the current run is reported as a regression."""
+        baseline = {'results': [{'case': 'a', 'size': 10, 'seconds': 1.0, 'peak_bytes': 100},
+                                {'case': 'gone', 'size': 10, 'seconds': 1.0, 'peak_bytes': 100}]}
+        current = {'results': [{'case': 'a', 'size': 10, 'seconds': 1.0, 'peak_bytes': 100}]}
+        rows = compare(baseline, current)
+        self.assertEqual([(row['case'], row['missing'], row['regression']) for row in rows],
+                         [('a', False, False), ('gone', True, True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
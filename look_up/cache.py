@@ -0,0 +1,370 @@
+import functools
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from queue_and_stack.timing_wheel import TimingWheel
+
+"""
+    Bounded caches with O(1) get and put, e.g. for UnionFind.find roots or the results of top-k
+    queries.
+
+    Every entry is a _Node with __slots__ in a circular doubly linked list, so an entry costs one
+    small object and one dict slot. LRUCache keeps a single list in recency order and evicts its
+    tail. LFUCache keeps one list per access count in a dict of frequency buckets plus the
+    smallest count in use, and evicts the least recently used entry of the least frequent bucket.
+    TTLCache is an LRUCache whose entries also expire after a per entry time to live. A TimingWheel
+    drops expired entries in bulk so they do not hold memory until they are evicted. Its timers
+    fire within the tick before an entry expires, and entries that are not due yet at that point
+    (or that live shorter than a tick) wait in a small heap ordered by expiry. Every call brings
+    both up to date first, so get(), len() and `in` never see an expired entry.
+
+    All caches count hits, misses and evictions (expired entries included) in stats(). memoize()
+    wraps a function with any of them, like functools.lru_cache, and can guard it with a lock.
+"""
+
+_MISSING = object()
+
+
+class _Node:
+    __slots__ = ('key', 'value', 'prev', 'next', 'freq', 'expires', 'timer')
+
+    def __init__(self, key: Any = None, value: Any = None):
+        self.key = key
+        self.value = value
+        self.prev = self
+        self.next = self
+        self.freq = 1
+        self.expires = 0.0
+        self.timer = None
+
+
+def _unlink(node: _Node) -> None:
+    node.prev.next = node.next
+    node.next.prev = node.prev
+
+
+def _push_front(root: _Node, node: _Node) -> None:
+    node.prev = root
+    node.next = root.next
+    root.next.prev = node
+    root.next = node
+
+
+class LRUCache:
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError('Invalid capacity, must be at least 1')
+        self.capacity = capacity
+        self.map: Dict[Hashable, _Node] = {}
+        # root.next is the most and root.prev the least recently used entry
+        self.root = _Node()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.map)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.map
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        node = self.map.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        root = self.root
+        if root.next is not node:
+            # _unlink and _push_front inlined, this is the hot path of every cache hit
+            node.prev.next = node.next
+            node.next.prev = node.prev
+            node.prev = root
+            node.next = first = root.next
+            first.prev = root.next = node
+        return node.value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        node = self.map.get(key)
+        if node is not None:
+            node.value = value
+            _unlink(node)
+            _push_front(self.root, node)
+            return
+        if len(self.map) >= self.capacity:
+            self._evict(self.root.prev)
+        node = self.map[key] = _Node(key, value)
+        _push_front(self.root, node)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        node = self.map.pop(key, None)
+        if node is None:
+            return default
+        _unlink(node)
+        return node.value
+
+    def clear(self) -> None:
+        self.map.clear()
+        self.root.prev = self.root.next = self.root
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self.map), 'capacity': self.capacity}
+
+    def _evict(self, node: _Node) -> None:
+        self.pop(node.key)
+        self.evictions += 1
+
+
+class LFUCache:
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError('Invalid capacity, must be at least 1')
+        self.capacity = capacity
+        self.map: Dict[Hashable, _Node] = {}
+        # Access count -> root of the entries with that count, most recently used first
+        self.buckets: Dict[int, _Node] = {}
+        self.min_freq = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.map)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.map
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        node = self.map.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(node)
+        return node.value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        node = self.map.get(key)
+        if node is not None:
+            node.value = value
+            self._touch(node)
+            return
+        if len(self.map) >= self.capacity:
+            self._remove(self.buckets[self.min_freq].prev)
+            self.evictions += 1
+        node = self.map[key] = _Node(key, value)
+        self._link(node)
+        self.min_freq = 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        node = self.map.get(key)
+        if node is None:
+            return default
+        self._remove(node)
+        # Only an explicit pop can empty a bucket other than through _touch, so the scan is rare
+        if self.map and self.min_freq not in self.buckets:
+            self.min_freq = min(self.buckets)
+        return node.value
+
+    def clear(self) -> None:
+        self.map.clear()
+        self.buckets.clear()
+        self.min_freq = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self.map), 'capacity': self.capacity}
+
+    def _link(self, node: _Node) -> None:
+        root = self.buckets.get(node.freq)
+        if root is None:
+            root = self.buckets[node.freq] = _Node()
+        _push_front(root, node)
+
+    def _unlink(self, node: _Node) -> None:
+        _unlink(node)
+        root = self.buckets[node.freq]
+        if root.next is root:
+            del self.buckets[node.freq]
+
+    def _remove(self, node: _Node) -> None:
+        self._unlink(node)
+        del self.map[node.key]
+
+    def _touch(self, node: _Node) -> None:
+        self._unlink(node)
+        if self.min_freq == node.freq and node.freq not in self.buckets:
+            self.min_freq += 1
+        node.freq += 1
+        self._link(node)
+
+
+class TTLCache(LRUCache):
+    def __init__(self, capacity: int, ttl: float, timer: Callable[[], float] = time.monotonic,
+                 resolution: float = 1.0):
+        super().__init__(capacity)
+        if ttl <= 0:
+            raise ValueError('Invalid ttl, must be larger than 0')
+        self.ttl = ttl
+        self.timer = timer
+        self.wheel = TimingWheel(tick=resolution, start=timer())
+        # (expires, sequence, node) for entries within a tick of their expiry
+        self.expiring = []
+        self.counter = itertools.count()
+        self.now = timer()
+        self.expired = 0
+        # One bound method for all timers instead of a new one per put
+        self.expire = self._expire
+
+    def __len__(self) -> int:
+        self._collect(self.timer())
+        return len(self.map)
+
+    def __contains__(self, key: Hashable) -> bool:
+        self._collect(self.timer())
+        return key in self.map
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = self.timer()
+        self._collect(now)
+        node = self.map.get(key)
+        if node is not None and node.expires <= now:
+            # _collect normally dropped it already, this guards float rounding at tick boundaries
+            self._drop(node)
+        return super().get(key, default)
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        now = self.timer()
+        self._collect(now)
+        super().put(key, value)
+        node = self.map[key]
+        if node.timer is not None:
+            self.wheel.cancel(node.timer)
+        ttl = self.ttl if ttl is None else ttl
+        node.expires = now + ttl
+        wheel = self.wheel
+        # The wheel counts from the start of its current tick and rounds up to whole ticks, one
+        # tick less makes it fire within the tick before the expiry
+        delay = node.expires - (wheel.start + wheel.current * wheel.tick) - wheel.tick
+        if delay > 0:
+            node.timer = wheel.schedule(delay, self.expire, node)
+        else:
+            node.timer = None
+            heapq.heappush(self.expiring, (node.expires, next(self.counter), node))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        node = self.map.pop(key, None)
+        if node is None:
+            return default
+        _unlink(node)
+        if node.timer is not None:
+            self.wheel.cancel(node.timer)
+            # The timer holds the node as its argument, break the cycle so refcounting frees both
+            node.timer = None
+        return node.value
+
+    def clear(self) -> None:
+        super().clear()
+        self.wheel = TimingWheel(tick=self.wheel.tick, start=self.timer())
+        self.expiring = []
+
+    def stats(self) -> Dict[str, int]:
+        return dict(super().stats(), expired=self.expired)
+
+    def _collect(self, now: float) -> None:
+        self.now = now
+        wheel = self.wheel
+        # advance() only does something once a new tick has started
+        if now >= wheel.start + (wheel.current + 1) * wheel.tick:
+            wheel.advance(now)
+        expiring = self.expiring
+        while expiring and expiring[0][0] <= now:
+            _, _, node = heapq.heappop(expiring)
+            # Entries popped or refreshed since they were queued are skipped
+            if self.map.get(node.key) is node and node.expires <= now:
+                self._drop(node)
+
+    def _expire(self, node: _Node) -> None:
+        # Called by the wheel, at most a tick before the entry expires
+        node.timer = None
+        if self.map.get(node.key) is not node:
+            return
+        if node.expires <= self.now:
+            self._drop(node)
+        else:
+            heapq.heappush(self.expiring, (node.expires, next(self.counter), node))
+
+    def _drop(self, node: _Node) -> None:
+        self.pop(node.key)
+        self.evictions += 1
+        self.expired += 1
+
+
+def memoize(maxsize: int = 128, policy: str = 'lru', ttl: Optional[float] = None,
+            thread_safe: bool = False) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+        Caches the results of a function by its arguments, which must be hashable. policy is 'lru'
+        or 'lfu', and a ttl makes it a TTLCache, which evicts like 'lru', so a ttl cannot be
+        combined with 'lfu'. The wrapper exposes cache, cache_info() and cache_clear(). With
+        thread_safe=True a lock guards the cache lookups and stores but not the calls of fn:
+        concurrent calls with the same cold key compute it once, calls with other keys run in
+        parallel.
+    """
+    if policy not in ('lru', 'lfu'):
+        raise ValueError(f'Invalid policy {policy}, must be lru or lfu')
+    if ttl is not None and policy == 'lfu':
+        raise ValueError('Invalid policy lfu with a ttl, expiring entries are only evicted as lru')
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if ttl is not None:
+            cache = TTLCache(maxsize, ttl)
+        elif policy == 'lru':
+            cache = LRUCache(maxsize)
+        else:
+            cache = LFUCache(maxsize)
+        lock = threading.Lock() if thread_safe else None
+        # Key -> lock held by the thread computing it, so callers of the same cold key wait for it
+        # while callers of other keys go ahead
+        computing: Dict[Hashable, threading.Lock] = {}
+
+        def locked_call(key: Hashable, args: tuple, kwargs: Dict[str, Any]) -> Any:
+            while True:
+                with lock:
+                    result = cache.get(key, _MISSING)
+                    if result is not _MISSING:
+                        return result
+                    call = computing.get(key)
+                    if call is None:
+                        call = computing[key] = threading.Lock()
+                        call.acquire()
+                        break
+                # Wait for the owner, then look again. If it failed or the result is gone already,
+                # one of the waiters claims the key and computes it
+                with call:
+                    pass
+            try:
+                result = fn(*args, **kwargs)
+                with lock:
+                    cache.put(key, result)
+                return result
+            finally:
+                with lock:
+                    del computing[key]
+                call.release()
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = args + (_MISSING,) + tuple(sorted(kwargs.items())) if kwargs else args
+            if lock is None:
+                result = cache.get(key, _MISSING)
+                if result is _MISSING:
+                    result = fn(*args, **kwargs)
+                    cache.put(key, result)
+                return result
+            return locked_call(key, args, kwargs)
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.stats
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
@@ -0,0 +1,77 @@
+from typing import List, Sequence, Tuple
+
+from look_up.union_find import RollbackUnionFind
+
+"""
+    Offline dynamic connectivity: answers "are u and v connected?" for a stream of edge insertions,
+    deletions and queries that is known in advance.
+
+    Every edge is alive during an interval of queries. The intervals are stored in a segment tree
+    over the queries, a depth first walk unites the edges of a node on the way down and rolls them
+    back on the way up, and each leaf answers its query from a RollbackUnionFind. An edge lands in
+    O(log q) nodes and a union costs O(log n), so m edges and q queries take
+    O((m + q) log q log n) in total.
+
+    Operations are tuples ('add', u, v), ('remove', u, v) or ('query', u, v). Edges are undirected
+    and may be added several times; every remove deletes one copy.
+"""
+
+def offline_connectivity(size: int, operations: Sequence[Tuple[str, int, int]]) -> List[bool]:
+    queries = []
+    intervals = []
+    alive = {}
+    for op, u, v in operations:
+        edge = (min(u, v), max(u, v))
+        if op == 'add':
+            alive.setdefault(edge, []).append(len(queries))
+        elif op == 'remove':
+            if not alive.get(edge):
+                raise ValueError(f'Invalid remove, edge {edge} is not in the graph')
+            intervals.append((alive[edge].pop(), len(queries), edge))
+        elif op == 'query':
+            queries.append(edge)
+        else:
+            raise ValueError(f'Invalid operation {op}, expected add, remove or query')
+    for edge, starts in alive.items():
+        intervals.extend((start, len(queries), edge) for start in starts)
+
+    if not queries:
+        return []
+    leaves = 1
+    while leaves < len(queries):
+        leaves *= 2
+    tree = [[] for _ in range(2 * leaves)]
+    for start, stop, edge in intervals:
+        lo, hi = start + leaves, stop + leaves
+        while lo < hi:
+            if lo & 1:
+                tree[lo].append(edge)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                tree[hi].append(edge)
+            lo >>= 1
+            hi >>= 1
+
+    uf = RollbackUnionFind(size)
+    answers = [False] * len(queries)
+    # Negative entries are exits that undo the unions made when their node was entered
+    stack = [(1, 0)]
+    while stack:
+        node, token = stack.pop()
+        if node < 0:
+            uf.rollback(token)
+            continue
+        token = uf.snapshot()
+        for u, v in tree[node]:
+            uf.union(u, v)
+        if node >= leaves:
+            query = node - leaves
+            if query < len(queries):
+                answers[query] = uf.connected(*queries[query])
+            uf.rollback(token)
+            continue
+        stack.append((-node, token))
+        stack.append((2 * node + 1, 0))
+        stack.append((2 * node, 0))
+    return answers
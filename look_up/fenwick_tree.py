@@ -0,0 +1,225 @@
+from array import array
+from typing import Any, Iterable, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+"""
+    Fenwick (binary indexed) trees for prefix sums over large arrays that keep changing.
+
+    FenwickTree supports point updates and prefix / range sums in O(log n). Node i (1-based) holds
+    the sum of the i & -i values ending at i, stored in a typed array, so 10M int64 values take
+    80 MB instead of a list of boxed ints. Building from an iterable or a NumPy array is O(n):
+    every node pushes its sum to its parent once, and with NumPy this runs as one vectorized step
+    per bit. query_many/update_many take whole batches of indices and walk the tree for all of
+    them at once with NumPy, falling back to the scalar loop otherwise.
+
+    RangeFenwickTree adds a delta to a whole range in O(log n) and still answers range sums. It
+    keeps two Fenwick trees over the differences d[q] and q * d[q], and the sum of the first i
+    values is i * sum(d[:i]) - sum(q * d[q] for q < i).
+
+    Indices are 0-based and ranges half open, like slices. Integer trees raise OverflowError on
+    overflow in the scalar methods, but the NumPy batch methods wrap around like int64 does.
+"""
+
+class FenwickTree:
+    def __init__(self, values: Union[Iterable[Any], int] = (), typecode: str = 'q'):
+        if isinstance(values, int):
+            values = array(typecode, [0]) * values
+        self.typecode = typecode
+        self.tree = array(typecode, [0])
+        if np is not None and isinstance(values, np.ndarray):
+            self.tree.frombytes(np.ascontiguousarray(values, dtype=np.dtype(typecode)).tobytes())
+        else:
+            self.tree.extend(values)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.tree) - 1
+
+    def _build(self) -> None:
+        tree, size = self.tree, len(self.tree) - 1
+        if np is not None and size:
+            view = self._view()
+            step = 1
+            # Nodes whose lowest set bit is step are complete once all smaller steps are pushed
+            while step <= size:
+                nodes = np.arange(step, size + 1, 2 * step)
+                parents = nodes + step
+                keep = parents <= size
+                view[parents[keep]] += view[nodes[keep]]
+                step *= 2
+            return
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+
+    def _view(self) -> Any:
+        return np.frombuffer(self.tree, dtype=np.dtype(self.typecode))
+
+    def _check(self, i: int, upper: int) -> None:
+        if i < 0 or i > upper:
+            raise IndexError(f'Invalid index {i}, must be between 0 and {upper}')
+
+    def add(self, i: int, delta: Any) -> None:
+        self._check(i, len(self) - 1)
+        tree, size = self.tree, len(self.tree) - 1
+        i += 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, i: int) -> Any:
+        """
+            Returns the sum of the first i values.
+        """
+        self._check(i, len(self))
+        tree, total = self.tree, 0
+        while i > 0:
+            total += tree[i]
+            i &= i - 1
+        return total
+
+    def range_sum(self, lo: int, hi: int) -> Any:
+        if lo > hi:
+            raise IndexError(f'Invalid range, {lo} is larger than {hi}')
+        return self.prefix_sum(hi) - self.prefix_sum(lo)
+
+    def get(self, i: int) -> Any:
+        return self.range_sum(i, i + 1)
+
+    def set(self, i: int, value: Any) -> None:
+        self.add(i, value - self.get(i))
+
+    def prefix_sum_many(self, indices: Any) -> Any:
+        if np is None:
+            return [self.prefix_sum(i) for i in indices]
+        indices = np.array(indices, dtype=np.int64, copy=True).ravel()
+        if indices.size and (indices.min() < 0 or indices.max() > len(self)):
+            raise IndexError(f'Invalid index, must be between 0 and {len(self)}')
+        view = self._view()
+        totals = np.zeros(indices.size, dtype=view.dtype)
+        # tree[0] is always 0, so finished indices keep adding nothing
+        while indices.any():
+            totals += view[indices]
+            indices &= indices - 1
+        return totals
+
+    def query_many(self, los: Any, his: Any) -> Any:
+        if np is None:
+            return [self.range_sum(lo, hi) for lo, hi in zip(los, his)]
+        los, his = np.asarray(los), np.asarray(his)
+        if los.shape != his.shape:
+            raise ValueError('Invalid ranges, los and his must have the same length')
+        if np.any(los > his):
+            raise IndexError('Invalid range, lo is larger than hi')
+        return self.prefix_sum_many(his) - self.prefix_sum_many(los)
+
+    def update_many(self, indices: Any, deltas: Any) -> None:
+        if np is None:
+            indices, deltas = list(indices), list(deltas)
+            if len(indices) != len(deltas):
+                raise ValueError('Invalid updates, indices and deltas must have the same length')
+            for i, delta in zip(indices, deltas):
+                self.add(i, delta)
+            return
+        view = self._view()
+        nodes = np.asarray(indices, dtype=np.int64).ravel() + 1
+        deltas = np.broadcast_to(np.asarray(deltas, dtype=view.dtype), nodes.shape)
+        if nodes.size and (nodes.min() < 1 or nodes.max() > len(self)):
+            raise IndexError(f'Invalid index, must be between 0 and {len(self) - 1}')
+        while nodes.size:
+            # add.at, since several indices of a batch can reach the same node
+            np.add.at(view, nodes, deltas)
+            nodes = nodes + (nodes & -nodes)
+            keep = nodes <= len(self)
+            nodes, deltas = nodes[keep], deltas[keep]
+
+
+class RangeFenwickTree:
+    def __init__(self, values: Union[Iterable[Any], int] = (), typecode: str = 'q'):
+        if isinstance(values, int):
+            values = array(typecode, [0]) * values
+        if np is not None and isinstance(values, np.ndarray):
+            values = values.astype(np.dtype(typecode), copy=False).ravel()
+            diffs = np.diff(values, prepend=values.dtype.type(0))
+            weighted = diffs * np.arange(len(diffs), dtype=diffs.dtype)
+        else:
+            values = array(typecode, values)
+            diffs = array(typecode, (value - previous for previous, value in zip([0] + list(values[:-1]), values)))
+            weighted = array(typecode, (q * diff for q, diff in enumerate(diffs)))
+        self.typecode = typecode
+        self.diffs = FenwickTree(diffs, typecode)
+        self.weighted = FenwickTree(weighted, typecode)
+
+    def __len__(self) -> int:
+        return len(self.diffs)
+
+    def add(self, lo: int, hi: int, delta: Any) -> None:
+        """
+            Adds delta to every value in [lo, hi).
+        """
+        if lo < 0 or hi > len(self) or lo > hi:
+            raise IndexError(f'Invalid range [{lo}, {hi}) for {len(self)} values')
+        if lo == hi:
+            return
+        self.diffs.add(lo, delta)
+        self.weighted.add(lo, delta * lo)
+        if hi < len(self):
+            self.diffs.add(hi, -delta)
+            self.weighted.add(hi, -delta * hi)
+
+    def prefix_sum(self, i: int) -> Any:
+        return i * self.diffs.prefix_sum(i) - self.weighted.prefix_sum(i)
+
+    def range_sum(self, lo: int, hi: int) -> Any:
+        if lo > hi:
+            raise IndexError(f'Invalid range, {lo} is larger than {hi}')
+        return self.prefix_sum(hi) - self.prefix_sum(lo)
+
+    def get(self, i: int) -> Any:
+        # prefix_sum(i + 1) alone would accept i = -1
+        self.diffs._check(i, len(self) - 1)
+        return self.diffs.prefix_sum(i + 1)
+
+    def prefix_sum_many(self, indices: Any) -> Any:
+        if np is None:
+            return [self.prefix_sum(i) for i in indices]
+        indices = np.asarray(indices, dtype=np.int64)
+        return indices * self.diffs.prefix_sum_many(indices) - self.weighted.prefix_sum_many(indices)
+
+    def query_many(self, los: Any, his: Any) -> Any:
+        if np is None:
+            return [self.range_sum(lo, hi) for lo, hi in zip(los, his)]
+        los, his = np.asarray(los), np.asarray(his)
+        if los.shape != his.shape:
+            raise ValueError('Invalid ranges, los and his must have the same length')
+        if np.any(los > his):
+            raise IndexError('Invalid range, lo is larger than hi')
+        return self.prefix_sum_many(his) - self.prefix_sum_many(los)
+
+    def update_many(self, los: Any, his: Any, deltas: Any) -> None:
+        """
+            Adds deltas[k] to every value in [los[k], his[k]) for every k.
+        """
+        if np is None:
+            los, his, deltas = list(los), list(his), list(deltas)
+            if not len(los) == len(his) == len(deltas):
+                raise ValueError('Invalid updates, los, his and deltas must have the same length')
+            for lo, hi, delta in zip(los, his, deltas):
+                self.add(lo, hi, delta)
+            return
+        dtype = np.dtype(self.typecode)
+        los, his = np.asarray(los, dtype=np.int64).ravel(), np.asarray(his, dtype=np.int64).ravel()
+        if los.shape != his.shape:
+            raise ValueError('Invalid updates, los, his and deltas must have the same length')
+        deltas = np.broadcast_to(np.asarray(deltas, dtype=dtype), los.shape)
+        if los.size and (los.min() < 0 or his.max() > len(self) or np.any(los > his)):
+            raise IndexError(f'Invalid range for {len(self)} values')
+        inner = his < len(self)
+        self.diffs.update_many(np.concatenate((los, his[inner])), np.concatenate((deltas, -deltas[inner])))
+        self.weighted.update_many(np.concatenate((los, his[inner])),
+                                  np.concatenate((deltas * los.astype(dtype), -deltas[inner] * his[inner].astype(dtype))))
@@ -0,0 +1,123 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional
+
+from look_up.union_find import CompactUnionFind
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+"""
+    Connected components labelling of large edge lists with a process pool.
+
+    The edge list is copied once into shared memory and split into contiguous shards. Every worker
+    builds a partial CompactUnionFind over its shard and writes the root of each node into its own
+    row of a shared label matrix, so no list is ever pickled between processes. The parent process
+    then merges the shard forests by uniting every node with its shard root.
+
+    The label matrix holds one row of size labels per shard, so shared memory grows with
+    shards * size (4 bytes per label below 2**31 nodes, 8 above), on top of 16 bytes per edge. For
+    10M nodes and 8 shards that is 320 MB of labels; pass fewer shards to trade parallelism for
+    memory.
+
+    Labels are canonical: every node is labelled with the smallest node of its component. This makes
+    the result independent of the number of workers and of the union order, and component_labels()
+    gives the same labelling for any single threaded UnionFind or CompactUnionFind.
+"""
+
+def connected_components(size: int, xs: Any, ys: Any, workers: Optional[int] = None,
+                         shards: Optional[int] = None) -> Any:
+    xs, ys = array('q', xs), array('q', ys)
+    if len(xs) != len(ys):
+        raise ValueError('Invalid edge arrays, xs and ys must have the same length')
+    workers = workers or os.cpu_count() or 1
+    shards = max(1, min(shards or workers, len(xs)))
+    if workers == 1 or shards == 1:
+        uf = CompactUnionFind(size)
+        uf.union_many(xs, ys)
+        return component_labels(uf)
+
+    typecode = 'i' if size <= 2**31 - 1 else 'q'
+    itemsize = array(typecode).itemsize
+    blocks = []
+    try:
+        # Created one by one inside the try, so a failed second allocation still frees the first
+        edges = SharedMemory(create=True, size=max(1, 2 * len(xs) * 8))
+        blocks.append(edges)
+        labels = SharedMemory(create=True, size=max(1, shards * size * itemsize))
+        blocks.append(labels)
+        with edges.buf.cast('q') as edge_view:
+            edge_view[:len(xs)] = xs
+            edge_view[len(xs):2 * len(xs)] = ys
+
+        bounds = [len(xs) * shard // shards for shard in range(shards + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [pool.submit(_label_shard, edges.name, len(xs), bounds[shard], bounds[shard + 1],
+                                labels.name, shard, size, typecode)
+                    for shard in range(shards)]
+            for job in jobs:
+                job.result()
+
+        uf = CompactUnionFind(size)
+        for shard in range(shards):
+            _merge_shard(uf, labels.buf, shard, size, typecode)
+        return component_labels(uf)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def component_labels(uf: Any) -> Any:
+    size = len(uf.parent)
+    if np is None:
+        smallest = {}
+        return array('q', [smallest.setdefault(uf.find(node), node) for node in range(size)])
+    roots = np.asarray(uf.find_many(np.arange(size))) if hasattr(uf, 'find_many') \
+        else np.fromiter((uf.find(node) for node in range(size)), dtype=np.int64, count=size)
+    # return_index gives the first, hence smallest, node of every root
+    unique_roots, first_nodes = np.unique(roots, return_index=True)
+    smallest = np.empty(size, dtype=np.int64)
+    smallest[unique_roots] = first_nodes
+    return smallest[roots]
+
+
+def _merge_shard(uf: CompactUnionFind, buffer: memoryview, shard: int, size: int, typecode: str) -> None:
+    with buffer.cast(typecode) as label_view, label_view[shard * size:(shard + 1) * size] as roots:
+        if np is None:
+            for node, root in enumerate(roots):
+                if node != root:
+                    uf.union(node, root)
+        else:
+            shard_roots = np.frombuffer(roots, dtype=np.dtype(typecode))
+            nodes = np.flatnonzero(shard_roots != np.arange(size))
+            uf.union_many(nodes, shard_roots[nodes])
+            del shard_roots
+
+
+def _label_shard(edges_name: str, num_edges: int, start: int, stop: int, labels_name: str,
+                 shard: int, size: int, typecode: str) -> None:
+    edges = SharedMemory(name=edges_name)
+    labels = SharedMemory(name=labels_name)
+    try:
+        uf = CompactUnionFind(size)
+        with edges.buf.cast('q') as edge_view:
+            with edge_view[start:stop] as xs, edge_view[num_edges + start:num_edges + stop] as ys:
+                if np is None:
+                    for x, y in zip(xs, ys):
+                        uf.union(x, y)
+                else:
+                    uf.union_many(np.frombuffer(xs, dtype=np.int64), np.frombuffer(ys, dtype=np.int64))
+        if np is None:
+            roots = array(typecode, (uf.find(node) for node in range(size)))
+        else:
+            roots = uf.find_many(np.arange(size))
+        with labels.buf.cast(typecode) as label_view:
+            label_view[shard * size:(shard + 1) * size] = memoryview(roots).cast('B').cast(typecode)
+    finally:
+        edges.close()
+        labels.close()
@@ -0,0 +1,208 @@
+from array import array
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+"""
+    A lazy propagation segment tree for range queries and range updates with pluggable operations.
+
+    The values form a Monoid: an associative op with an identity, e.g. sum with 0 or min with
+    +inf. Range updates are an Action on that monoid. mapping(f, x, length) applies the update f
+    to a node x that covers length values, composition(f, g) merges f applied after g into one
+    pending update, and identity is the update that changes nothing. Pending updates stay at the
+    highest nodes they cover and are only pushed down when a query or update needs the children,
+    so query() and update() both take O(log n).
+
+    The tree is iterative over a power of two number of leaves. Node values live in a typed array
+    when a typecode is given, pending updates in a list (an assignment uses None as its identity,
+    which a typed array cannot hold). Building is O(n): the leaves are copied in bulk and every
+    inner node is computed once, with one vectorized step per level when the monoid has a NumPy
+    ufunc. query_many/update_many run a batch of ranges in order.
+
+    Indices are 0-based and ranges half open, like slices. With a typecode the identity must fit
+    the array, e.g. MIN and MAX need 'd', or a Monoid with an integer sentinel for 'q'.
+"""
+
+class Monoid(NamedTuple):
+    op: Callable[[Any, Any], Any]
+    identity: Any
+    # Optional NumPy ufunc with the same meaning as op, used to build the tree level by level
+    ufunc: Any = None
+
+
+class Action(NamedTuple):
+    mapping: Callable[[Any, Any, int], Any]
+    composition: Callable[[Any, Any], Any]
+    identity: Any
+
+
+SUM = Monoid(lambda a, b: a + b, 0, np.add if np is not None else None)
+MIN = Monoid(min, float('inf'), np.minimum if np is not None else None)
+MAX = Monoid(max, float('-inf'), np.maximum if np is not None else None)
+
+# Range add for a sum tree grows a node by delta per covered value, for min and max by delta once
+ADD_TO_SUM = Action(lambda f, x, length: x + f * length, lambda f, g: f + g, 0)
+ADD = Action(lambda f, x, length: x + f, lambda f, g: f + g, 0)
+ASSIGN_TO_SUM = Action(lambda f, x, length: x if f is None else f * length,
+                       lambda f, g: g if f is None else f, None)
+ASSIGN = Action(lambda f, x, length: x if f is None else f, lambda f, g: g if f is None else f, None)
+
+
+class LazySegmentTree:
+    def __init__(self, values: Union[Iterable[Any], int], monoid: Monoid = SUM, action: Action = ADD_TO_SUM,
+                 typecode: Optional[str] = None):
+        if isinstance(values, int):
+            values = [monoid.identity] * values
+        elif np is not None and isinstance(values, np.ndarray):
+            values = values.ravel()
+        else:
+            values = list(values)
+        self.monoid = monoid
+        self.action = action
+        self.typecode = typecode
+        self.n = len(values)
+        self.log = max(0, (self.n - 1).bit_length())
+        self.size = 1 << self.log
+        self.tree = self._allocate(values)
+        self.lazy = [action.identity] * self.size
+        self._build()
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _allocate(self, values: Any) -> Union[List[Any], array]:
+        identity, size = self.monoid.identity, self.size
+        if self.typecode is None:
+            tree = [identity] * (2 * size)
+            tree[size:size + self.n] = list(values)
+            return tree
+        tree = array(self.typecode, [identity]) * (2 * size)
+        if np is not None:
+            np.frombuffer(tree, dtype=np.dtype(self.typecode))[size:size + self.n] = values
+        else:
+            tree[size:size + self.n] = array(self.typecode, values)
+        return tree
+
+    def _build(self) -> None:
+        tree, op, ufunc = self.tree, self.monoid.op, self.monoid.ufunc
+        if ufunc is not None and self.typecode is not None and np is not None:
+            view = np.frombuffer(tree, dtype=np.dtype(self.typecode))
+            level = self.size
+            while level > 1:
+                ufunc(view[level:2 * level:2], view[level + 1:2 * level:2], out=view[level // 2:level])
+                level //= 2
+            return
+        for k in range(self.size - 1, 0, -1):
+            tree[k] = op(tree[2 * k], tree[2 * k + 1])
+
+    def _check(self, lo: int, hi: int) -> None:
+        if lo < 0 or hi > self.n or lo > hi:
+            raise IndexError(f'Invalid range [{lo}, {hi}) for {self.n} values')
+
+    def _apply(self, k: int, f: Any) -> None:
+        # The node at depth d of a tree with size leaves covers size >> d values
+        self.tree[k] = self.action.mapping(f, self.tree[k], self.size >> (k.bit_length() - 1))
+        if k < self.size:
+            self.lazy[k] = self.action.composition(f, self.lazy[k])
+
+    def _push(self, k: int) -> None:
+        f = self.lazy[k]
+        if f != self.action.identity:
+            self._apply(2 * k, f)
+            self._apply(2 * k + 1, f)
+            self.lazy[k] = self.action.identity
+
+    def _pull(self, k: int) -> None:
+        self.tree[k] = self.monoid.op(self.tree[2 * k], self.tree[2 * k + 1])
+
+    def get(self, i: int) -> Any:
+        self._check(i, i + 1)
+        i += self.size
+        for shift in range(self.log, 0, -1):
+            self._push(i >> shift)
+        return self.tree[i]
+
+    def set(self, i: int, value: Any) -> None:
+        self._check(i, i + 1)
+        i += self.size
+        for shift in range(self.log, 0, -1):
+            self._push(i >> shift)
+        self.tree[i] = value
+        for shift in range(1, self.log + 1):
+            self._pull(i >> shift)
+
+    def query(self, lo: int, hi: int) -> Any:
+        """
+            Returns op over the values in [lo, hi), the identity for an empty range.
+        """
+        self._check(lo, hi)
+        if lo == hi:
+            return self.monoid.identity
+        lo += self.size
+        hi += self.size
+        for shift in range(self.log, 0, -1):
+            if (lo >> shift) << shift != lo:
+                self._push(lo >> shift)
+            if (hi >> shift) << shift != hi:
+                self._push((hi - 1) >> shift)
+        tree, op = self.tree, self.monoid.op
+        left = right = self.monoid.identity
+        while lo < hi:
+            if lo & 1:
+                left = op(left, tree[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right = op(tree[hi], right)
+            lo >>= 1
+            hi >>= 1
+        return op(left, right)
+
+    def all(self) -> Any:
+        return self.tree[1] if self.n else self.monoid.identity
+
+    def update(self, lo: int, hi: int, f: Any) -> None:
+        """
+            Applies the update f to every value in [lo, hi).
+        """
+        self._check(lo, hi)
+        if lo == hi:
+            return
+        lo += self.size
+        hi += self.size
+        for shift in range(self.log, 0, -1):
+            if (lo >> shift) << shift != lo:
+                self._push(lo >> shift)
+            if (hi >> shift) << shift != hi:
+                self._push((hi - 1) >> shift)
+        left, right = lo, hi
+        while left < right:
+            if left & 1:
+                self._apply(left, f)
+                left += 1
+            if right & 1:
+                right -= 1
+                self._apply(right, f)
+            left >>= 1
+            right >>= 1
+        for shift in range(1, self.log + 1):
+            if (lo >> shift) << shift != lo:
+                self._pull(lo >> shift)
+            if (hi >> shift) << shift != hi:
+                self._pull((hi - 1) >> shift)
+
+    def query_many(self, los: Iterable[int], his: Iterable[int]) -> List[Any]:
+        los, his = list(los), list(his)
+        if len(los) != len(his):
+            raise ValueError('Invalid ranges, los and his must have the same length')
+        return [self.query(lo, hi) for lo, hi in zip(los, his)]
+
+    def update_many(self, los: Iterable[int], his: Iterable[int], fs: Iterable[Any]) -> None:
+        los, his, fs = list(los), list(his), list(fs)
+        if not len(los) == len(his) == len(fs):
+            raise ValueError('Invalid updates, los, his and fs must have the same length')
+        for lo, hi, f in zip(los, his, fs):
+            self.update(lo, hi, f)
@@ -0,0 +1,300 @@
+import random
+import threading
+import unittest
+from collections import Counter, OrderedDict
+from look_up.cache import LFUCache, LRUCache, TTLCache, memoize
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        """Tests that get refreshes an entry and put evicts the oldest one."""
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.get('b', -1), -1)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'evictions': 1, 'size': 2, 'capacity': 2})
+
+    def test_matches_ordered_dict(self):
+        """Tests random operations against an OrderedDict based LRU."""
+        rng = random.Random(1)
+        cache, reference = LRUCache(8), OrderedDict()
+        for _ in range(2000):
+            key = rng.randrange(20)
+            if rng.random() < 0.5:
+                cache.put(key, key * 2)
+                reference[key] = key * 2
+                reference.move_to_end(key)
+                if len(reference) > 8:
+                    reference.popitem(last=False)
+            else:
+                expected = reference.get(key)
+                if expected is not None:
+                    reference.move_to_end(key)
+                self.assertEqual(cache.get(key), expected)
+        self.assertEqual(set(cache.map), set(reference))
+
+    def test_pop_and_clear(self):
+        """Tests removing entries explicitly."""
+        cache = LRUCache(3)
+        cache.put(1, 'x')
+        self.assertEqual(cache.pop(1), 'x')
+        self.assertIsNone(cache.pop(1))
+        cache.put(2, 'y')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+
+class TestLFUCache(unittest.TestCase):
+
+    def test_evicts_least_frequently_used(self):
+        """Tests that the least frequent entry goes first, the older one on a tie."""
+        cache = LFUCache(2)
+        cache.put(1, 1)
+        cache.put(2, 2)
+        cache.get(1)
+        cache.put(3, 3)
+        self.assertNotIn(2, cache)
+        cache.get(3)
+        cache.put(4, 4)
+        # 1 and 3 were both used twice, 1 longer ago
+        self.assertNotIn(1, cache)
+        self.assertEqual((cache.get(3), cache.get(4)), (3, 4))
+
+    def test_matches_brute_force(self):
+        """Tests random operations against counting accesses by hand."""
+        rng = random.Random(2)
+        cache = LFUCache(5)
+        values, counts, last_use = {}, Counter(), {}
+        for step in range(3000):
+            key = rng.randrange(12)
+            if rng.random() < 0.5:
+                if key not in values and len(values) == 5:
+                    victim = min(values, key=lambda k: (counts[k], last_use[k]))
+                    del values[victim], counts[victim]
+                values[key] = step
+                counts[key] += 1
+                last_use[key] = step
+            else:
+                if key in values:
+                    counts[key] += 1
+                    last_use[key] = step
+                self.assertEqual(cache.get(key), values.get(key))
+                continue
+            cache.put(key, step)
+        self.assertEqual(set(cache.map), set(values))
+
+    def test_pop_keeps_min_frequency(self):
+        """Tests that popping the only least frequent entry moves the minimum up."""
+        cache = LFUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('b')
+        cache.pop('a')
+        cache.put('c', 3)
+        cache.put('d', 4)
+        self.assertEqual(set(cache.map), {'b', 'd'})
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_entries_expire(self):
+        """Tests default and per entry time to live."""
+        clock = FakeClock()
+        cache = TTLCache(10, ttl=5, timer=clock, resolution=1.0)
+        cache.put('short', 1, ttl=0.5)
+        cache.put('long', 2)
+        clock.now = 0.5
+        self.assertIsNone(cache.get('short'))
+        self.assertEqual(cache.get('long'), 2)
+        clock.now = 100
+        cache.put('new', 3)
+        # The wheel dropped the expired entry without a get
+        self.assertNotIn('long', cache)
+        self.assertEqual(cache.stats()['expired'], 2)
+
+    def test_wheel_never_drops_early(self):
+        """Tests that an entry scheduled late in a tick survives until its own expiry."""
+        clock = FakeClock()
+        cache = TTLCache(10, ttl=0.5, timer=clock, resolution=1.0)
+        clock.now = 0.9
+        cache.put('a', 1)
+        clock.now = 1.3
+        self.assertEqual(cache.get('a'), 1)
+        clock.now = 1.4
+        self.assertIsNone(cache.get('a'))
+
+    def test_len_and_contains_skip_expired_entries(self):
+        """Tests that len() and `in` drop expired entries without a get, whatever the resolution."""
+        clock = FakeClock()
+        cache = TTLCache(10, ttl=3, timer=clock, resolution=1.0)
+        cache.put('a', 1)
+        cache.put('short', 2, ttl=0.2)
+        clock.now = 0.7
+        cache.put('b', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn('short', cache)
+        for now, size in ((2.99, 2), (3.0, 1), (3.69, 1), (3.7, 0)):
+            clock.now = now
+            self.assertEqual(len(cache), size)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.stats()['expired'], 3)
+        self.assertEqual((len(cache.wheel), cache.expiring), (0, []))
+
+    def test_put_refreshes_ttl_and_capacity_still_applies(self):
+        """Tests that rewriting a key restarts its clock and a full cache evicts by recency."""
+        clock = FakeClock()
+        cache = TTLCache(2, ttl=5, timer=clock)
+        cache.put('a', 1)
+        clock.now = 4
+        cache.put('a', 2)
+        clock.now = 8
+        self.assertEqual(cache.get('a'), 2)
+        cache.put('b', 1)
+        cache.put('c', 1)
+        self.assertEqual(set(cache.map), {'b', 'c'})
+        self.assertEqual(len(cache.wheel), 2)
+
+
+class TestMemoize(unittest.TestCase):
+
+    def test_counts_hits_misses_and_evictions(self):
+        """Tests the counters exposed by cache_info."""
+        calls = []
+
+        @memoize(maxsize=2)
+        def square(x, scale=1):
+            calls.append(x)
+            return x * x * scale
+
+        self.assertEqual([square(2), square(2), square(3), square(2, scale=2), square(3)], [4, 4, 9, 8, 9])
+        self.assertEqual(calls, [2, 3, 2])
+        info = square.cache_info()
+        self.assertEqual((info['hits'], info['misses'], info['evictions']), (2, 3, 1))
+        square.cache_clear()
+        self.assertEqual(square.cache_info()['size'], 0)
+        with self.assertRaises(ValueError):
+            memoize(policy='fifo')(square)
+
+    def test_ttl_is_lru_only(self):
+        """Tests that a ttl is refused with the lfu policy and an invalid policy is refused first."""
+        self.assertIsInstance(memoize(ttl=1.0)(abs).cache, TTLCache)
+        with self.assertRaises(ValueError):
+            memoize(policy='lfu', ttl=1.0)
+        with self.assertRaises(ValueError):
+            memoize(policy='fifo', ttl=1.0)
+
+    def test_thread_safe_computes_once(self):
+        """Tests that concurrent callers of a cold key share one computation."""
+        calls = []
+        started = threading.Event()
+
+        @memoize(policy='lfu', thread_safe=True)
+        def slow(x):
+            calls.append(x)
+            started.wait(0.05)
+            return x
+
+        threads = [threading.Thread(target=slow, args=(7,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, [7])
+
+    def test_thread_safe_does_not_serialize_other_keys(self):
+        """Tests that a slow call holds up neither callers of other keys nor later callers of its own."""
+        release = threading.Event()
+
+        @memoize(thread_safe=True)
+        def slow(x):
+            if x == 'slow':
+                release.wait(5)
+            return x
+
+        thread = threading.Thread(target=slow, args=('slow',))
+        thread.start()
+        fast = threading.Thread(target=slow, args=('fast',))
+        fast.start()
+        fast.join(1)
+        # The fast call finished while the slow one is still running
+        self.assertFalse(fast.is_alive())
+        self.assertTrue(thread.is_alive())
+        release.set()
+        thread.join()
+        self.assertEqual(slow.cache_info()['size'], 2)
+
+    def test_thread_safe_failed_call_is_retried(self):
+        """Tests that an exception is not cached and the next call computes again."""
+        calls = []
+
+        @memoize(thread_safe=True)
+        def flaky(x):
+            calls.append(x)
+            if len(calls) == 1:
+                raise RuntimeError('first call fails')
+            return x
+
+        with self.assertRaises(RuntimeError):
+            flaky(1)
+        self.assertEqual(flaky(1), 1)
+        self.assertEqual(flaky(1), 1)
+        self.assertEqual(calls, [1, 1])
+
+    def test_thread_safe_waiter_of_a_failed_call_claims_the_key(self):
+        """Tests that a waiter taking over a failed call registers itself, so later callers wait for it."""
+        calls = []
+        entered = [threading.Event(), threading.Event()]
+        gates = [threading.Event(), threading.Event()]
+
+        @memoize(thread_safe=True)
+        def flaky(x):
+            attempt = len(calls)
+            calls.append(x)
+            if attempt < 2:
+                entered[attempt].set()
+                gates[attempt].wait(5)
+            if attempt == 0:
+                raise RuntimeError('first call fails')
+            return x
+
+        def call():
+            try:
+                flaky(1)
+            except RuntimeError:
+                pass
+
+        owner = threading.Thread(target=call)
+        owner.start()
+        entered[0].wait(5)
+        waiter = threading.Thread(target=call)
+        waiter.start()
+        waiter.join(0.05)
+        gates[0].set()
+        # The waiter retries the call in place of the owner
+        self.assertTrue(entered[1].wait(5))
+        late = threading.Thread(target=call)
+        late.start()
+        late.join(0.05)
+        self.assertTrue(late.is_alive())
+        gates[1].set()
+        for thread in (owner, waiter, late):
+            thread.join()
+        self.assertEqual(calls, [1, 1])
+        self.assertEqual(flaky(1), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import random
+import unittest
+from look_up.dynamic_connectivity import offline_connectivity
+
+class TestOfflineConnectivity(unittest.TestCase):
+
+    def brute_force(self, size, operations):
+        edges = []
+        answers = []
+        for op, u, v in operations:
+            if op == 'add':
+                edges.append((u, v))
+            elif op == 'remove':
+                edges.remove((u, v) if (u, v) in edges else (v, u))
+            else:
+                reached, frontier = {u}, [u]
+                while frontier:
+                    node = frontier.pop()
+                    for a, b in edges:
+                        for x, y in ((a, b), (b, a)):
+                            if x == node and y not in reached:
+                                reached.add(y)
+                                frontier.append(y)
+                answers.append(v in reached)
+        return answers
+
+    def test_insert_delete_and_query(self):
+        """Tests a short stream where a path is built and cut again."""
+        operations = [
+            ('query', 0, 2),
+            ('add', 0, 1),
+            ('add', 1, 2),
+            ('query', 0, 2),
+            ('remove', 2, 1),
+            ('query', 0, 2),
+            ('query', 0, 1),
+        ]
+        self.assertEqual(offline_connectivity(3, operations), [False, True, False, True])
+
+    def test_duplicate_edges(self):
+        """Tests that removing one copy of a doubled edge keeps the nodes connected."""
+        operations = [('add', 0, 1), ('add', 1, 0), ('remove', 0, 1), ('query', 0, 1),
+                      ('remove', 0, 1), ('query', 0, 1)]
+        self.assertEqual(offline_connectivity(2, operations), [True, False])
+
+    def test_random_streams_match_brute_force(self):
+        """Tests random streams against a search over the live edges."""
+        rng = random.Random(5)
+        for _ in range(20):
+            size = 8
+            live, operations = [], []
+            for _ in range(60):
+                roll = rng.random()
+                if roll < 0.4:
+                    edge = (rng.randrange(size), rng.randrange(size))
+                    live.append(edge)
+                    operations.append(('add', *edge))
+                elif roll < 0.6 and live:
+                    edge = live.pop(rng.randrange(len(live)))
+                    operations.append(('remove', *edge))
+                else:
+                    operations.append(('query', rng.randrange(size), rng.randrange(size)))
+            self.assertEqual(offline_connectivity(size, operations), self.brute_force(size, operations))
+
+    def test_invalid_operations_raise_error(self):
+        """Tests that unknown operations and removing absent edges raise ValueError."""
+        with self.assertRaises(ValueError):
+            offline_connectivity(2, [('remove', 0, 1)])
+        with self.assertRaises(ValueError):
+            offline_connectivity(2, [('merge', 0, 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import random
+import unittest
+import unittest.mock
+from array import array
+import look_up.fenwick_tree
+from look_up.fenwick_tree import FenwickTree, RangeFenwickTree
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class TestFenwickTree(unittest.TestCase):
+
+    def test_build_matches_prefix_sums(self):
+        """Tests that the O(n) build gives the same sums as accumulating the input."""
+        values = [random.Random(1).randrange(-100, 100) for _ in range(37)]
+        tree = FenwickTree(values)
+        self.assertIsInstance(tree.tree, array)
+        self.assertEqual(len(tree), 37)
+        for i in range(38):
+            self.assertEqual(tree.prefix_sum(i), sum(values[:i]))
+
+    def test_add_and_range_sum(self):
+        """Tests point updates, get and set."""
+        tree = FenwickTree(10)
+        tree.add(3, 5)
+        tree.add(7, 2)
+        tree.set(3, 1)
+        self.assertEqual(tree.range_sum(0, 10), 3)
+        self.assertEqual(tree.range_sum(4, 8), 2)
+        self.assertEqual(tree.get(3), 1)
+        self.assertEqual(tree.range_sum(5, 5), 0)
+
+    def test_invalid_indices(self):
+        """Tests that indices outside the tree raise IndexError."""
+        tree = FenwickTree([1, 2, 3])
+        with self.assertRaises(IndexError):
+            tree.add(3, 1)
+        with self.assertRaises(IndexError):
+            tree.prefix_sum(4)
+        with self.assertRaises(IndexError):
+            tree.range_sum(2, 1)
+
+    def test_float_tree(self):
+        """Tests a tree of doubles."""
+        tree = FenwickTree([0.5, 0.25, 0.125], typecode='d')
+        tree.add(0, 0.5)
+        self.assertEqual(tree.prefix_sum(3), 1.375)
+
+    def test_batches_match_scalar_calls(self):
+        """Tests query_many and update_many, with and without NumPy."""
+        rng = random.Random(2)
+        values = [rng.randrange(1000) for _ in range(200)]
+        indices = [rng.randrange(200) for _ in range(300)]
+        deltas = [rng.randrange(-50, 50) for _ in range(300)]
+        los = [rng.randrange(200) for _ in range(100)]
+        his = [rng.randrange(lo, 201) for lo in los]
+        modules = [None] + ([np] if np is not None else [])
+        for module in modules:
+            with unittest.mock.patch.object(look_up.fenwick_tree, 'np', module):
+                tree = FenwickTree(values)
+                expected = list(values)
+                tree.update_many(indices, deltas)
+                for i, delta in zip(indices, deltas):
+                    expected[i] += delta
+                self.assertEqual([int(total) for total in tree.query_many(los, his)],
+                                 [sum(expected[lo:hi]) for lo, hi in zip(los, his)])
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_numpy_input(self):
+        """Tests building from a NumPy array and batch index checks."""
+        tree = FenwickTree(np.arange(10))
+        self.assertEqual(tree.prefix_sum(10), 45)
+        with self.assertRaises(IndexError):
+            tree.update_many([10], [1])
+        with self.assertRaises(IndexError):
+            tree.query_many([3], [2])
+
+
+class TestRangeFenwickTree(unittest.TestCase):
+
+    def test_range_add_against_list(self):
+        """Tests random range adds and range sums against a plain list."""
+        rng = random.Random(3)
+        values = [rng.randrange(100) for _ in range(64)]
+        tree = RangeFenwickTree(values)
+        for _ in range(300):
+            lo = rng.randrange(65)
+            hi = rng.randrange(lo, 65)
+            if rng.random() < 0.5:
+                delta = rng.randrange(-20, 20)
+                tree.add(lo, hi, delta)
+                for i in range(lo, hi):
+                    values[i] += delta
+            else:
+                self.assertEqual(tree.range_sum(lo, hi), sum(values[lo:hi]))
+        self.assertEqual([tree.get(i) for i in range(64)], values)
+
+    def test_get_out_of_bounds(self):
+        """Tests that get() raises IndexError outside the values, like FenwickTree.get()."""
+        tree = RangeFenwickTree([4, 5, 6])
+        self.assertEqual(tree.get(0), 4)
+        for i in (-1, 3):
+            with self.assertRaises(IndexError):
+                tree.get(i)
+
+    def test_batches_match_scalar_calls(self):
+        """Tests update_many and query_many, with and without NumPy."""
+        rng = random.Random(4)
+        los = [rng.randrange(50) for _ in range(80)]
+        his = [rng.randrange(lo, 51) for lo in los]
+        deltas = [rng.randrange(-9, 10) for _ in range(80)]
+        modules = [None] + ([np] if np is not None else [])
+        for module in modules:
+            with unittest.mock.patch.object(look_up.fenwick_tree, 'np', module):
+                tree, expected = RangeFenwickTree(50), [0] * 50
+                tree.update_many(los, his, deltas)
+                for lo, hi, delta in zip(los, his, deltas):
+                    for i in range(lo, hi):
+                        expected[i] += delta
+                self.assertEqual([int(total) for total in tree.query_many(los, his)],
+                                 [sum(expected[lo:hi]) for lo, hi in zip(los, his)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import unittest
+import unittest.mock
+import look_up.parallel_components
+from multiprocessing.shared_memory import SharedMemory
+from look_up.parallel_components import connected_components, component_labels
+from look_up.union_find import UnionFind, CompactUnionFind
+
+class TestParallelComponents(unittest.TestCase):
+
+    def random_edges(self, n, m, seed):
+        rng = random.Random(seed)
+        return [rng.randrange(n) for _ in range(m)], [rng.randrange(n) for _ in range(m)]
+
+    def single_threaded_labels(self, n, xs, ys):
+        uf = UnionFind(n)
+        for x, y in zip(xs, ys):
+            uf.union(x, y)
+        return list(component_labels(uf))
+
+    def test_component_labels_are_smallest_nodes(self):
+        """Tests that every node is labelled with the smallest node of its component."""
+        uf = CompactUnionFind(6)
+        uf.union(5, 3)
+        uf.union(3, 1)
+        uf.union(4, 2)
+        self.assertEqual(list(component_labels(uf)), [0, 1, 2, 1, 2, 1])
+
+    def test_single_worker_matches_union_find(self):
+        """Tests the in-process path against a plain UnionFind."""
+        xs, ys = self.random_edges(300, 200, 1)
+        labels = connected_components(300, xs, ys, workers=1)
+        self.assertEqual(list(labels), self.single_threaded_labels(300, xs, ys))
+
+    def test_process_pool_matches_union_find(self):
+        """Tests that sharded labelling in worker processes gives the same labels."""
+        xs, ys = self.random_edges(500, 400, 2)
+        labels = connected_components(500, xs, ys, workers=2, shards=4)
+        self.assertEqual(list(labels), self.single_threaded_labels(500, xs, ys))
+
+    def test_process_pool_without_numpy(self):
+        """Tests the scalar fallback used when NumPy is not installed."""
+        xs, ys = self.random_edges(200, 150, 3)
+        with unittest.mock.patch.object(look_up.parallel_components, 'np', None):
+            labels = connected_components(200, xs, ys, workers=2)
+        self.assertEqual(list(labels), self.single_threaded_labels(200, xs, ys))
+
+    def test_empty_edge_list(self):
+        """Tests that a graph without edges labels every node with itself."""
+        self.assertEqual(list(connected_components(4, [], [], workers=2)), [0, 1, 2, 3])
+
+    def test_failed_allocation_frees_shared_memory(self):
+        """Tests that the edge segment is unlinked when the label segment cannot be created."""
+        created = []
+
+        def shared_memory(*args, **kwargs):
+            if len(created) == 1:
+                raise OSError('No space left on device')
+            created.append(SharedMemory(*args, **kwargs))
+            return created[-1]
+
+        xs, ys = self.random_edges(50, 40, 4)
+        with unittest.mock.patch.object(look_up.parallel_components, 'SharedMemory', shared_memory):
+            with self.assertRaises(OSError):
+                connected_components(50, xs, ys, workers=2)
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=created[0].name)
+
+    def test_mismatched_edge_arrays_raise_error(self):
+        """Tests that xs and ys of different length raise ValueError."""
+        with self.assertRaises(ValueError):
+            connected_components(4, [0, 1], [2], workers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
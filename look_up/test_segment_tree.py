@@ -0,0 +1,71 @@
+import math
+import random
+import unittest
+from array import array
+from look_up.segment_tree import (ADD, ADD_TO_SUM, ASSIGN, ASSIGN_TO_SUM, MAX, MIN, SUM, Action,
+                                  LazySegmentTree, Monoid)
+
+class TestLazySegmentTree(unittest.TestCase):
+
+    def check_against_list(self, monoid, action, fold, apply, typecode=None, seed=0):
+        rng = random.Random(seed)
+        values = [rng.randrange(-50, 50) for _ in range(rng.randrange(1, 70))]
+        tree = LazySegmentTree(values, monoid, action, typecode=typecode)
+        n = len(values)
+        for _ in range(400):
+            lo = rng.randrange(n + 1)
+            hi = rng.randrange(lo, n + 1)
+            roll = rng.random()
+            if roll < 0.4:
+                f = rng.randrange(-10, 10)
+                tree.update(lo, hi, f)
+                values[lo:hi] = [apply(f, value) for value in values[lo:hi]]
+            elif roll < 0.5:
+                value = rng.randrange(-50, 50)
+                tree.set(lo % n, value)
+                values[lo % n] = value
+            else:
+                expected = fold(values[lo:hi]) if hi > lo else monoid.identity
+                self.assertEqual(tree.query(lo, hi), expected)
+        self.assertEqual([tree.get(i) for i in range(n)], values)
+
+    def test_sum_with_range_add(self):
+        """Tests range add on a sum tree against a list, typed and untyped."""
+        for seed, typecode in enumerate((None, 'q', 'd')):
+            self.check_against_list(SUM, ADD_TO_SUM, sum, lambda f, x: x + f, typecode, seed)
+
+    def test_sum_with_range_assign(self):
+        """Tests range assignment on a sum tree."""
+        self.check_against_list(SUM, ASSIGN_TO_SUM, sum, lambda f, x: f, 'q', seed=5)
+
+    def test_min_and_max(self):
+        """Tests range min and max with range add and assignment."""
+        self.check_against_list(MIN, ADD, min, lambda f, x: x + f, 'd', seed=6)
+        self.check_against_list(MAX, ASSIGN, max, lambda f, x: f, None, seed=7)
+
+    def test_custom_monoid(self):
+        """Tests a gcd tree with range multiplication as the update."""
+        gcd = Monoid(math.gcd, 0)
+        scale = Action(lambda f, x, length: x * f, lambda f, g: f * g, 1)
+        tree = LazySegmentTree([12, 18, 30, 7], gcd, scale)
+        self.assertEqual(tree.query(0, 3), 6)
+        tree.update(0, 2, 5)
+        self.assertEqual(tree.query(0, 3), 30)
+        self.assertEqual(tree.query(1, 2), 90)
+        self.assertEqual(tree.all(), 1)
+
+    def test_batches_and_edges(self):
+        """Tests query_many/update_many, empty ranges and invalid ranges."""
+        tree = LazySegmentTree(8, SUM, ADD_TO_SUM, typecode='q')
+        self.assertIsInstance(tree.tree, array)
+        tree.update_many([0, 2], [4, 8], [1, 10])
+        self.assertEqual(tree.query_many([0, 3, 5], [8, 4, 5]), [64, 11, 0])
+        with self.assertRaises(IndexError):
+            tree.query(3, 9)
+        with self.assertRaises(ValueError):
+            tree.update_many([0], [1, 2], [1])
+        self.assertEqual(LazySegmentTree([], MIN, ADD).all(), float('inf'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,14 @@
 import unittest
-from look_up.union_find import UnionFind
+import os
+import pickle
+import random
+import tempfile
+import sys
+import unittest.mock
+from array import array
+import look_up.union_find
+from fractions import Fraction
+from look_up.union_find import UnionFind, CompactUnionFind, KeyedUnionFind, RollbackUnionFind, WeightedUnionFind, Group
 
 class TestUnionFind(unittest.TestCase):
 
@@ -105,5 +114,415 @@ class TestUnionFind(unittest.TestCase):
         with self.assertRaises(ValueError):
             uf.find(100)
 
+
+class TestCompactUnionFind(unittest.TestCase):
+
+    def test_initialization(self):
+        """Tests that parent and sizes are typed arrays with the initial values."""
+        uf = CompactUnionFind(10)
+        self.assertIsInstance(uf.parent, array)
+        self.assertEqual(uf.parent.typecode, 'i')
+        self.assertEqual(list(uf.parent), list(range(10)))
+        self.assertEqual(list(uf.compontent_lengths), [1] * 10)
+        self.assertEqual(len(uf), 10)
+
+    def test_union_by_size(self):
+        """Tests that the smaller tree is attached to the larger one."""
+        uf = CompactUnionFind(5)
+        self.assertTrue(uf.union(0, 1))
+        self.assertTrue(uf.union(2, 3))
+        self.assertTrue(uf.union(4, 2))
+        self.assertTrue(uf.union(0, 2))
+
+        root = uf.find(0)
+        self.assertEqual(root, 2)
+        self.assertEqual(uf.compontent_lengths[root], 5)
+        self.assertFalse(uf.union(1, 4))
+
+    def test_path_halving(self):
+        """Tests that find shortens the path it walks."""
+        uf = CompactUnionFind(5)
+        # Build the chain 4 -> 3 -> 2 -> 1 -> 0 by hand
+        for i in range(1, 5):
+            uf.parent[i] = i - 1
+        self.assertEqual(uf.find(4), 0)
+        self.assertEqual(uf.parent[4], 2)
+        self.assertEqual(uf.parent[2], 0)
+
+    def test_deep_chain_does_not_hit_recursion_limit(self):
+        """Tests that find works on chains longer than the recursion limit."""
+        n = sys.getrecursionlimit() * 3
+        uf = CompactUnionFind(n)
+        for i in range(1, n):
+            uf.parent[i] = i - 1
+        self.assertEqual(uf.find(n - 1), 0)
+
+    def test_matches_list_union_find(self):
+        """Tests that both implementations build the same components."""
+        edges = [(0, 5), (1, 7), (5, 9), (2, 3), (7, 9), (4, 4), (8, 6)]
+        uf, compact = UnionFind(10), CompactUnionFind(10)
+        for x, y in edges:
+            uf.union(x, y)
+            compact.union(x, y)
+        for x in range(10):
+            for y in range(10):
+                self.assertEqual(uf.find(x) == uf.find(y), compact.connected(x, y))
+
+    def test_find_out_of_bounds_raises_error(self):
+        """Tests that find() raises ValueError for out-of-bounds indices."""
+        uf = CompactUnionFind(10)
+        with self.assertRaises(ValueError):
+            uf.find(10)
+        with self.assertRaises(ValueError):
+            uf.find(-1)
+
+
+class TestCompactUnionFindSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.uf = CompactUnionFind(100)
+        rng = random.Random(9)
+        for _ in range(60):
+            self.uf.union(rng.randrange(100), rng.randrange(100))
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def assertSameComponents(self, uf):
+        self.assertEqual([uf.find(x) for x in range(100)], [self.uf.find(x) for x in range(100)])
+        self.assertEqual(list(uf.compontent_lengths), list(self.uf.compontent_lengths))
+
+    def test_dump_layout(self):
+        """Tests the header and the little-endian arrays that follow it."""
+        self.uf.dump(self.path)
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        header = CompactUnionFind.SNAPSHOT_HEADER
+        self.assertEqual(header.unpack(data[:header.size]), (b'CUFSNAP1', b'i', 100))
+        self.assertEqual(len(data), header.size + 2 * 100 * 4)
+        self.assertEqual(int.from_bytes(data[header.size + 4 * 7:header.size + 4 * 8], 'little'),
+                         self.uf.parent[7])
+
+    def test_load_with_and_without_mmap(self):
+        """Tests that both load paths restore the same components."""
+        self.uf.dump(self.path)
+        for use_mmap in (True, False):
+            uf = CompactUnionFind.load(self.path, use_mmap=use_mmap)
+            self.assertSameComponents(uf)
+            uf.union(0, 99)
+            self.assertTrue(uf.connected(0, 99))
+        # Unions on a mapped copy never reach the file
+        self.assertSameComponents(CompactUnionFind.load(self.path))
+
+    def test_load_rejects_other_files(self):
+        """Tests that a file without the magic or with missing data is refused."""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot' * 4)
+        with self.assertRaises(ValueError):
+            CompactUnionFind.load(self.path)
+        self.uf.dump(self.path)
+        with open(self.path, 'r+b') as f:
+            f.truncate(100)
+        for use_mmap in (True, False):
+            with self.assertRaises(ValueError):
+                CompactUnionFind.load(self.path, use_mmap=use_mmap)
+
+    def test_pickle_out_of_band(self):
+        """Tests protocol 5 out-of-band buffers as well as in-band pickles."""
+        buffers = []
+        data = pickle.dumps(self.uf, protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 2)
+        uf = pickle.loads(data, buffers=[bytearray(buffer.raw()) for buffer in buffers])
+        self.assertSameComponents(uf)
+        for protocol in (2, 5):
+            self.assertSameComponents(pickle.loads(pickle.dumps(self.uf, protocol=protocol)))
+
+
+class TestCompactUnionFindBatches(unittest.TestCase):
+
+    def assert_same_components(self, n, edges):
+        scalar, batched = CompactUnionFind(n), CompactUnionFind(n)
+        scalar_merges = sum(scalar.union(x, y) for x, y in edges)
+        roots, merges = batched.union_many([x for x, _ in edges], [y for _, y in edges])
+
+        self.assertEqual(merges, scalar_merges)
+        self.assertEqual(len(roots), len(edges))
+        labels = {}
+        for node in range(n):
+            # Same partition: every scalar root maps to exactly one batched root
+            self.assertEqual(labels.setdefault(scalar.find(node), batched.find(node)), batched.find(node))
+            self.assertEqual(batched.compontent_lengths[batched.find(node)],
+                             scalar.compontent_lengths[scalar.find(node)])
+        for (x, _), root in zip(edges, roots):
+            self.assertEqual(root, batched.find(x))
+
+    def random_edges(self, n, m, seed):
+        rng = random.Random(seed)
+        return [(rng.randrange(n), rng.randrange(n)) for _ in range(m)]
+
+    def test_union_many_matches_scalar_union(self):
+        """Tests that batched unions build the same components as scalar ones."""
+        for seed in range(5):
+            self.assert_same_components(200, self.random_edges(200, 150, seed))
+
+    def test_union_many_on_long_path(self):
+        """Tests a batch that links a path in both directions."""
+        edges = [(i, i + 1) for i in range(0, 300, 2)] + [(i + 1, i) for i in range(1, 299, 2)]
+        self.assert_same_components(300, edges)
+
+    def test_union_many_across_batches(self):
+        """Tests that consecutive batches keep merging existing components."""
+        uf = CompactUnionFind(6)
+        _, merges = uf.union_many([0, 2], [1, 3])
+        self.assertEqual(merges, 2)
+        _, merges = uf.union_many([1, 0, 4], [3, 2, 4])
+        self.assertEqual(merges, 1)
+        self.assertTrue(uf.connected(0, 3))
+        self.assertEqual(uf.compontent_lengths[uf.find(2)], 4)
+
+    def test_union_many_roots_match_scalar_across_batches(self):
+        """Tests that batches merging two components at a time give the same roots as union()."""
+        rng = random.Random(12)
+        n = 256
+        scalar, batched = CompactUnionFind(n), CompactUnionFind(n)
+        for _ in range(7):
+            # Pair up the current components, every new component merges exactly two old ones
+            roots = sorted({scalar.find(node) for node in range(n)})
+            rng.shuffle(roots)
+            pairs = list(zip(roots[::2], roots[1::2]))
+            edges = []
+            for a, b in pairs:
+                members_a = [node for node in range(n) if scalar.find(node) == a]
+                members_b = [node for node in range(n) if scalar.find(node) == b]
+                # Several edges per pair, so repeated and redundant edges are covered too
+                edges.extend((rng.choice(members_a), rng.choice(members_b)) for _ in range(rng.randrange(1, 4)))
+            rng.shuffle(edges)
+            for x, y in edges:
+                scalar.union(x, y)
+            batched.union_many([x for x, _ in edges], [y for _, y in edges])
+            self.assertEqual(list(batched.find_many(array('q', range(n)))), [scalar.find(x) for x in range(n)])
+
+    def test_union_many_keeps_union_by_size(self):
+        """Tests that every batched root is an old root of the largest merged size, so trees stay shallow."""
+        for seed in range(5):
+            uf = CompactUnionFind(500)
+            for batch in range(6):
+                edges = self.random_edges(500, 60, seed * 10 + batch)
+                before = {node: (uf.find(node), uf.compontent_lengths[uf.find(node)]) for node in range(500)}
+                uf.union_many([x for x, _ in edges], [y for _, y in edges])
+                merged = {}
+                for node, (root, size) in before.items():
+                    merged.setdefault(uf.find(node), {})[root] = size
+                for new_root, old_roots in merged.items():
+                    self.assertIn(new_root, old_roots)
+                    self.assertEqual(old_roots[new_root], max(old_roots.values()))
+            depths = []
+            for node in range(500):
+                depth = 0
+                while uf.parent[node] != node:
+                    node, depth = uf.parent[node], depth + 1
+                depths.append(depth)
+            self.assertLessEqual(max(depths), 9)
+
+    def test_find_many_matches_find(self):
+        """Tests that find_many returns the same roots as find."""
+        uf = CompactUnionFind(100)
+        for x, y in self.random_edges(100, 60, 7):
+            uf.union(x, y)
+        nodes = array('q', range(100))
+        self.assertEqual(list(uf.find_many(nodes)), [uf.find(x) for x in range(100)])
+
+    def test_union_many_rejects_bad_input(self):
+        """Tests that invalid ids and mismatched lengths raise ValueError."""
+        uf = CompactUnionFind(5)
+        with self.assertRaises(ValueError):
+            uf.union_many([0, 1], [2])
+        with self.assertRaises(ValueError):
+            uf.find_many([0, 5])
+
+    def test_without_numpy(self):
+        """Tests the scalar fallback used when NumPy is not installed."""
+        with unittest.mock.patch.object(look_up.union_find, 'np', None):
+            self.assert_same_components(50, self.random_edges(50, 40, 3))
+            uf = CompactUnionFind(3)
+            self.assertEqual(list(uf.find_many([0, 1, 2])), [0, 1, 2])
+
+
+class TestKeyedUnionFind(unittest.TestCase):
+
+    def test_queries_do_not_intern_unknown_keys(self):
+        """Tests that unknown keys act as singletons without being stored, and add() interns them."""
+        uf = KeyedUnionFind(['a', 'b'])
+        self.assertEqual(len(uf), 2)
+        self.assertEqual(uf.num_components, 2)
+        self.assertEqual(uf.find('c'), 'c')
+        self.assertEqual(uf.component_size('c'), 1)
+        self.assertTrue(uf.connected('c', 'c'))
+        self.assertFalse(uf.connected('a', 'c'))
+        self.assertNotIn('c', uf)
+        self.assertEqual((len(uf), uf.num_components), (2, 2))
+        uf.add('c')
+        self.assertIn('c', uf)
+        self.assertEqual(uf.num_components, 3)
+
+    def test_union_of_hashable_keys(self):
+        """Tests unions of string and tuple keys."""
+        uf = KeyedUnionFind()
+        self.assertTrue(uf.union('x', (1, 2)))
+        self.assertTrue(uf.union((1, 2), frozenset({3})))
+        self.assertFalse(uf.union('x', frozenset({3})))
+
+        self.assertTrue(uf.connected('x', frozenset({3})))
+        self.assertFalse(uf.connected('x', 'y'))
+        self.assertEqual(uf.component_size((1, 2)), 3)
+        self.assertIn(uf.find('x'), ('x', (1, 2), frozenset({3})))
+
+    def test_num_components_is_kept_incrementally(self):
+        """Tests the component count against a scan of all roots."""
+        rng = random.Random(11)
+        uf = KeyedUnionFind()
+        for _ in range(500):
+            uf.union(f'n{rng.randrange(300)}', f'n{rng.randrange(300)}')
+        roots = {uf.find(key) for key in uf.keys}
+        self.assertEqual(uf.num_components, len(roots))
+
+    def test_arrays_grow_geometrically(self):
+        """Tests that capacity doubles instead of growing by one."""
+        uf = KeyedUnionFind(range(9))
+        self.assertEqual(len(uf.parent), 16)
+        for key in range(9, 1000):
+            uf.add(key)
+        self.assertEqual(len(uf.parent), 1024)
+        self.assertEqual(uf.num_components, 1000)
+
+
+class TestRollbackUnionFind(unittest.TestCase):
+
+    def test_rollback_restores_components(self):
+        """Tests that rollback undoes every union made after the snapshot."""
+        uf = RollbackUnionFind(6)
+        uf.union(0, 1)
+        parents, lengths = list(uf.parent), list(uf.compontent_lengths)
+        token = uf.snapshot()
+
+        uf.union(1, 2)
+        uf.union(3, 4)
+        uf.union(0, 2)
+        self.assertTrue(uf.connected(0, 2))
+        self.assertEqual(uf.num_components, 3)
+
+        uf.rollback(token)
+        self.assertEqual(list(uf.parent), parents)
+        self.assertEqual(list(uf.compontent_lengths), lengths)
+        self.assertEqual(uf.num_components, 5)
+        self.assertFalse(uf.connected(0, 2))
+
+    def test_nested_snapshots(self):
+        """Tests rolling back to an inner and then to an outer snapshot."""
+        uf = RollbackUnionFind(4)
+        outer = uf.snapshot()
+        uf.union(0, 1)
+        inner = uf.snapshot()
+        uf.union(2, 3)
+        uf.rollback(inner)
+        self.assertTrue(uf.connected(0, 1))
+        self.assertFalse(uf.connected(2, 3))
+        uf.rollback(outer)
+        self.assertFalse(uf.connected(0, 1))
+
+    def test_find_does_not_compress(self):
+        """Tests that find leaves the parent array untouched."""
+        uf = RollbackUnionFind(4)
+        uf.union(0, 1)
+        uf.union(2, 3)
+        uf.union(0, 2)
+        parents = list(uf.parent)
+        for x in range(4):
+            uf.find(x)
+        self.assertEqual(list(uf.parent), parents)
+
+    def test_invalid_rollback_raises_error(self):
+        """Tests that undo on empty history and stale tokens raise ValueError."""
+        uf = RollbackUnionFind(3)
+        with self.assertRaises(ValueError):
+            uf.undo()
+        uf.union(0, 1)
+        token = uf.snapshot()
+        uf.rollback(0)
+        with self.assertRaises(ValueError):
+            uf.rollback(token)
+
+
+class TestWeightedUnionFind(unittest.TestCase):
+
+    def test_additive_offsets(self):
+        """Tests relative offsets across merged components."""
+        uf = WeightedUnionFind(5)
+        self.assertTrue(uf.union(0, 1, 3))   # 1 = 0 + 3
+        self.assertTrue(uf.union(2, 3, -2))  # 3 = 2 - 2
+        self.assertTrue(uf.union(1, 3, 10))  # 3 = 1 + 10
+        self.assertEqual(uf.diff(0, 1), 3)
+        self.assertEqual(uf.diff(0, 3), 13)
+        self.assertEqual(uf.diff(0, 2), 15)
+        self.assertEqual(uf.diff(2, 0), -15)
+        self.assertEqual(uf.diff(4, 4), 0)
+
+    def test_multiplicative_ratios(self):
+        """Tests currency style ratios with exact fractions."""
+        uf = WeightedUnionFind(3, group='mul')
+        uf.union(0, 1, Fraction(2))     # 1 unit of 0 is worth 2 units of 1
+        uf.union(1, 2, Fraction(3, 4))
+        self.assertEqual(uf.diff(0, 2), Fraction(3, 2))
+        self.assertEqual(uf.diff(2, 0), Fraction(2, 3))
+
+    def test_consistent_union_is_accepted(self):
+        """Tests that a redundant union agreeing with known offsets is a no-op."""
+        uf = WeightedUnionFind(3, group='mul')
+        uf.union(0, 1, 0.1)
+        uf.union(1, 2, 3.0)
+        self.assertFalse(uf.union(0, 2, 0.3))
+
+    def test_contradictory_union_raises_error(self):
+        """Tests that a union disagreeing with known offsets raises ValueError."""
+        uf = WeightedUnionFind(3)
+        uf.union(0, 1, 1)
+        uf.union(1, 2, 1)
+        with self.assertRaises(ValueError):
+            uf.union(0, 2, 3)
+        self.assertEqual(uf.diff(0, 2), 2)
+
+    def test_offsets_survive_path_compression(self):
+        """Tests random offsets against their ground truth after many finds."""
+        rng = random.Random(4)
+        n = 200
+        truth = [rng.randrange(-1000, 1000) for _ in range(n)]
+        uf = WeightedUnionFind(n)
+        for _ in range(300):
+            x, y = rng.randrange(n), rng.randrange(n)
+            uf.union(x, y, truth[y] - truth[x])
+        for _ in range(500):
+            x, y = rng.randrange(n), rng.randrange(n)
+            if uf.connected(x, y):
+                self.assertEqual(uf.diff(x, y), truth[y] - truth[x])
+
+    def test_custom_group(self):
+        """Tests a user supplied group, here xor over bit masks."""
+        xor_group = Group(lambda a, b: a ^ b, lambda a: a, 0)
+        uf = WeightedUnionFind(3, group=xor_group)
+        uf.union(0, 1, 0b101)
+        uf.union(1, 2, 0b011)
+        self.assertEqual(uf.diff(0, 2), 0b110)
+
+    def test_invalid_arguments_raise_error(self):
+        """Tests unknown groups and diff across components."""
+        with self.assertRaises(ValueError):
+            WeightedUnionFind(3, group='max')
+        uf = WeightedUnionFind(3)
+        with self.assertRaises(ValueError):
+            uf.diff(0, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -6,7 +6,43 @@
 
     In reality, you can have many other ways to implement similar ideas depending on the problems. 
     This a general version for reference. 
+
+    CompactUnionFind keeps the same find/union API but stores parent and component sizes in typed
+    arrays instead of lists of boxed ints, and finds iteratively with path halving so that deep
+    chains never touch the recursion limit. Use it for graphs with tens of millions of nodes.
+    Its find_many/union_many process whole batches of node ids (NumPy arrays or any buffer) with
+    vectorized pointer jumping when NumPy is installed, and fall back to the scalar loop otherwise.
+    dump() writes a 32 byte header followed by the raw little-endian parent and size arrays, and
+    load() maps such a file copy-on-write with mmap, so restoring is O(1) and pages are only read
+    when they are touched. Pickling with protocol 5 hands both arrays out as out-of-band buffers.
+
+    KeyedUnionFind accepts any hashable element without knowing the number of elements up front.
+    Keys are interned into dense ids by add() and union() and the arrays grow geometrically. Queries
+    never store a key: find(), connected() and component_size() treat an unknown key as a singleton.
+
+    RollbackUnionFind unites by size without path compression, so every union changes only two
+    array cells. It records them in an undo log, which lets snapshot()/rollback() undo tentative
+    merges in time proportional to the number of unions since the snapshot.
+
+    WeightedUnionFind also stores the potential of every node relative to its parent, e.g. a clock
+    skew or a currency ratio. union(x, y, w) records that y = x + w (or y = x * w for the
+    multiplicative group), find() folds potentials while it compresses paths, and diff(x, y) answers
+    the relative offset of two connected nodes in amortized near constant time.
 """
+import math
+import mmap
+import operator
+import pickle
+import struct
+import sys
+from array import array
+from typing import Any, BinaryIO, Callable, Hashable, Iterable, NamedTuple, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class UnionFind:
     def __init__(self, size: int):
         self.parent = []
@@ -31,4 +67,441 @@ class UnionFind:
         if self.compontent_lengths[x] < self.compontent_lengths[y]:
             x, y = y, x
         self.parent[y] = x
-        self.compontent_lengths[x] += self.compontent_lengths[y]
\ No newline at end of file
+        self.compontent_lengths[x] += self.compontent_lengths[y]
+
+
+class Group(NamedTuple):
+    combine: Callable[[Any, Any], Any]
+    inverse: Callable[[Any], Any]
+    identity: Any
+
+
+def _reciprocal(value: Any) -> Any:
+    # Keeps the integer identity an integer so exact types such as Fraction stay exact
+    return value if value == 1 else 1 / value
+
+
+ADDITIVE = Group(operator.add, operator.neg, 0)
+MULTIPLICATIVE = Group(operator.mul, _reciprocal, 1)
+
+
+class CompactUnionFind:
+    # magic, typecode, padding, number of nodes: 32 bytes keep the arrays 8 byte aligned
+    SNAPSHOT_HEADER = struct.Struct('<8sc7xQ8x')
+    SNAPSHOT_MAGIC = b'CUFSNAP1'
+
+    def __init__(self, size: int):
+        if size < 0:
+            raise ValueError('Invalid size, cannot be smaller than 0')
+        # 32-bit ids are enough for up to 2^31 - 1 nodes and halve the memory of 64-bit ones
+        self.typecode = 'i' if size <= 2**31 - 1 else 'q'
+        self.parent = array(self.typecode, range(size))
+        self.compontent_lengths = array(self.typecode, [1]) * size
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        if x < 0 or x >= len(parent):
+            raise ValueError('Invalid node position, cannot be larger than its parent length or smaller than 0')
+        # Path halving: every visited node skips to its grandparent
+        while parent[x] != x:
+            grand_parent = parent[parent[x]]
+            parent[x] = grand_parent
+            x = grand_parent
+        return x
+
+    def union(self, x: int, y: int) -> bool:
+        x = self.find(x)
+        y = self.find(y)
+        if x == y:
+            return False
+        lengths = self.compontent_lengths
+        if lengths[x] < lengths[y]:
+            x, y = y, x
+        self.parent[y] = x
+        lengths[x] += lengths[y]
+        return True
+
+    def connected(self, x: int, y: int) -> bool:
+        return self.find(x) == self.find(y)
+
+    def find_many(self, xs: Any) -> Any:
+        if np is None:
+            return array(self.typecode, [self.find(x) for x in xs])
+        parent = self._view(self.parent)
+        xs = self._as_nodes(xs)
+        roots = self._roots(parent, xs)
+        parent[xs] = roots
+        return roots
+
+    def union_many(self, xs: Any, ys: Any) -> Tuple[Any, int]:
+        """
+            Unites x[i] with y[i] for every i and returns the final root of every x[i] together
+            with the number of unions that merged two different components. Components and their
+            sizes are the same as calling union() edge by edge, and so is the root whenever the
+            batch merges at most two old components into each new one: it is the old root of the
+            largest component, on a tie the one of the first edge that mentions it on its x side
+            (then y side), like union() keeps x on a tie. When a batch merges three or more old
+            components into one, the scalar root depends on the order of the unions; the batch
+            still picks the largest old root, so union by size and its O(log n) depth still hold.
+        """
+        if np is None:
+            xs, ys = list(xs), list(ys)
+            if len(xs) != len(ys):
+                raise ValueError('Invalid edge arrays, xs and ys must have the same length')
+            merges = sum(self.union(x, y) for x, y in zip(xs, ys))
+            return self.find_many(xs), merges
+
+        parent = self._view(self.parent)
+        lengths = self._view(self.compontent_lengths)
+        xs, ys = self._as_nodes(xs), self._as_nodes(ys)
+        if xs.shape != ys.shape:
+            raise ValueError('Invalid edge arrays, xs and ys must have the same length')
+
+        rx, ry = self._roots(parent, xs), self._roots(parent, ys)
+        pending = rx != ry
+        rx, ry = rx[pending], ry[pending]
+        # Old roots in edge order, x before y, to break size ties like union() does
+        mentioned = np.stack((rx, ry), axis=1).ravel()
+        touched, first = self._distinct(mentioned, len(parent))
+        touched_lengths = lengths[touched]
+        while rx.size:
+            # Hook the larger root of every edge below the smallest root it meets. Pointers only
+            # ever decrease, so no cycle can appear even when many edges hit the same root.
+            np.minimum.at(parent, np.maximum(rx, ry), np.minimum(rx, ry))
+            # Only touched roots changed their parent, so jumping over them flattens every tree
+            while True:
+                up = parent[touched]
+                jumped = parent[up]
+                if np.array_equal(up, jumped):
+                    break
+                parent[touched] = jumped
+            rx, ry = parent[rx], parent[ry]
+            pending = rx != ry
+            rx, ry = rx[pending], ry[pending]
+
+        if not touched.size:
+            return self.find_many(xs), 0
+        # parent[touched] now labels every component by its smallest old root. Re-hang each one
+        # under its largest old root (union by size), ties going to the earliest mention.
+        labels = parent[touched]
+        order = np.lexsort((first, -touched_lengths.astype(np.int64), labels))
+        starts = np.flatnonzero(np.concatenate(([True], labels[order][1:] != labels[order][:-1])))
+        winners = touched[order[starts]]
+        is_start = np.zeros(order.size, dtype=bool)
+        is_start[starts] = True
+        group = np.cumsum(is_start) - 1
+        parent[touched[order]] = winners[group]
+        lengths[winners] = np.add.reduceat(touched_lengths[order], starts)
+        return self.find_many(xs), int(touched.size - starts.size)
+
+    def _view(self, buffer: array) -> Any:
+        return np.frombuffer(buffer, dtype=np.dtype(self.typecode))
+
+    def _as_nodes(self, xs: Any) -> Any:
+        xs = np.asarray(xs)
+        if xs.size and (xs.min() < 0 or xs.max() >= len(self.parent)):
+            raise ValueError('Invalid node position, cannot be larger than its parent length or smaller than 0')
+        return xs.astype(np.dtype(self.typecode), copy=False).ravel()
+
+    @staticmethod
+    def _distinct(nodes: Any, size: int) -> Tuple[Any, Any]:
+        # The sorted distinct nodes and the index of the first occurrence of each. A bitmap over
+        # all nodes beats sorting once the batch is a noticeable share of the graph.
+        if nodes.size * 16 < size:
+            return np.unique(nodes, return_index=True)
+        first = np.full(size, -1, dtype=np.int64)
+        # Writing in reverse leaves the earliest index of repeated nodes
+        first[nodes[::-1]] = np.arange(nodes.size - 1, -1, -1)
+        distinct = np.flatnonzero(first >= 0)
+        return distinct.astype(nodes.dtype, copy=False), first[distinct]
+
+    @staticmethod
+    def _roots(parent: Any, xs: Any) -> Any:
+        roots = parent[xs]
+        active = np.flatnonzero(parent[roots] != roots)
+        while active.size:
+            # Move the unresolved nodes two steps at a time and halve their paths on the way
+            up = parent[roots[active]]
+            jumped = parent[up]
+            parent[roots[active]] = jumped
+            roots[active] = jumped
+            active = active[parent[jumped] != jumped]
+        return roots
+
+    def nbytes(self) -> int:
+        return (len(self.parent) * self.parent.itemsize 
+                + len(self.compontent_lengths) * self.compontent_lengths.itemsize)
+
+    def dump(self, file: Union[str, BinaryIO]) -> None:
+        if isinstance(file, str):
+            with open(file, 'wb') as f:
+                return self.dump(f)
+        file.write(self.SNAPSHOT_HEADER.pack(self.SNAPSHOT_MAGIC, self.typecode.encode(), len(self.parent)))
+        for values in (self.parent, self.compontent_lengths):
+            if sys.byteorder == 'big':
+                values = array(self.typecode, values)
+                values.byteswap()
+            file.write(memoryview(values).cast('B'))
+
+    @classmethod
+    def load(cls, path: str, use_mmap: bool = True) -> 'CompactUnionFind':
+        with open(path, 'rb') as f:
+            magic, typecode, size = cls.SNAPSHOT_HEADER.unpack(f.read(cls.SNAPSHOT_HEADER.size))
+            if magic != cls.SNAPSHOT_MAGIC:
+                raise ValueError(f'Invalid snapshot, {path} is not a CompactUnionFind dump')
+            typecode = typecode.decode()
+            nbytes = size * array(typecode).itemsize
+            if use_mmap and sys.byteorder == 'little' and size:
+                # ACCESS_COPY pages the file in lazily and keeps later unions out of the snapshot
+                buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+                start = cls.SNAPSHOT_HEADER.size
+                if len(buffer) < start + 2 * nbytes:
+                    raise ValueError(f'Invalid snapshot, {path} is truncated')
+                parent = buffer[start:start + nbytes].cast(typecode)
+                lengths = buffer[start + nbytes:start + 2 * nbytes].cast(typecode)
+            else:
+                parent, lengths = array(typecode), array(typecode)
+                for values in (parent, lengths):
+                    data = f.read(nbytes)
+                    if len(data) != nbytes:
+                        raise ValueError(f'Invalid snapshot, {path} is truncated')
+                    values.frombytes(data)
+                    if sys.byteorder == 'big':
+                        values.byteswap()
+        return cls._from_arrays(typecode, parent, lengths)
+
+    def __reduce_ex__(self, protocol: int) -> Tuple[Any, ...]:
+        if protocol >= 5:
+            return (self._from_buffers, (self.typecode, pickle.PickleBuffer(self.parent),
+                                         pickle.PickleBuffer(self.compontent_lengths)))
+        return (self._from_buffers, (self.typecode, bytes(self.parent), bytes(self.compontent_lengths)))
+
+    @classmethod
+    def _from_buffers(cls, typecode: str, parent: Any, lengths: Any) -> 'CompactUnionFind':
+        views = []
+        for buffer in (parent, lengths):
+            view = memoryview(buffer).cast('B')
+            if view.readonly:
+                # In-band data or a read-only out-of-band buffer, take a private copy
+                values = array(typecode)
+                values.frombytes(view)
+                views.append(values)
+            else:
+                views.append(view.cast(typecode))
+        return cls._from_arrays(typecode, *views)
+
+    @classmethod
+    def _from_arrays(cls, typecode: str, parent: Any, lengths: Any) -> 'CompactUnionFind':
+        uf = cls.__new__(cls)
+        uf.typecode = typecode
+        uf.parent = parent
+        uf.compontent_lengths = lengths
+        return uf
+
+
+class KeyedUnionFind:
+    def __init__(self, keys: Iterable[Hashable] = ()):
+        self.ids = {}
+        self.keys = []
+        self.parent = array('q')
+        self.compontent_lengths = array('q')
+        self.num_components = 0
+        for key in keys:
+            self.add(key)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.ids
+
+    def add(self, key: Hashable) -> int:
+        node = self.ids.get(key)
+        if node is None:
+            node = len(self.keys)
+            if node == len(self.parent):
+                self._grow()
+            self.ids[key] = node
+            self.keys.append(key)
+            self.num_components += 1
+        return node
+
+    def find(self, key: Hashable) -> Hashable:
+        node = self.ids.get(key)
+        return key if node is None else self.keys[self._find(node)]
+
+    def union(self, a: Hashable, b: Hashable) -> bool:
+        x = self._find(self.add(a))
+        y = self._find(self.add(b))
+        if x == y:
+            return False
+        lengths = self.compontent_lengths
+        if lengths[x] < lengths[y]:
+            x, y = y, x
+        self.parent[y] = x
+        lengths[x] += lengths[y]
+        self.num_components -= 1
+        return True
+
+    def connected(self, a: Hashable, b: Hashable) -> bool:
+        x, y = self.ids.get(a), self.ids.get(b)
+        if x is None or y is None:
+            return a == b
+        return self._find(x) == self._find(y)
+
+    def component_size(self, key: Hashable) -> int:
+        node = self.ids.get(key)
+        return 1 if node is None else self.compontent_lengths[self._find(node)]
+
+    def _find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            grand_parent = parent[parent[x]]
+            parent[x] = grand_parent
+            x = grand_parent
+        return x
+
+    def _grow(self) -> None:
+        # Double the capacity in one bulk extend; unused slots are singletons that nothing points to
+        old = len(self.parent)
+        new = max(8, 2 * old)
+        self.parent.extend(range(old, new))
+        self.compontent_lengths.extend(array('q', [1]) * (new - old))
+
+
+class RollbackUnionFind:
+    def __init__(self, size: int):
+        if size < 0:
+            raise ValueError('Invalid size, cannot be smaller than 0')
+        self.parent = array('q', range(size))
+        self.compontent_lengths = array('q', [1]) * size
+        self.num_components = size
+        # Absorbed root of every union, or -1 for a union that merged nothing
+        self.history = array('q')
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        if x < 0 or x >= len(parent):
+            raise ValueError('Invalid node position, cannot be larger than its parent length or smaller than 0')
+        # Union by size keeps every tree O(log n) deep, so no compression is needed
+        while parent[x] != x:
+            x = parent[x]
+        return x
+
+    def union(self, x: int, y: int) -> bool:
+        x = self.find(x)
+        y = self.find(y)
+        if x == y:
+            self.history.append(-1)
+            return False
+        lengths = self.compontent_lengths
+        if lengths[x] < lengths[y]:
+            x, y = y, x
+        self.parent[y] = x
+        lengths[x] += lengths[y]
+        self.num_components -= 1
+        self.history.append(y)
+        return True
+
+    def connected(self, x: int, y: int) -> bool:
+        return self.find(x) == self.find(y)
+
+    def snapshot(self) -> int:
+        return len(self.history)
+
+    def undo(self) -> None:
+        if not self.history:
+            raise ValueError('Invalid undo, there is no union to undo')
+        y = self.history.pop()
+        if y == -1:
+            return
+        x = self.parent[y]
+        self.parent[y] = y
+        self.compontent_lengths[x] -= self.compontent_lengths[y]
+        self.num_components += 1
+
+    def rollback(self, token: int) -> None:
+        if token < 0 or token > len(self.history):
+            raise ValueError('Invalid snapshot token, it does not belong to the current history')
+        while len(self.history) > token:
+            self.undo()
+
+
+class WeightedUnionFind:
+    def __init__(self, size: int, group: Union[str, Group] = 'add', tolerance: float = 1e-9):
+        if size < 0:
+            raise ValueError('Invalid size, cannot be smaller than 0')
+        if isinstance(group, str):
+            if group not in ('add', 'mul'):
+                raise ValueError(f'Invalid group {group}, expected add, mul or a Group')
+            group = ADDITIVE if group == 'add' else MULTIPLICATIVE
+        self.group = group
+        self.tolerance = tolerance
+        self.parent = array('q', range(size))
+        self.compontent_lengths = array('q', [1]) * size
+        # Potential of every node relative to its parent
+        self.weights = [group.identity] * size
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        if x < 0 or x >= len(parent):
+            raise ValueError('Invalid node position, cannot be larger than its parent length or smaller than 0')
+        # After compression most nodes hang right below their root, which needs no folding
+        up = parent[x]
+        if parent[up] == up:
+            return up
+        path = []
+        while parent[x] != x:
+            path.append(x)
+            x = parent[x]
+        # Fold potentials from the root down and point every node on the path at the root
+        weights, combine = self.weights, self.group.combine
+        potential = self.group.identity
+        for node in reversed(path):
+            potential = combine(weights[node], potential)
+            weights[node] = potential
+            parent[node] = x
+        return x
+
+    def potential(self, x: int) -> Any:
+        self.find(x)
+        return self.weights[x]
+
+    def union(self, x: int, y: int, weight: Any) -> bool:
+        rx, ry = self.find(x), self.find(y)
+        combine, inverse = self.group.combine, self.group.inverse
+        # Potential of ry relative to rx implied by y = x (+) weight
+        offset = combine(combine(self.weights[x], weight), inverse(self.weights[y]))
+        if rx == ry:
+            if not self._same(offset, self.group.identity):
+                raise ValueError(f'Contradictory union, {y} is already {self.diff(x, y)} away from {x}, not {weight}')
+            return False
+        lengths = self.compontent_lengths
+        if lengths[rx] < lengths[ry]:
+            rx, ry, offset = ry, rx, inverse(offset)
+        self.parent[ry] = rx
+        self.weights[ry] = offset
+        lengths[rx] += lengths[ry]
+        return True
+
+    def connected(self, x: int, y: int) -> bool:
+        return self.find(x) == self.find(y)
+
+    def diff(self, x: int, y: int) -> Any:
+        if self.find(x) != self.find(y):
+            raise ValueError(f'Invalid diff, {x} and {y} are not in the same component')
+        return self.group.combine(self.weights[y], self.group.inverse(self.weights[x]))
+
+    def _same(self, a: Any, b: Any) -> bool:
+        if isinstance(a, float) or isinstance(b, float):
+            return math.isclose(a, b, rel_tol=self.tolerance, abs_tol=self.tolerance)
+        return a == b
@@ -0,0 +1,120 @@
+import asyncio
+import collections
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from priority_queue.removable_heap import RemovableHeapQ
+
+"""
+    Thread safe and asyncio versions of RemovableHeapQ for schedulers shared between workers.
+
+    ConcurrentRemovableHeapQ guards its own heap with a lock, so every queue can be shared without
+    a global lock around all of them, and get() blocks until an item is available or the timeout
+    expires, raising queue.Empty like queue.PriorityQueue does. A removed item never wakes a waiter,
+    and a waiter that finds only masked items goes back to sleep.
+
+    AsyncRemovableHeapQ is its single threaded asyncio counterpart: await get() parks the task on a
+    future that put() resolves, so waiting tasks never poll.
+"""
+class ConcurrentRemovableHeapQ:
+    def __init__(self, **heap_options: Any):
+        self.heap = RemovableHeapQ(**heap_options)
+        self.not_empty = threading.Condition(threading.Lock())
+
+    def __len__(self) -> int:
+        with self.not_empty:
+            return len(self.heap)
+
+    def put(self, item: Any) -> None:
+        with self.not_empty:
+            self.heap.add(item)
+            self.not_empty.notify()
+
+    def remove(self, item: Any) -> None:
+        with self.not_empty:
+            self.heap.remove(item)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        if timeout is not None and timeout < 0:
+            raise ValueError('Invalid timeout, cannot be smaller than 0')
+        with self.not_empty:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                item = self.heap.pop()
+                if item is not None:
+                    return item
+                if not block:
+                    raise queue.Empty
+                if deadline is None:
+                    self.not_empty.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise queue.Empty
+                    self.not_empty.wait(remaining)
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def peek_k(self, k: int) -> List[Any]:
+        with self.not_empty:
+            return self.heap.peek_k(k)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.not_empty:
+            return self.heap.stats()
+
+
+class AsyncRemovableHeapQ:
+    def __init__(self, **heap_options: Any):
+        self.heap = RemovableHeapQ(**heap_options)
+        self.getters = collections.deque()
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def put_nowait(self, item: Any) -> None:
+        self.heap.add(item)
+        self._wakeup_next()
+
+    async def put(self, item: Any) -> None:
+        self.put_nowait(item)
+
+    def remove(self, item: Any) -> None:
+        self.heap.remove(item)
+
+    def get_nowait(self) -> Any:
+        item = self.heap.pop()
+        if item is None:
+            raise asyncio.QueueEmpty
+        return item
+
+    async def get(self) -> Any:
+        while True:
+            item = self.heap.pop()
+            if item is not None:
+                return item
+            getter = asyncio.get_running_loop().create_future()
+            self.getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                getter.cancel()
+                if getter in self.getters:
+                    self.getters.remove(getter)
+                elif len(self.heap):
+                    # We were woken up but cancelled before taking the item, pass the wake up on
+                    self._wakeup_next()
+                raise
+
+    def peek_k(self, k: int) -> List[Any]:
+        return self.heap.peek_k(k)
+
+    def _wakeup_next(self) -> None:
+        while self.getters:
+            getter = self.getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                break
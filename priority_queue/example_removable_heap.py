@@ -43,16 +43,7 @@ class MovieRentingSystem:
         if movie not in self.movieToShopsWithUnrented:
             return []
 
-        foundPricesShops = []
-        for i in range(5):
-            res = self.movieToShopsWithUnrented[movie].pop()
-            if not res:
-                break
-            foundPricesShops.append(res)
-    
-        for price, shop in foundPricesShops:
-            self.movieToShopsWithUnrented[movie].add((price, shop))
-
+        foundPricesShops = self.movieToShopsWithUnrented[movie].peek_k(5)
         return [shop for _, shop in foundPricesShops]
 
     def rent(self, shop: int, movie: int) -> None:
@@ -66,15 +57,5 @@ class MovieRentingSystem:
         self.cheapestRentedHeapQ.remove((price, shop, movie))
         
     def report(self) -> List[List[int]]:
-        foundPricesShopsMovies = []
-
-        for i in range(5):
-            res = self.cheapestRentedHeapQ.pop()
-            if not res:
-                break
-            foundPricesShopsMovies.append(res)
-
-        for price, shop, movie in foundPricesShopsMovies:
-            self.cheapestRentedHeapQ.add((price, shop, movie))
-
+        foundPricesShopsMovies = self.cheapestRentedHeapQ.peek_k(5)
         return [(shop, movie) for _, shop, movie in foundPricesShopsMovies]
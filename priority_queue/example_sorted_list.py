@@ -0,0 +1,53 @@
+from priority_queue.sorted_list import SortedList
+from typing import List
+"""
+    The movie renting system of example_removable_heap.py, rebuilt on SortedList.
+
+    Every movie keeps a SortedList of (price, shop) for its unrented copies and one SortedList of
+    (price, shop, movie) holds all rented copies. Rent and drop move one entry between them in
+    O(log n), and search and report read the first 5 entries without mutating anything.
+
+    Because the entries are kept in order, the system also answers range and rank queries:
+    SearchInPriceRange: Finds the shops with an unrented copy of a movie with a price in [low, high].
+    RentedRank: Returns how many rented copies are cheaper than the given rented copy, using the same
+    ordering as Report.
+"""
+class MovieRentingSystem:
+
+    def __init__(self, n: int, entries: List[List[int]]):
+        self.shopMovieToPrice = {}
+        unrented = {}
+        for shop, movie, price in entries:
+            self.shopMovieToPrice[(shop, movie)] = price
+            unrented.setdefault(movie, []).append((price, shop))
+
+        self.movieToShopsWithUnrented = {movie: SortedList(copies) for movie, copies in unrented.items()}
+        self.cheapestRented = SortedList()
+
+    def search(self, movie: int) -> List[int]:
+        if movie not in self.movieToShopsWithUnrented:
+            return []
+        return [shop for _, shop in self.movieToShopsWithUnrented[movie][:5]]
+
+    def rent(self, shop: int, movie: int) -> None:
+        price = self.shopMovieToPrice[(shop, movie)]
+        self.movieToShopsWithUnrented[movie].remove((price, shop))
+        self.cheapestRented.add((price, shop, movie))
+
+    def drop(self, shop: int, movie: int) -> None:
+        price = self.shopMovieToPrice[(shop, movie)]
+        self.movieToShopsWithUnrented[movie].add((price, shop))
+        self.cheapestRented.remove((price, shop, movie))
+
+    def report(self) -> List[List[int]]:
+        return [(shop, movie) for _, shop, movie in self.cheapestRented[:5]]
+
+    def searchInPriceRange(self, movie: int, low: int, high: int) -> List[int]:
+        if movie not in self.movieToShopsWithUnrented:
+            return []
+        copies = self.movieToShopsWithUnrented[movie].irange((low, float('-inf')), (high, float('inf')))
+        return [shop for _, shop in copies]
+
+    def rentedRank(self, shop: int, movie: int) -> int:
+        price = self.shopMovieToPrice[(shop, movie)]
+        return self.cheapestRented.rank((price, shop, movie))
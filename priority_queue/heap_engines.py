@@ -0,0 +1,271 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, Union
+
+from priority_queue.removable_heap import RemovableHeapQ
+
+"""
+    Interchangeable priority queue engines behind one interface: add, remove, pop, peek and len.
+
+    binary  - RemovableHeapQ, a binary heap with lazy removal. A good default.
+    pairing - a pairing heap with O(1) add and amortized O(log n) pop, remove and decrease_key.
+              Removal is eager, so it never carries masked items. Unlike a textbook pairing heap,
+              meld is not O(1): linking the trees is, but the item index of the smaller heap is
+              copied into the larger one, O(min(n, m)).
+    radix   - a radix heap for monotone integer priorities, as produced by Dijkstra with integer
+              weights: an item can never be smaller than the last popped one. Every item moves down
+              at most once per bit of the key range, so add is O(1) and pop is amortized O(log C).
+              Items with the key of the last pop also sit in a RemovableHeapQ, so ties on the
+              priority cost O(log n) per pop instead of a scan of all of them.
+
+    Items are compared as a whole, like in RemovableHeapQ, so all engines pop the same sequence for
+    the same operations. The radix engine needs an integer priority per item, taken from key(item)
+    and by default the item itself or its first element. Use make_engine(name) to pick one by name.
+"""
+class PriorityQueueEngine(ABC):
+    @abstractmethod
+    def add(self, item: Any) -> None:
+        pass
+
+    @abstractmethod
+    def remove(self, item: Any) -> None:
+        pass
+
+    @abstractmethod
+    def pop(self) -> Union[Any, None]:
+        pass
+
+    @abstractmethod
+    def peek(self) -> Union[Any, None]:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class BinaryHeapEngine(RemovableHeapQ, PriorityQueueEngine):
+    def peek(self) -> Union[Any, None]:
+        top = self.peek_k(1)
+        return top[0] if top else None
+
+
+class _PairingNode:
+    # prev is the parent for a first child and the left sibling otherwise
+    __slots__ = ('item', 'child', 'sibling', 'prev')
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.child = None
+        self.sibling = None
+        self.prev = None
+
+
+class PairingHeapEngine(PriorityQueueEngine):
+    def __init__(self):
+        self.root = None
+        self.nodes = {}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.nodes
+
+    def add(self, item: Any) -> None:
+        if item in self.nodes:
+            return
+        node = _PairingNode(item)
+        self.nodes[item] = node
+        self.root = self._link(self.root, node)
+
+    def peek(self) -> Union[Any, None]:
+        return self.root.item if self.root else None
+
+    def pop(self) -> Union[Any, None]:
+        root = self.root
+        if root is None:
+            return None
+        del self.nodes[root.item]
+        self.root = self._merge_pairs(root.child)
+        return root.item
+
+    def remove(self, item: Any) -> None:
+        node = self.nodes.pop(item, None)
+        if node is None:
+            return
+        if node is self.root:
+            self.root = self._merge_pairs(node.child)
+            return
+        self._cut(node)
+        self.root = self._link(self.root, self._merge_pairs(node.child))
+
+    def decrease_key(self, item: Any, new_item: Any) -> None:
+        if item not in self.nodes:
+            raise ValueError(f'Invalid decrease, {item} is not in the heap')
+        if item < new_item:
+            raise ValueError(f'Invalid decrease, {new_item} is larger than {item}')
+        if new_item != item and new_item in self.nodes:
+            raise ValueError(f'Invalid decrease, {new_item} is already in the heap')
+        node = self.nodes.pop(item)
+        node.item = new_item
+        self.nodes[new_item] = node
+        if node is not self.root:
+            # The subtree stays heap ordered, only the link to its parent can be violated
+            self._cut(node)
+            self.root = self._link(self.root, node)
+
+    def meld(self, other: 'PairingHeapEngine') -> None:
+        """
+            Moves every item of other into this heap. Linking the trees is O(1); merging the item
+            indexes costs O(min(len(self), len(other))). Items present in both heaps are kept once.
+        """
+        for item in other.nodes.keys() & self.nodes.keys():
+            other.remove(item)
+        # Copy the smaller index into the larger one
+        if len(other.nodes) > len(self.nodes):
+            self.nodes, other.nodes = other.nodes, self.nodes
+        self.nodes.update(other.nodes)
+        self.root = self._link(self.root, other.root)
+        other.root = None
+        other.nodes = {}
+
+    @staticmethod
+    def _link(a: Optional[_PairingNode], b: Optional[_PairingNode]) -> Optional[_PairingNode]:
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b.item < a.item:
+            a, b = b, a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        b.prev = a
+        a.sibling = a.prev = None
+        return a
+
+    @staticmethod
+    def _cut(node: _PairingNode) -> None:
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.prev = node.sibling = None
+
+    def _merge_pairs(self, first: Optional[_PairingNode]) -> Optional[_PairingNode]:
+        # Two pass merge, iteratively: link neighbours left to right, then fold right to left
+        pairs = []
+        while first is not None:
+            second = first.sibling
+            following = second.sibling if second is not None else None
+            first.sibling = first.prev = None
+            if second is not None:
+                second.sibling = second.prev = None
+            pairs.append(self._link(first, second))
+            first = following
+        root = None
+        for tree in reversed(pairs):
+            root = self._link(tree, root)
+        return root
+
+
+class RadixHeapEngine(PriorityQueueEngine):
+    def __init__(self, key: Optional[Callable[[Any], int]] = None):
+        self.key = key or _default_radix_key
+        self.last = 0
+        # Bucket i holds the items whose key differs from last in bit i - 1 at the highest
+        self.buckets = [{} for _ in range(65)]
+        self.bucket_of = {}
+        # Bucket 0 holds the items whose key equals last, also kept in heap order to break ties
+        self.ties = RemovableHeapQ()
+        # (bucket index, smallest item) of the last peek() past bucket 0, until the buckets change
+        self.peeked = None
+
+    def __len__(self) -> int:
+        return len(self.bucket_of)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.bucket_of
+
+    def add(self, item: Any) -> None:
+        if item in self.bucket_of:
+            return
+        key = self.key(item)
+        if key < self.last:
+            raise ValueError(f'Invalid priority {key}, cannot be smaller than the last popped {self.last}')
+        bucket = (key ^ self.last).bit_length()
+        if bucket >= len(self.buckets):
+            self.buckets.extend({} for _ in range(bucket + 1 - len(self.buckets)))
+        self.buckets[bucket][item] = key
+        self.bucket_of[item] = bucket
+        if bucket == 0:
+            self.ties.add(item)
+        self.peeked = None
+
+    def remove(self, item: Any) -> None:
+        bucket = self.bucket_of.pop(item, None)
+        if bucket is None:
+            return
+        del self.buckets[bucket][item]
+        if bucket == 0:
+            self.ties.remove(item)
+        self.peeked = None
+
+    def peek(self) -> Union[Any, None]:
+        if not self.bucket_of:
+            return None
+        if self.buckets[0]:
+            return self.ties.peek_k(1)[0]
+        # Peeking must not move last, or a later add between the popped and the peeked priority
+        # would be rejected, so only look into the first bucket that holds anything
+        if self.peeked is None:
+            index = next(i for i, bucket in enumerate(self.buckets) if bucket)
+            bucket = self.buckets[index]
+            self.peeked = (index, min(bucket, key=lambda item: (bucket[item], item)))
+        return self.peeked[1]
+
+    def pop(self) -> Union[Any, None]:
+        if not self.bucket_of:
+            return None
+        self._fill_first_bucket()
+        item = self.ties.pop()
+        del self.buckets[0][item]
+        del self.bucket_of[item]
+        return item
+
+    def _fill_first_bucket(self) -> None:
+        if self.buckets[0]:
+            return
+        index = next(i for i, bucket in enumerate(self.buckets) if bucket)
+        bucket = self.buckets[index]
+        self.buckets[index] = {}
+        self.peeked = None
+        self.last = last = min(bucket.values())
+        # Every key of the bucket shares the bits above index - 1 with the new last, so all of
+        # them move to strictly lower buckets
+        for item, key in bucket.items():
+            lower = (key ^ last).bit_length()
+            self.buckets[lower][item] = key
+            self.bucket_of[item] = lower
+            if lower == 0:
+                self.ties.add(item)
+
+
+def _default_radix_key(item: Any) -> int:
+    return item if isinstance(item, int) else item[0]
+
+
+ENGINES: Dict[str, Callable[..., PriorityQueueEngine]] = {
+    'binary': BinaryHeapEngine,
+    'pairing': PairingHeapEngine,
+    'radix': RadixHeapEngine,
+}
+
+
+def make_engine(name: str, **options: Any) -> PriorityQueueEngine:
+    if name not in ENGINES:
+        raise ValueError(f'Invalid engine {name}, expected one of {", ".join(ENGINES)}')
+    return ENGINES[name](**options)
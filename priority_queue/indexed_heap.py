@@ -0,0 +1,114 @@
+from typing import Any, Dict, Iterable, Union
+
+"""
+    An indexed binary heap that keeps a position map from every item to its index in the heap list.
+
+    Unlike RemovableHeapQ, which only masks removed items until they surface, remove() takes the
+    item out of the heap right away in O(log n), so memory stays proportional to the live items.
+    The position map also allows changing the priority of an item in place. add() and pop() behave
+    like in RemovableHeapQ: adding an item that is already in the heap does nothing and popping
+    an empty heap returns None.
+
+    Pickling stores only the heap list, which is already in heap order; the position map is
+    rebuilt from it in one pass on restore.
+"""
+class IndexedHeapQ:
+    def __init__(self, items: Iterable[Any] = ()):
+        self.heap = list(dict.fromkeys(items))
+        self.position = {item: i for i, item in enumerate(self.heap)}
+        for i in reversed(range(len(self.heap) // 2)):
+            self._sift_down(i)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.position
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'heap': self.heap}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.heap = state['heap']
+        self.position = {item: i for i, item in enumerate(self.heap)}
+
+    def add(self, item: Any) -> None:
+        if item in self.position:
+            return
+        self.heap.append(item)
+        self.position[item] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def remove(self, item: Any) -> None:
+        i = self.position.pop(item, None)
+        if i is None:
+            return
+        last = self.heap.pop()
+        if i < len(self.heap):
+            self.heap[i] = last
+            self.position[last] = i
+            self._restore(i)
+
+    def pop(self) -> Union[Any, None]:
+        if not self.heap:
+            return None
+        top = self.heap[0]
+        self.remove(top)
+        return top
+
+    def peek(self) -> Union[Any, None]:
+        if not self.heap:
+            return None
+        return self.heap[0]
+
+    def update_priority(self, item: Any, new_item: Any) -> None:
+        if item not in self.position:
+            raise ValueError(f'Invalid update, {item} is not in the heap')
+        if new_item != item and new_item in self.position:
+            raise ValueError(f'Invalid update, {new_item} is already in the heap')
+        i = self.position.pop(item)
+        self.heap[i] = new_item
+        self.position[new_item] = i
+        self._restore(i)
+
+    def decrease_key(self, item: Any, new_item: Any) -> None:
+        if item < new_item:
+            raise ValueError(f'Invalid decrease, {new_item} is larger than {item}')
+        self.update_priority(item, new_item)
+
+    def _restore(self, i: int) -> None:
+        if i > 0 and self.heap[i] < self.heap[(i - 1) // 2]:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def _sift_up(self, i: int) -> None:
+        heap, position = self.heap, self.position
+        item = heap[i]
+        while i > 0:
+            parent = (i - 1) // 2
+            if not item < heap[parent]:
+                break
+            heap[i] = heap[parent]
+            position[heap[i]] = i
+            i = parent
+        heap[i] = item
+        position[item] = i
+
+    def _sift_down(self, i: int) -> None:
+        heap, position = self.heap, self.position
+        size = len(heap)
+        item = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < item:
+                break
+            heap[i] = heap[child]
+            position[heap[i]] = i
+            i = child
+        heap[i] = item
+        position[item] = i
@@ -0,0 +1,190 @@
+from typing import Any, Iterable, Optional, Union
+
+"""
+    A double ended priority queue: a min-max heap with a position map, for jobs that need both the
+    cheapest and the most expensive live item, e.g. to trim a bounded top-N catalog.
+
+    Levels alternate between min levels (the root's) and max levels. Every item on a min level is
+    smaller than all of its descendants and every item on a max level is larger, so the minimum is
+    the root and the maximum one of its two children: peek_min/peek_max are O(1) and
+    pop_min/pop_max O(log n). Like IndexedHeapQ it keeps the index of every item, so remove() and
+    update_priority() work in place in O(log n) instead of masking items in two mirrored heaps.
+    Building from an iterable trickles every inner node down once, which is O(n).
+
+    With a capacity the heap never holds more than capacity items. evict='min' keeps the largest
+    items and 'max' the smallest: add() to a full heap drops the worst item and returns it, or
+    returns the new item itself when it is not better than the worst one.
+
+    As in the other heaps of this folder, items are unique, adding an item twice does nothing and
+    popping or peeking an empty heap returns None.
+"""
+class MinMaxHeapQ:
+    def __init__(self, items: Iterable[Any] = (), capacity: Optional[int] = None, evict: str = 'min'):
+        if capacity is not None and capacity < 1:
+            raise ValueError('Invalid capacity, must be at least 1')
+        if evict not in ('min', 'max'):
+            raise ValueError(f'Invalid evict {evict}, must be min or max')
+        self.capacity = capacity
+        self.evict = evict
+        self.heap = list(dict.fromkeys(items))
+        if capacity is not None and len(self.heap) > capacity:
+            self.heap.sort(reverse=evict == 'max')
+            del self.heap[:len(self.heap) - capacity]
+        self.position = {item: i for i, item in enumerate(self.heap)}
+        for i in reversed(range(len(self.heap) // 2)):
+            self._push_down(i)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.position
+
+    def add(self, item: Any) -> Union[Any, None]:
+        if item in self.position:
+            return None
+        if self.capacity is not None and len(self.heap) >= self.capacity:
+            if self.evict == 'min':
+                worst = self.peek_min()
+                if not worst < item:
+                    return item
+            else:
+                worst = self.peek_max()
+                if not item < worst:
+                    return item
+            # Put the new item where the worst one was, one sift instead of a removal and a push
+            i = self.position.pop(worst)
+            self.heap[i] = item
+            self.position[item] = i
+            self._restore(i)
+            return worst
+        self.heap.append(item)
+        self.position[item] = len(self.heap) - 1
+        self._push_up(len(self.heap) - 1)
+        return None
+
+    def remove(self, item: Any) -> None:
+        i = self.position.pop(item, None)
+        if i is None:
+            return
+        last = self.heap.pop()
+        if i < len(self.heap):
+            self.heap[i] = last
+            self.position[last] = i
+            self._restore(i)
+
+    def peek_min(self) -> Union[Any, None]:
+        return self.heap[0] if self.heap else None
+
+    def peek_max(self) -> Union[Any, None]:
+        i = self._max_index()
+        return None if i is None else self.heap[i]
+
+    def pop_min(self) -> Union[Any, None]:
+        if not self.heap:
+            return None
+        top = self.heap[0]
+        self.remove(top)
+        return top
+
+    def pop_max(self) -> Union[Any, None]:
+        i = self._max_index()
+        if i is None:
+            return None
+        top = self.heap[i]
+        self.remove(top)
+        return top
+
+    pop = pop_min
+    peek = peek_min
+
+    def update_priority(self, item: Any, new_item: Any) -> None:
+        if item not in self.position:
+            raise ValueError(f'Invalid update, {item} is not in the heap')
+        if new_item != item and new_item in self.position:
+            raise ValueError(f'Invalid update, {new_item} is already in the heap')
+        i = self.position.pop(item)
+        self.heap[i] = new_item
+        self.position[new_item] = i
+        self._restore(i)
+
+    def _max_index(self) -> Union[int, None]:
+        heap = self.heap
+        if len(heap) <= 2:
+            return len(heap) - 1 if heap else None
+        return 1 if heap[2] < heap[1] else 2
+
+    @staticmethod
+    def _is_min_level(i: int) -> bool:
+        return (i + 1).bit_length() & 1 == 1
+
+    def _swap(self, i: int, j: int) -> None:
+        heap, position = self.heap, self.position
+        heap[i], heap[j] = heap[j], heap[i]
+        position[heap[i]] = i
+        position[heap[j]] = j
+
+    def _restore(self, i: int) -> None:
+        heap = self.heap
+        if i > 0:
+            parent = (i - 1) // 2
+            # An item that is out of order with its parent belongs to the other kind of level. The
+            # parent's old item moves into its place and has to trickle down from there.
+            if heap[parent] < heap[i] if self._is_min_level(i) else heap[i] < heap[parent]:
+                self._swap(i, parent)
+                self._push_up_level(parent, not self._is_min_level(i))
+                self._push_down(i)
+                return
+        if not self._push_up_level(i, self._is_min_level(i)):
+            self._push_down(i)
+
+    def _push_up(self, i: int) -> None:
+        if i == 0:
+            return
+        heap, parent, is_min = self.heap, (i - 1) // 2, self._is_min_level(i)
+        if heap[parent] < heap[i] if is_min else heap[i] < heap[parent]:
+            self._swap(i, parent)
+            self._push_up_level(parent, not is_min)
+        else:
+            self._push_up_level(i, is_min)
+
+    def _push_up_level(self, i: int, is_min: bool) -> bool:
+        # Bubbles the item up through the grandparents on its own kind of level
+        heap, moved = self.heap, False
+        while i > 2:
+            grand_parent = (i - 3) // 4
+            if not (heap[i] < heap[grand_parent] if is_min else heap[grand_parent] < heap[i]):
+                break
+            self._swap(i, grand_parent)
+            i = grand_parent
+            moved = True
+        return moved
+
+    def _push_down(self, i: int) -> None:
+        heap, position, size = self.heap, self.position, len(self.heap)
+        is_min = self._is_min_level(i)
+        item = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                return
+            # The best of the children and grandchildren, smallest on a min level, largest on a max one
+            best, best_item = child, heap[child]
+            for candidate in (child + 1, 2 * child + 1, 2 * child + 2, 2 * child + 3, 2 * child + 4):
+                if candidate >= size:
+                    break
+                if heap[candidate] < best_item if is_min else best_item < heap[candidate]:
+                    best, best_item = candidate, heap[candidate]
+            if not (best_item < item if is_min else item < best_item):
+                return
+            heap[i], heap[best] = best_item, item
+            position[best_item], position[item] = i, best
+            if best <= child + 1:
+                return
+            parent = (best - 1) // 2
+            parent_item = heap[parent]
+            if parent_item < item if is_min else item < parent_item:
+                heap[best], heap[parent] = parent_item, item
+                position[parent_item], position[item] = best, parent
+                item = parent_item
+            i = best
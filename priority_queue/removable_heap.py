@@ -1,17 +1,37 @@
 import heapq
-from typing import Any, Union
+import time
+from typing import Any, Dict, List, Optional, Union
 
 """
     An implementation of priority queue that allows user to remove an added item. 
     You can also implement it without using two helper sets. It is possible to do
     only by adding version control. Here we want to avoid adding same items twice,
     so two helper sets is preferred. 
+
+    peek_k(k) (also available as nsmallest) reads the k smallest live items without mutating the
+    heap. It walks the heap as a tree with a small frontier heap of candidate indices, skipping
+    masked entries, so it costs O((k + masked entries met) log k) instead of k pops and k pushes.
+
+    Masked items that never reach the top would stay in the heap forever, so once they make up more
+    than compaction_threshold of the heap (and the heap holds at least min_compaction_size items),
+    the heap is rebuilt from its live items with heapify in O(n). Every rebuild is paid for by the
+    removals before it, so remove() stays amortized O(1). Pass compaction_threshold=None to turn it
+    off, and use stats() to tune the threshold for a workload.
+
+    Pickling stores only the live items, already in heap order, so unpickling needs no heapify.
 """
 class RemovableHeapQ:
-    def __init__(self):
+    def __init__(self, compaction_threshold: Optional[float] = 0.5, min_compaction_size: int = 64):
         self.heap = []
         self.added = set()
         self.masked = set()
+        self.compaction_threshold = compaction_threshold
+        self.min_compaction_size = min_compaction_size
+        self.compaction_count = 0
+        self.compaction_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self.heap) - len(self.masked)
 
     def add(self, item: Any) -> None:
         if item not in self.added:
@@ -22,7 +42,13 @@ class RemovableHeapQ:
             self.masked.remove(item)
     
     def remove(self, item: Any) -> None:
+        # Items that are not in the heap have nothing to mask, and add() would unmask them anyway
+        if item not in self.added:
+            return
         self.masked.add(item)
+        if (self.compaction_threshold is not None and len(self.heap) >= self.min_compaction_size
+                and len(self.masked) > self.compaction_threshold * len(self.heap)):
+            self.compact()
 
     def pop(self) -> Union[Any, None]:
         while self.heap:
@@ -30,8 +56,59 @@ class RemovableHeapQ:
             self.added.remove(top)
             if top not in self.masked:
                 return top
+            self.masked.remove(top)
         return None
 
-    
+    def compact(self) -> None:
+        start = time.perf_counter()
+        masked = self.masked
+        self.heap = [item for item in self.heap if item not in masked]
+        heapq.heapify(self.heap)
+        self.added -= masked
+        masked.clear()
+        self.compaction_count += 1
+        self.compaction_seconds += time.perf_counter() - start
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'live_size': len(self),
+            'heap_size': len(self.heap),
+            'masked_count': len(self.masked),
+            'compaction_count': self.compaction_count,
+            'compaction_seconds': self.compaction_seconds,
+        }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        heap = self.heap
+        if self.masked:
+            # Dropping items breaks the heap invariant, so pay the heapify here instead of on restore
+            heap = [item for item in heap if item not in self.masked]
+            heapq.heapify(heap)
+        return {
+            'heap': heap,
+            'compaction_threshold': self.compaction_threshold,
+            'min_compaction_size': self.min_compaction_size,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        RemovableHeapQ.__init__(self, state['compaction_threshold'], state['min_compaction_size'])
+        self.heap = state['heap']
+        self.added = set(self.heap)
 
+    def peek_k(self, k: int) -> List[Any]:
+        heap, masked = self.heap, self.masked
+        result = []
+        if k <= 0 or not heap:
+            return result
+        # Items in the heap are unique, so the index never takes part in a comparison
+        frontier = [(heap[0], 0)]
+        while frontier and len(result) < k:
+            item, i = heapq.heappop(frontier)
+            if item not in masked:
+                result.append(item)
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return result
 
+    nsmallest = peek_k
@@ -0,0 +1,192 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+"""
+    A sorted list with order statistics, built as a list of sorted chunks of at most 2 * load items.
+
+    Values go into the chunk found by bisecting the chunk maxima, so add and remove cost one bisect
+    over the chunks plus one insert into a short list. A Fenwick tree over the chunk lengths maps
+    positions to chunks in O(log n), which gives rank(), select(i), indexing and slicing. It is only
+    rebuilt when chunks are split or dropped, so its cost is amortized over many updates.
+
+    Queries never mutate the container, which makes it a good base for "k cheapest" and price range
+    queries. Duplicates are allowed; remove() deletes one copy.
+"""
+class SortedList:
+    def __init__(self, iterable: Iterable[Any] = (), load: int = 1000):
+        if load < 1:
+            raise ValueError('Invalid load, cannot be smaller than 1')
+        self.load = load
+        values = sorted(iterable)
+        self.lists = [values[i:i + load] for i in range(0, len(values), load)]
+        self.maxes = [chunk[-1] for chunk in self.lists]
+        self.size = len(values)
+        self.index = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in self.lists:
+            yield from chunk
+
+    def __reversed__(self) -> Iterator[Any]:
+        for chunk in reversed(self.lists):
+            yield from reversed(chunk)
+
+    def __contains__(self, value: Any) -> bool:
+        i = bisect_left(self.maxes, value)
+        if i == len(self.maxes):
+            return False
+        chunk = self.lists[i]
+        j = bisect_left(chunk, value)
+        return j < len(chunk) and chunk[j] == value
+
+    def __repr__(self) -> str:
+        return f'SortedList({list(self)!r})'
+
+    def add(self, value: Any) -> None:
+        maxes, lists = self.maxes, self.lists
+        if not lists:
+            lists.append([value])
+            maxes.append(value)
+            self.index = None
+        else:
+            i = bisect_right(maxes, value)
+            if i == len(maxes):
+                i -= 1
+                lists[i].append(value)
+                maxes[i] = value
+            else:
+                insort(lists[i], value)
+            self._resize_chunk(i, 1)
+            if len(lists[i]) > 2 * self.load:
+                chunk = lists[i]
+                lists[i:i + 1] = [chunk[:self.load], chunk[self.load:]]
+                maxes[i:i + 1] = [chunk[self.load - 1], chunk[-1]]
+                self.index = None
+        self.size += 1
+
+    def remove(self, value: Any) -> None:
+        if not self.discard(value):
+            raise ValueError(f'Invalid remove, {value} is not in the list')
+
+    def discard(self, value: Any) -> bool:
+        maxes, lists = self.maxes, self.lists
+        i = bisect_left(maxes, value)
+        if i == len(maxes):
+            return False
+        chunk = lists[i]
+        j = bisect_left(chunk, value)
+        if j == len(chunk) or chunk[j] != value:
+            return False
+        del chunk[j]
+        self.size -= 1
+        if not chunk:
+            del lists[i]
+            del maxes[i]
+            self.index = None
+        else:
+            maxes[i] = chunk[-1]
+            self._resize_chunk(i, -1)
+        return True
+
+    def bisect_left(self, value: Any) -> int:
+        i = bisect_left(self.maxes, value)
+        if i == len(self.maxes):
+            return self.size
+        return self._offset(i) + bisect_left(self.lists[i], value)
+
+    def bisect_right(self, value: Any) -> int:
+        i = bisect_right(self.maxes, value)
+        if i == len(self.maxes):
+            return self.size
+        return self._offset(i) + bisect_right(self.lists[i], value)
+
+    def rank(self, value: Any) -> int:
+        return self.bisect_left(value)
+
+    def select(self, i: int) -> Any:
+        return self[i]
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self.size)
+            if step != 1:
+                return [self[j] for j in range(start, stop, step)]
+            return self._slice(start, stop)
+        if i < 0:
+            i += self.size
+        if i < 0 or i >= self.size:
+            raise IndexError('SortedList index out of range')
+        chunk, offset = self._locate(i)
+        return self.lists[chunk][offset]
+
+    def irange(self, lo: Optional[Any] = None, hi: Optional[Any] = None,
+               inclusive: Tuple[bool, bool] = (True, True)) -> Iterator[Any]:
+        if lo is None:
+            start = 0
+        else:
+            start = self.bisect_left(lo) if inclusive[0] else self.bisect_right(lo)
+        if hi is None:
+            stop = self.size
+        else:
+            stop = self.bisect_right(hi) if inclusive[1] else self.bisect_left(hi)
+        if start >= stop:
+            return iter(())
+        chunk, offset = self._locate(start)
+        return self._iterate(chunk, offset, stop - start)
+
+    def _slice(self, start: int, stop: int) -> List[Any]:
+        if start >= stop:
+            return []
+        chunk, offset = self._locate(start)
+        # Fast path for the common "first few items" query
+        if offset + stop - start <= len(self.lists[chunk]):
+            return self.lists[chunk][offset:offset + stop - start]
+        return list(self._iterate(chunk, offset, stop - start))
+
+    def _iterate(self, chunk: int, offset: int, count: int) -> Iterator[Any]:
+        lists = self.lists
+        while count > 0:
+            part = lists[chunk][offset:offset + count]
+            yield from part
+            count -= len(part)
+            chunk += 1
+            offset = 0
+
+    def _build_index(self) -> List[int]:
+        tree = [len(chunk) for chunk in self.lists]
+        for i in range(len(tree)):
+            j = i | (i + 1)
+            if j < len(tree):
+                tree[j] += tree[i]
+        self.index = tree
+        return tree
+
+    def _resize_chunk(self, i: int, delta: int) -> None:
+        tree = self.index
+        if tree is None:
+            return
+        while i < len(tree):
+            tree[i] += delta
+            i |= i + 1
+
+    def _offset(self, chunk: int) -> int:
+        tree = self.index if self.index is not None else self._build_index()
+        total = 0
+        while chunk > 0:
+            total += tree[chunk - 1]
+            chunk &= chunk - 1
+        return total
+
+    def _locate(self, i: int) -> Tuple[int, int]:
+        tree = self.index if self.index is not None else self._build_index()
+        chunk = 0
+        step = 1 << (len(tree).bit_length() - 1) if tree else 0
+        while step:
+            if chunk + step <= len(tree) and tree[chunk + step - 1] <= i:
+                chunk += step
+                i -= tree[chunk - 1]
+            step >>= 1
+        return chunk, i
@@ -0,0 +1,246 @@
+import heapq
+import itertools
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+"""
+    Generator based pipeline stages for sorted shards and unbounded event streams. Memory is
+    O(k + number of sources) however long the input runs.
+
+    merge() lazily merges sorted iterables. Its heap holds one head per source, and the next item
+    of a source is only read once its head has been yielded. unique=True also drops items equal
+    to the previous one, which merges deduplicated shards into a deduplicated stream.
+
+    TopK keeps the k largest (or smallest) items seen so far in a bounded heap. Its root is the
+    worst kept item, so an item that does not beat the root costs one comparison, and any other
+    item O(log k). top_k_stream() wraps it as a stage that yields the running top k, by default
+    once every k items, so sorting the snapshots adds O(log k) per item.
+
+    TopKArray does the same for NumPy batches. Each batch is joined with the kept items and cut
+    back to k around the k-th best value, found with np.partition in O(k + batch), optionally
+    carrying an id per value. The kept values stay in arrival order, so ties resolve like in TopK.
+    top_k_chunks() is its stage and batches() turns any iterable into such batches.
+"""
+
+_MISSING = object()
+
+
+def merge(*iterables: Iterable[Any], key: Optional[Callable[[Any], Any]] = None, reverse: bool = False,
+          unique: bool = False) -> Iterator[Any]:
+    heap = []
+    for source, iterable in enumerate(iterables):
+        iterator = iter(iterable)
+        for item in iterator:
+            # The source index breaks ties, so items themselves are never compared
+            heap.append([_order_key(item, key, reverse), source, item, iterator])
+            break
+    heapq.heapify(heap)
+    previous = _MISSING
+    while heap:
+        entry = heap[0]
+        _, _, item, iterator = entry
+        if not unique or previous is _MISSING or item != previous:
+            yield item
+            previous = item
+        for item in iterator:
+            entry[0], entry[2] = _order_key(item, key, reverse), item
+            heapq.heapreplace(heap, entry)
+            break
+        else:
+            heapq.heappop(heap)
+
+
+def _order_key(item: Any, key: Optional[Callable[[Any], Any]], reverse: bool) -> Any:
+    value = item if key is None else key(item)
+    return _Reversed(value) if reverse else value
+
+
+class _Reversed:
+    # Flips the order of any comparable value, heapq only ever needs < and the == of tuples
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: '_Reversed') -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Reversed) and self.value == other.value
+
+
+class TopK:
+    def __init__(self, k: int, key: Optional[Callable[[Any], Any]] = None, largest: bool = True):
+        if k < 1:
+            raise ValueError('Invalid k, must be at least 1')
+        self.k = k
+        self.key = key
+        self.largest = largest
+        # Min heap of (order key, -arrival, item), so the root is the worst and the latest of equal items
+        self.heap = []
+        self.counter = itertools.count(0, -1)
+        self.seen = 0
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def push(self, item: Any) -> None:
+        self.seen += 1
+        value = item if self.key is None else self.key(item)
+        order = value if self.largest else _Reversed(value)
+        heap = self.heap
+        if len(heap) < self.k:
+            heapq.heappush(heap, (order, next(self.counter), item))
+        elif heap[0][0] < order:
+            heapq.heapreplace(heap, (order, next(self.counter), item))
+
+    def extend(self, items: Iterable[Any]) -> None:
+        heap, k, counter = self.heap, self.k, self.counter
+        iterator = iter(items)
+        while len(heap) < k:
+            for item in iterator:
+                self.push(item)
+                break
+            else:
+                return
+        # push() inlined, with the worst kept order in a local so most items cost one comparison
+        key, largest, replace = self.key, self.largest, heapq.heapreplace
+        worst, seen = heap[0][0], 0
+        for item in iterator:
+            seen += 1
+            order = item if key is None else key(item)
+            if not largest:
+                order = _Reversed(order)
+            if worst < order:
+                replace(heap, (order, next(counter), item))
+                worst = heap[0][0]
+        self.seen += seen
+
+    def threshold(self) -> Any:
+        """
+            Returns the worst kept item, which a new item has to beat once k items are kept.
+        """
+        return self.heap[0][2] if self.heap else None
+
+    def items(self) -> List[Any]:
+        """
+            Returns the kept items from best to worst. Equal items keep their arrival order.
+        """
+        return [item for _, _, item in sorted(self.heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+def top_k(iterable: Iterable[Any], k: int, key: Optional[Callable[[Any], Any]] = None,
+          largest: bool = True) -> List[Any]:
+    accumulator = TopK(k, key, largest)
+    accumulator.extend(iterable)
+    return accumulator.items()
+
+
+def top_k_stream(iterable: Iterable[Any], k: int, key: Optional[Callable[[Any], Any]] = None,
+                 largest: bool = True, every: Optional[int] = None) -> Iterator[List[Any]]:
+    """
+        Yields the running top k after every `every` items (k by default) and once more at the end
+        of the stream. Every snapshot sorts the kept items, so every=1 costs O(k log k) per item.
+    """
+    every = k if every is None else every
+    if every < 1:
+        raise ValueError('Invalid every, must be at least 1')
+    accumulator = TopK(k, key, largest)
+    pending = 0
+    for item in iterable:
+        accumulator.push(item)
+        pending += 1
+        if pending == every:
+            pending = 0
+            yield accumulator.items()
+    if pending:
+        yield accumulator.items()
+
+
+class TopKArray:
+    def __init__(self, k: int, largest: bool = True):
+        if np is None:
+            raise ImportError('TopKArray needs NumPy, use TopK for plain iterables')
+        if k < 1:
+            raise ValueError('Invalid k, must be at least 1')
+        self.k = k
+        self.largest = largest
+        self.values = None
+        self.ids = None
+        self.seen = 0
+
+    def __len__(self) -> int:
+        return 0 if self.values is None else len(self.values)
+
+    def push_batch(self, values: Any, ids: Any = None) -> None:
+        values = np.asarray(values).ravel()
+        if ids is not None:
+            ids = np.asarray(ids).ravel()
+            if ids.shape != values.shape:
+                raise ValueError('Invalid ids, must have one id per value')
+        if self.values is not None:
+            if (ids is None) != (self.ids is None):
+                raise ValueError('Invalid batch, give ids with every batch or with none')
+            values = np.concatenate((self.values, values))
+            ids = None if ids is None else np.concatenate((self.ids, ids))
+        self.seen += len(values) - len(self)
+        if len(values) > self.k:
+            # Keep everything better than the k-th best value and the earliest values equal to it,
+            # in arrival order
+            kth = len(values) - self.k if self.largest else self.k - 1
+            threshold = np.partition(values, kth)[kth]
+            better = np.flatnonzero(values > threshold if self.largest else values < threshold)
+            tied = np.flatnonzero(values == threshold)[:self.k - len(better)]
+            keep = np.sort(np.concatenate((better, tied)))
+            values = values[keep]
+            ids = None if ids is None else ids[keep]
+        self.values, self.ids = values, ids
+
+    def result(self) -> Any:
+        """
+            Returns the kept values from best to worst, or a (values, ids) pair when ids were given.
+        Equal values keep their arrival order.
+        """
+        if self.values is None:
+            return np.empty(0)
+        if self.largest:
+            # A stable descending sort: sort the reversed values, then undo both reversals
+            last = len(self.values) - 1
+            order = (last - np.argsort(self.values[::-1], kind='stable'))[::-1]
+        else:
+            order = np.argsort(self.values, kind='stable')
+        if self.ids is None:
+            return self.values[order]
+        return self.values[order], self.ids[order]
+
+
+def top_k_chunks(batches: Iterable[Any], k: int, largest: bool = True) -> Iterator[Any]:
+    """
+        Yields the running top k values after every batch. A batch is an array of values or a
+        (values, ids) pair.
+    """
+    accumulator = TopKArray(k, largest)
+    for batch in batches:
+        if isinstance(batch, tuple):
+            accumulator.push_batch(*batch)
+        else:
+            accumulator.push_batch(batch)
+        yield accumulator.result()
+
+
+def batches(iterable: Iterable[Any], size: int, dtype: Any = None) -> Iterator[Any]:
+    """
+        Cuts an iterable into NumPy arrays of at most size values.
+    """
+    if np is None:
+        raise ImportError('batches needs NumPy')
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield np.array(chunk, dtype=dtype)
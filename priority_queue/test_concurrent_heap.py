@@ -0,0 +1,123 @@
+import asyncio
+import queue
+import threading
+import time
+import unittest
+from priority_queue.concurrent_heap import ConcurrentRemovableHeapQ, AsyncRemovableHeapQ
+
+class TestConcurrentRemovableHeapQ(unittest.TestCase):
+    def setUp(self):
+        self.concurrent_heapq = ConcurrentRemovableHeapQ()
+
+    def test_put_and_get_in_order(self):
+        """Tests that items come out in ascending order."""
+        for item in [5, 1, 3]:
+            self.concurrent_heapq.put(item)
+        self.assertEqual([self.concurrent_heapq.get() for _ in range(3)], [1, 3, 5])
+
+    def test_get_timeout_raises_empty(self):
+        """Tests that get gives up after the timeout and get_nowait fails right away."""
+        start = time.monotonic()
+        with self.assertRaises(queue.Empty):
+            self.concurrent_heapq.get(timeout=0.05)
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+        with self.assertRaises(queue.Empty):
+            self.concurrent_heapq.get_nowait()
+
+    def test_removed_items_are_skipped(self):
+        """Tests that a removed item is never returned by get."""
+        self.concurrent_heapq.put(1)
+        self.concurrent_heapq.put(2)
+        self.concurrent_heapq.remove(1)
+        self.assertEqual(self.concurrent_heapq.get_nowait(), 2)
+        with self.assertRaises(queue.Empty):
+            self.concurrent_heapq.get(timeout=0.01)
+
+    def test_blocked_get_wakes_up_on_put(self):
+        """Tests that a waiting consumer receives an item put by another thread."""
+        results = []
+        consumer = threading.Thread(target=lambda: results.append(self.concurrent_heapq.get(timeout=5)))
+        consumer.start()
+        time.sleep(0.02)
+        self.concurrent_heapq.put(7)
+        consumer.join(5)
+        self.assertEqual(results, [7])
+
+    def test_many_producers_and_consumers(self):
+        """Tests that every item is delivered exactly once under contention."""
+        results = []
+        lock = threading.Lock()
+
+        def produce(offset):
+            for i in range(500):
+                self.concurrent_heapq.put(offset + i)
+
+        def consume():
+            while True:
+                try:
+                    item = self.concurrent_heapq.get(timeout=0.2)
+                except queue.Empty:
+                    return
+                with lock:
+                    results.append(item)
+
+        threads = [threading.Thread(target=produce, args=(p * 1000,)) for p in range(4)]
+        threads += [threading.Thread(target=consume) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(results), [p * 1000 + i for p in range(4) for i in range(500)])
+
+
+class TestAsyncRemovableHeapQ(unittest.TestCase):
+
+    def test_get_waits_for_put(self):
+        """Tests that await get resumes once another task puts an item."""
+        async def scenario():
+            heap = AsyncRemovableHeapQ()
+            getter = asyncio.ensure_future(heap.get())
+            await asyncio.sleep(0)
+            self.assertFalse(getter.done())
+            heap.put_nowait(3)
+            heap.put_nowait(1)
+            return await getter, await heap.get()
+
+        self.assertEqual(asyncio.run(scenario()), (1, 3))
+
+    def test_removed_items_do_not_resume_getters(self):
+        """Tests that a getter woken for a removed item keeps waiting."""
+        async def scenario():
+            heap = AsyncRemovableHeapQ()
+            getter = asyncio.ensure_future(heap.get())
+            await asyncio.sleep(0)
+            heap.put_nowait(1)
+            heap.remove(1)
+            await asyncio.sleep(0)
+            self.assertFalse(getter.done())
+            await heap.put(2)
+            return await asyncio.wait_for(getter, 1)
+
+        self.assertEqual(asyncio.run(scenario()), 2)
+
+    def test_cancelled_getter_passes_item_on(self):
+        """Tests that cancelling a woken getter does not lose the wake up."""
+        async def scenario():
+            heap = AsyncRemovableHeapQ()
+            first = asyncio.ensure_future(heap.get())
+            second = asyncio.ensure_future(heap.get())
+            await asyncio.sleep(0)
+            heap.put_nowait(5)
+            first.cancel()
+            return await asyncio.wait_for(second, 1)
+
+        self.assertEqual(asyncio.run(scenario()), 5)
+
+    def test_get_nowait_on_empty_heap(self):
+        """Tests that get_nowait raises asyncio.QueueEmpty."""
+        with self.assertRaises(asyncio.QueueEmpty):
+            AsyncRemovableHeapQ().get_nowait()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import random
+import unittest
+from priority_queue.heap_engines import (BinaryHeapEngine, PairingHeapEngine, RadixHeapEngine,
+                                         PriorityQueueEngine, make_engine, ENGINES)
+
+class TestHeapEngines(unittest.TestCase):
+
+    def monotone_trace(self, seed, steps=3000):
+        """Dijkstra like trace: new priorities are never below the last popped one."""
+        rng = random.Random(seed)
+        trace, last, live = [], 0, []
+        for step in range(steps):
+            roll = rng.random()
+            if roll < 0.5 or not live:
+                item = (last + rng.randrange(50), step)
+                live.append(item)
+                trace.append(('add', item))
+            elif roll < 0.7:
+                trace.append(('remove', live.pop(rng.randrange(len(live)))))
+            else:
+                trace.append(('pop', None))
+                if live:
+                    top = min(live)
+                    live.remove(top)
+                    last = top[0]
+        return trace
+
+    def replay(self, engine, trace):
+        out = []
+        for op, item in trace:
+            if op == 'add':
+                engine.add(item)
+            elif op == 'remove':
+                engine.remove(item)
+            else:
+                out.append((engine.peek(), engine.pop(), len(engine)))
+        return out
+
+    def reference(self, trace):
+        live, out = set(), []
+        for op, item in trace:
+            if op == 'add':
+                live.add(item)
+            elif op == 'remove':
+                live.discard(item)
+            else:
+                top = min(live) if live else None
+                live.discard(top)
+                out.append((top, top, len(live)))
+        return out
+
+    def test_all_engines_share_the_interface(self):
+        """Tests that make_engine builds every registered engine."""
+        for name in ENGINES:
+            self.assertIsInstance(make_engine(name), PriorityQueueEngine)
+        with self.assertRaises(ValueError):
+            make_engine('fibonacci')
+
+    def test_engines_replay_the_same_trace(self):
+        """Tests every engine against a set based reference on monotone traces."""
+        for seed in range(3):
+            trace = self.monotone_trace(seed)
+            expected = self.reference(trace)
+            for name in ENGINES:
+                self.assertEqual(self.replay(make_engine(name), trace), expected, name)
+
+    def test_empty_engines(self):
+        """Tests that pop and peek return None on empty engines."""
+        for name in ENGINES:
+            engine = make_engine(name)
+            self.assertIsNone(engine.pop())
+            self.assertIsNone(engine.peek())
+            engine.remove(1)  # This should not raise an error
+            self.assertEqual(len(engine), 0)
+
+    def test_pairing_heap_decrease_key_and_meld(self):
+        """Tests decrease_key and meld on pairing heaps."""
+        left, right = PairingHeapEngine(), PairingHeapEngine()
+        for item in (5, 9, 12):
+            left.add(item)
+        for item in (7, 9, 20):
+            right.add(item)
+        left.decrease_key(12, 1)
+        with self.assertRaises(ValueError):
+            left.decrease_key(1, 30)
+        left.meld(right)
+        self.assertEqual(len(right), 0)
+        self.assertEqual([left.pop() for _ in range(6)], [1, 5, 7, 9, 20, None])
+
+    def test_pairing_heap_meld_into_a_smaller_heap(self):
+        """Tests that melding a larger heap into a smaller one keeps both heaps consistent."""
+        small, large = PairingHeapEngine(), PairingHeapEngine()
+        small.add(3)
+        for item in range(0, 100, 2):
+            large.add(item)
+        small.meld(large)
+        large.add(1)
+        self.assertEqual(len(small), 51)
+        self.assertEqual(len(large), 1)
+        small.remove(50)
+        small.decrease_key(98, -1)
+        self.assertEqual(small.pop(), -1)
+        self.assertEqual([small.pop() for _ in range(3)], [0, 2, 3])
+        self.assertEqual(large.pop(), 1)
+
+    def test_pairing_heap_random_decrease_key(self):
+        """Tests random decrease_key calls against sorting."""
+        rng = random.Random(8)
+        heap, live = PairingHeapEngine(), set()
+        for item in rng.sample(range(10000), 500):
+            heap.add(item)
+            live.add(item)
+        for _ in range(300):
+            item = rng.choice(sorted(live))
+            new_item = item - rng.randrange(1, 100)
+            if new_item in live:
+                continue
+            heap.decrease_key(item, new_item)
+            live.remove(item)
+            live.add(new_item)
+        self.assertEqual([heap.pop() for _ in range(len(live))], sorted(live))
+
+    def test_radix_heap_rejects_non_monotone_priorities(self):
+        """Tests that adding below the last popped priority raises ValueError."""
+        heap = RadixHeapEngine()
+        heap.add(10)
+        heap.add(3)
+        self.assertEqual(heap.pop(), 3)
+        with self.assertRaises(ValueError):
+            heap.add(2)
+
+    def test_radix_heap_peek_does_not_move_the_floor(self):
+        """Tests that peeking keeps adds between the popped and the peeked priority valid."""
+        heap = RadixHeapEngine()
+        heap.add(1)
+        heap.add(40)
+        self.assertEqual(heap.pop(), 1)
+        self.assertEqual(heap.peek(), 40)
+        heap.remove(40)
+        heap.add(5)
+        self.assertEqual(heap.pop(), 5)
+
+    def test_radix_heap_ties_are_not_scanned(self):
+        """Tests that popping many items with the same priority takes O(log n) comparisons each."""
+        comparisons = [0]
+
+        class Item(int):
+            def __lt__(self, other):
+                comparisons[0] += 1
+                return int(self) < int(other)
+
+        n = 4000
+        heap = RadixHeapEngine(key=lambda item: 7)
+        for i in random.Random(5).sample(range(n), n):
+            heap.add(Item(i))
+        self.assertEqual(heap.peek(), 0)
+        self.assertEqual(heap.pop(), 0)
+        heap.remove(Item(1))
+        self.assertEqual(heap.peek(), 2)
+        self.assertEqual([heap.pop() for _ in range(n - 2)], list(range(2, n)))
+        # A scan of the tied bucket per pop would take about n * n / 2 comparisons
+        self.assertLess(comparisons[0], 40 * n)
+
+    def test_radix_heap_custom_key(self):
+        """Tests a radix heap keyed on a field other than the first."""
+        heap = RadixHeapEngine(key=lambda item: item[1])
+        for item in [('a', 5), ('b', 2), ('c', 9)]:
+            heap.add(item)
+        self.assertEqual([heap.pop() for _ in range(3)], [('b', 2), ('a', 5), ('c', 9)])
+
+    def test_binary_engine_is_a_removable_heap(self):
+        """Tests that the binary engine keeps RemovableHeapQ options."""
+        engine = BinaryHeapEngine(compaction_threshold=None)
+        engine.add(2)
+        engine.remove(2)
+        self.assertEqual(len(engine.heap), 1)
+        self.assertIsNone(engine.peek())
+
+
+if __name__ == "__main__":
+    unittest.main()
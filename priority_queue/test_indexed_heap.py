@@ -0,0 +1,109 @@
+import pickle
+import random
+import unittest
+from priority_queue.indexed_heap import IndexedHeapQ
+
+class TestIndexedHeapQ(unittest.TestCase):
+    def setUp(self):
+        self.indexed_heapq = IndexedHeapQ()
+
+    def assert_valid_heap(self, q):
+        for i, item in enumerate(q.heap):
+            self.assertEqual(q.position[item], i)
+            if i:
+                self.assertLessEqual(q.heap[(i - 1) // 2], item)
+        self.assertEqual(len(q.position), len(q.heap))
+
+    def test_add_and_pop_in_order(self):
+        """Tests if items are popped in ascending order."""
+        items = [5, 1, 9, 3, 7]
+        for item in items:
+            self.indexed_heapq.add(item)
+        self.assertEqual([self.indexed_heapq.pop() for _ in items], sorted(items))
+        self.assertIsNone(self.indexed_heapq.pop())
+
+    def test_bulk_construction(self):
+        """Tests that construction heapifies and drops duplicates."""
+        q = IndexedHeapQ([4, 2, 8, 2, 6, 0])
+        self.assert_valid_heap(q)
+        self.assertEqual(len(q), 5)
+        self.assertEqual(q.peek(), 0)
+
+    def test_add_duplicate_item(self):
+        """Tests that adding an item already in the heap has no effect."""
+        self.indexed_heapq.add(5)
+        self.indexed_heapq.add(5)
+        self.assertEqual(len(self.indexed_heapq), 1)
+
+    def test_remove_frees_the_slot(self):
+        """Tests that remove takes the item out of the heap list right away."""
+        for item in (5, 1, 9):
+            self.indexed_heapq.add(item)
+        self.indexed_heapq.remove(5)
+        self.indexed_heapq.remove(99)  # This should not raise an error
+        self.assertEqual(len(self.indexed_heapq.heap), 2)
+        self.assertNotIn(5, self.indexed_heapq)
+        self.assertEqual(self.indexed_heapq.pop(), 1)
+        self.assertEqual(self.indexed_heapq.pop(), 9)
+
+    def test_update_priority(self):
+        """Tests moving items both up and down the heap."""
+        q = IndexedHeapQ([(3, 'a'), (5, 'b'), (8, 'c')])
+        q.update_priority((8, 'c'), (1, 'c'))
+        self.assertEqual(q.peek(), (1, 'c'))
+        q.update_priority((1, 'c'), (9, 'c'))
+        self.assert_valid_heap(q)
+        self.assertEqual([q.pop() for _ in range(3)], [(3, 'a'), (5, 'b'), (9, 'c')])
+
+    def test_decrease_key(self):
+        """Tests decrease_key and that increasing through it raises ValueError."""
+        q = IndexedHeapQ([4, 6])
+        q.decrease_key(6, 2)
+        self.assertEqual(q.peek(), 2)
+        with self.assertRaises(ValueError):
+            q.decrease_key(2, 7)
+
+    def test_invalid_update_raises_error(self):
+        """Tests updates of missing items and onto items already in the heap."""
+        q = IndexedHeapQ([1, 2])
+        with self.assertRaises(ValueError):
+            q.update_priority(3, 0)
+        with self.assertRaises(ValueError):
+            q.update_priority(1, 2)
+
+    def test_random_operations_against_sorted_set(self):
+        """Tests a random churn of operations against a plain set."""
+        rng = random.Random(3)
+        live = set()
+        for _ in range(2000):
+            roll = rng.random()
+            if roll < 0.5:
+                item = rng.randrange(500)
+                self.indexed_heapq.add(item)
+                live.add(item)
+            elif roll < 0.8:
+                item = rng.randrange(500)
+                self.indexed_heapq.remove(item)
+                live.discard(item)
+            else:
+                expected = min(live) if live else None
+                self.assertEqual(self.indexed_heapq.pop(), expected)
+                live.discard(expected)
+        self.assert_valid_heap(self.indexed_heapq)
+        self.assertEqual(len(self.indexed_heapq), len(live))
+
+    def test_pickle_rebuilds_position_map(self):
+        """Tests that only the heap list is pickled and positions are rebuilt."""
+        heap = IndexedHeapQ([7, 3, 9, 1])
+        heap.remove(3)
+        state = heap.__getstate__()
+        self.assertEqual(list(state), ['heap'])
+        restored = pickle.loads(pickle.dumps(heap))
+        self.assertEqual(restored.heap, heap.heap)
+        self.assertEqual(restored.position, heap.position)
+        restored.decrease_key(9, 0)
+        self.assertEqual([restored.pop() for _ in range(4)], [0, 1, 7, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
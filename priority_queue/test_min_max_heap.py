@@ -0,0 +1,109 @@
+import random
+import unittest
+from priority_queue.min_max_heap import MinMaxHeapQ
+
+class TestMinMaxHeapQ(unittest.TestCase):
+    def assertValidHeap(self, heap):
+        items = heap.heap
+        for i, item in enumerate(items):
+            self.assertEqual(heap.position[item], i)
+            stack = [2 * i + 1, 2 * i + 2]
+            while stack:
+                j = stack.pop()
+                if j < len(items):
+                    self.assertTrue(item <= items[j] if heap._is_min_level(i) else item >= items[j])
+                    stack.extend((2 * j + 1, 2 * j + 2))
+        self.assertEqual(len(heap.position), len(items))
+
+    def test_empty_heap(self):
+        """Tests that peeking and popping an empty heap returns None."""
+        heap = MinMaxHeapQ()
+        self.assertIsNone(heap.peek_min())
+        self.assertIsNone(heap.peek_max())
+        self.assertIsNone(heap.pop_min())
+        self.assertIsNone(heap.pop_max())
+
+    def test_build_and_pop_both_ends(self):
+        """Tests the O(n) build and alternating pops from both ends."""
+        values = random.Random(1).sample(range(1000), 200)
+        heap = MinMaxHeapQ(values)
+        self.assertValidHeap(heap)
+        ordered = sorted(values)
+        for _ in range(100):
+            self.assertEqual(heap.peek_max(), ordered[-1])
+            self.assertEqual(heap.pop_max(), ordered.pop())
+            self.assertEqual(heap.pop_min(), ordered.pop(0))
+        self.assertEqual(len(heap), 0)
+
+    def test_random_operations_against_sorted_list(self):
+        """Tests add, remove, update and pops against a sorted list."""
+        rng = random.Random(2)
+        heap, live = MinMaxHeapQ(), set()
+        for _ in range(3000):
+            roll = rng.random()
+            if roll < 0.4:
+                item = rng.randrange(500)
+                heap.add(item)
+                live.add(item)
+            elif roll < 0.6 and live:
+                item = rng.choice(sorted(live))
+                heap.remove(item)
+                live.discard(item)
+            elif roll < 0.7 and live:
+                item = rng.choice(sorted(live))
+                new_item = rng.randrange(500)
+                if new_item not in live:
+                    heap.update_priority(item, new_item)
+                    live.discard(item)
+                    live.add(new_item)
+            elif roll < 0.85:
+                expected = min(live) if live else None
+                self.assertEqual(heap.pop_min(), expected)
+                live.discard(expected)
+            else:
+                expected = max(live) if live else None
+                self.assertEqual(heap.pop_max(), expected)
+                live.discard(expected)
+            self.assertEqual(len(heap), len(live))
+        self.assertValidHeap(heap)
+
+    def test_duplicates_and_invalid_updates(self):
+        """Tests that items are unique and updates are checked."""
+        heap = MinMaxHeapQ([3, 3, 1])
+        heap.add(1)
+        self.assertEqual(len(heap), 2)
+        heap.remove(42)
+        with self.assertRaises(ValueError):
+            heap.update_priority(42, 5)
+        with self.assertRaises(ValueError):
+            heap.update_priority(3, 1)
+
+    def test_bounded_keeps_top_n(self):
+        """Tests that a bounded heap keeps the n largest items and reports evictions."""
+        heap = MinMaxHeapQ([5, 1, 9, 7], capacity=3)
+        self.assertEqual(sorted(heap.heap), [5, 7, 9])
+        self.assertEqual(heap.add(8), 5)
+        self.assertEqual(heap.add(2), 2)
+        self.assertNotIn(2, heap)
+        values = random.Random(3).sample(range(10**5), 5000)
+        heap = MinMaxHeapQ(capacity=50)
+        for value in values:
+            heap.add(value)
+        self.assertEqual(sorted(heap.heap), sorted(values)[-50:])
+        self.assertValidHeap(heap)
+
+    def test_bounded_keeps_bottom_n(self):
+        """Tests evict='max', which keeps the smallest items."""
+        heap = MinMaxHeapQ(range(10), capacity=4, evict='max')
+        self.assertEqual(sorted(heap.heap), [0, 1, 2, 3])
+        self.assertEqual(heap.add(-1), 3)
+        self.assertEqual(heap.add(20), 20)
+        self.assertEqual(heap.peek_max(), 2)
+        with self.assertRaises(ValueError):
+            MinMaxHeapQ(evict='middle')
+        with self.assertRaises(ValueError):
+            MinMaxHeapQ(capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
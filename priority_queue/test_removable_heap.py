@@ -1,3 +1,4 @@
+import pickle
 import unittest
 from priority_queue.removable_heap import RemovableHeapQ
 
@@ -109,6 +110,89 @@ class TestRemovableHeapQ(unittest.TestCase):
         self.assertEqual(self.removable_heapq.pop(), 30)
         self.assertIsNone(self.removable_heapq.pop())
 
+    def test_peek_k_returns_smallest_live_items(self):
+        """Tests that peek_k skips masked items and does not change the heap."""
+        for item in [8, 3, 5, 1, 9, 2]:
+            self.removable_heapq.add(item)
+        self.removable_heapq.remove(2)
+        self.removable_heapq.remove(5)
+        heap = list(self.removable_heapq.heap)
+
+        self.assertEqual(self.removable_heapq.peek_k(3), [1, 3, 8])
+        self.assertEqual(self.removable_heapq.nsmallest(10), [1, 3, 8, 9])
+        self.assertEqual(self.removable_heapq.heap, heap)
+        self.assertEqual(self.removable_heapq.pop(), 1)
+
+    def test_peek_k_on_empty_heap(self):
+        """Tests that peek_k returns an empty list for an empty heap or k <= 0."""
+        self.assertEqual(self.removable_heapq.peek_k(5), [])
+        self.removable_heapq.add(1)
+        self.assertEqual(self.removable_heapq.peek_k(0), [])
+
+    def test_popped_masked_items_are_forgotten(self):
+        """Tests that masked items skipped by pop leave the masked set."""
+        self.removable_heapq.add(1)
+        self.removable_heapq.add(2)
+        self.removable_heapq.remove(1)
+        self.assertEqual(self.removable_heapq.pop(), 2)
+        self.assertEqual(self.removable_heapq.masked, set())
+        self.assertEqual(self.removable_heapq.added, set())
+
+    def test_compaction_drops_masked_items(self):
+        """Tests that the heap is rebuilt once masked items pass the threshold."""
+        heapq = RemovableHeapQ(compaction_threshold=0.5, min_compaction_size=8)
+        for item in range(10):
+            heapq.add(item)
+        for item in range(1, 10, 2):
+            heapq.remove(item)
+        self.assertEqual(heapq.compaction_count, 0)
+        heapq.remove(8)
+
+        self.assertEqual(heapq.compaction_count, 1)
+        self.assertEqual(sorted(heapq.heap), [0, 2, 4, 6])
+        self.assertEqual(heapq.added, {0, 2, 4, 6})
+        self.assertEqual(heapq.masked, set())
+        self.assertEqual([heapq.pop() for _ in range(5)], [0, 2, 4, 6, None])
+
+    def test_compaction_can_be_disabled(self):
+        """Tests that compaction_threshold=None keeps the lazy behaviour."""
+        heapq = RemovableHeapQ(compaction_threshold=None, min_compaction_size=0)
+        for item in range(10):
+            heapq.add(item)
+            heapq.remove(item)
+        self.assertEqual(len(heapq.heap), 10)
+        self.assertEqual(len(heapq), 0)
+
+    def test_stats(self):
+        """Tests the reported sizes and compaction counters."""
+        heapq = RemovableHeapQ(compaction_threshold=0.25, min_compaction_size=4)
+        for item in range(8):
+            heapq.add(item)
+        heapq.remove(3)
+        stats = heapq.stats()
+        self.assertEqual((stats['live_size'], stats['heap_size'], stats['masked_count']), (7, 8, 1))
+        heapq.remove(4)
+        heapq.remove(5)
+        stats = heapq.stats()
+        self.assertEqual((stats['live_size'], stats['heap_size'], stats['masked_count']), (5, 5, 0))
+        self.assertEqual(stats['compaction_count'], 1)
+        self.assertGreaterEqual(stats['compaction_seconds'], 0.0)
+
+    def test_pickle_keeps_live_items_in_heap_order(self):
+        """Tests that a pickled heap drops masked items and restores without heapify."""
+        heap = RemovableHeapQ(compaction_threshold=None)
+        for item in [5, 3, 8, 1, 9, 2]:
+            heap.add(item)
+        heap.remove(1)
+        heap.remove(8)
+        restored = pickle.loads(pickle.dumps(heap, protocol=5))
+        self.assertEqual(sorted(restored.heap), [2, 3, 5, 9])
+        self.assertEqual(restored.masked, set())
+        self.assertIsNone(restored.compaction_threshold)
+        self.assertEqual([restored.pop() for _ in range(5)], [2, 3, 5, 9, None])
+        # The original heap is left untouched
+        self.assertEqual(heap.masked, {1, 8})
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
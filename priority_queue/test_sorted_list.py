@@ -0,0 +1,107 @@
+import random
+import unittest
+from priority_queue.sorted_list import SortedList
+from priority_queue.example_sorted_list import MovieRentingSystem
+from priority_queue import example_removable_heap
+
+class TestSortedList(unittest.TestCase):
+
+    def test_construction_sorts_values(self):
+        """Tests that construction sorts values and splits them into chunks."""
+        sorted_list = SortedList([5, 1, 4, 1, 3], load=2)
+        self.assertEqual(list(sorted_list), [1, 1, 3, 4, 5])
+        self.assertEqual(len(sorted_list.lists), 3)
+        self.assertEqual(len(sorted_list), 5)
+
+    def test_add_remove_and_contains(self):
+        """Tests adding and removing values, including duplicates."""
+        sorted_list = SortedList(load=2)
+        for value in [3, 1, 2, 3, 0]:
+            sorted_list.add(value)
+        self.assertEqual(list(sorted_list), [0, 1, 2, 3, 3])
+        sorted_list.remove(3)
+        self.assertIn(3, sorted_list)
+        sorted_list.remove(3)
+        self.assertNotIn(3, sorted_list)
+        self.assertFalse(sorted_list.discard(3))
+        with self.assertRaises(ValueError):
+            sorted_list.remove(3)
+
+    def test_rank_select_and_slicing(self):
+        """Tests order statistic queries."""
+        sorted_list = SortedList(range(0, 100, 2), load=3)
+        self.assertEqual(sorted_list.rank(10), 5)
+        self.assertEqual(sorted_list.rank(11), 6)
+        self.assertEqual(sorted_list.bisect_right(10), 6)
+        self.assertEqual(sorted_list.select(7), 14)
+        self.assertEqual(sorted_list[-1], 98)
+        self.assertEqual(sorted_list[3:8], [6, 8, 10, 12, 14])
+        self.assertEqual(sorted_list[::20], [0, 40, 80])
+        with self.assertRaises(IndexError):
+            sorted_list[50]
+
+    def test_irange(self):
+        """Tests value ranges with inclusive and exclusive bounds."""
+        sorted_list = SortedList(range(10), load=2)
+        self.assertEqual(list(sorted_list.irange(3, 6)), [3, 4, 5, 6])
+        self.assertEqual(list(sorted_list.irange(3, 6, inclusive=(False, False))), [4, 5])
+        self.assertEqual(list(sorted_list.irange(hi=2)), [0, 1, 2])
+        self.assertEqual(list(sorted_list.irange(8)), [8, 9])
+        self.assertEqual(list(sorted_list.irange(6, 3)), [])
+
+    def test_random_operations_against_list(self):
+        """Tests a random sequence of operations against a sorted Python list."""
+        rng = random.Random(2)
+        sorted_list, expected = SortedList(load=4), []
+        for _ in range(3000):
+            value = rng.randrange(200)
+            if rng.random() < 0.6:
+                sorted_list.add(value)
+                expected.append(value)
+                expected.sort()
+            elif value in expected:
+                sorted_list.remove(value)
+                expected.remove(value)
+            if expected:
+                i = rng.randrange(len(expected))
+                self.assertEqual(sorted_list[i], expected[i])
+                self.assertEqual(sorted_list.rank(value), sum(x < value for x in expected))
+        self.assertEqual(list(sorted_list), expected)
+
+
+class TestSortedListMovieRentingSystem(unittest.TestCase):
+
+    def test_matches_heap_based_system(self):
+        """Tests that both renting systems answer search and report alike."""
+        rng = random.Random(6)
+        entries = {(rng.randrange(20), rng.randrange(10)): rng.randrange(1, 30) for _ in range(150)}
+        entries = [[shop, movie, price] for (shop, movie), price in entries.items()]
+        sorted_system = MovieRentingSystem(20, entries)
+        heap_system = example_removable_heap.MovieRentingSystem(20, entries)
+        rented = set()
+        for _ in range(500):
+            shop, movie, _ = rng.choice(entries)
+            if (shop, movie) in rented:
+                sorted_system.drop(shop, movie)
+                heap_system.drop(shop, movie)
+                rented.remove((shop, movie))
+            else:
+                sorted_system.rent(shop, movie)
+                heap_system.rent(shop, movie)
+                rented.add((shop, movie))
+            self.assertEqual(sorted_system.search(movie), heap_system.search(movie))
+            self.assertEqual(sorted_system.report(), heap_system.report())
+
+    def test_range_and_rank_queries(self):
+        """Tests the queries that only the sorted system supports."""
+        system = MovieRentingSystem(3, [[0, 1, 5], [1, 1, 4], [2, 1, 7], [0, 2, 1]])
+        self.assertEqual(system.searchInPriceRange(1, 4, 5), [1, 0])
+        self.assertEqual(system.searchInPriceRange(3, 0, 10), [])
+        system.rent(2, 1)
+        system.rent(0, 2)
+        self.assertEqual(system.rentedRank(2, 1), 1)
+        self.assertEqual(system.rentedRank(0, 2), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import heapq
+import itertools
+import random
+import unittest
+from priority_queue.stream import TopK, TopKArray, batches, merge, np, top_k, top_k_chunks, top_k_stream
+
+class TestMerge(unittest.TestCase):
+    def test_merge_sorted_sources(self):
+        """Tests that merging sorted sources matches sorting their concatenation."""
+        rng = random.Random(1)
+        sources = [sorted(rng.randrange(100) for _ in range(rng.randrange(30))) for _ in range(8)]
+        self.assertEqual(list(merge(*sources)), sorted(itertools.chain(*sources)))
+        self.assertEqual(list(merge()), [])
+        self.assertEqual(list(merge([], [1], [])), [1])
+
+    def test_merge_key_and_reverse(self):
+        """Tests a key function, descending sources and stability between sources."""
+        left = [(1, 'a'), (3, 'a'), (5, 'a')]
+        right = [(1, 'b'), (3, 'b'), (4, 'b')]
+        self.assertEqual(list(merge(left, right, key=lambda pair: pair[0])),
+                         [(1, 'a'), (1, 'b'), (3, 'a'), (3, 'b'), (4, 'b'), (5, 'a')])
+        self.assertEqual(list(merge([9, 5, 1], [8, 5, 2], reverse=True)), [9, 8, 5, 5, 2, 1])
+
+    def test_merge_unique(self):
+        """Tests that unique drops duplicates across and within sources."""
+        self.assertEqual(list(merge([1, 2, 2, 5], [2, 3, 5], [5], unique=True)), [1, 2, 3, 5])
+
+    def test_merge_is_lazy(self):
+        """Tests that endless sources work and are read only one item ahead."""
+        reads = []
+
+        def source(start):
+            for value in itertools.count(start, 3):
+                reads.append(value)
+                yield value
+
+        merged = merge(source(0), source(1), source(2))
+        self.assertEqual(list(itertools.islice(merged, 10)), list(range(10)))
+        # 10 yielded values, plus the next head of each source already in the heap
+        self.assertEqual(len(reads), 12)
+
+    def test_merge_uncomparable_items(self):
+        """Tests that items with equal keys are never compared themselves."""
+        left, right = [{'t': 1}, {'t': 2}], [{'t': 1}]
+        self.assertEqual([item['t'] for item in merge(left, right, key=lambda item: item['t'])], [1, 1, 2])
+
+
+class TestTopK(unittest.TestCase):
+    def test_invalid_k(self):
+        """Tests that k must be positive."""
+        with self.assertRaises(ValueError):
+            TopK(0)
+
+    def test_top_k_against_sorted(self):
+        """Tests the largest and smallest k against sorting the whole stream."""
+        values = [random.Random(2).randrange(1000) for _ in range(5000)]
+        self.assertEqual(top_k(values, 10), sorted(values, reverse=True)[:10])
+        self.assertEqual(top_k(values, 10, largest=False), sorted(values)[:10])
+        self.assertEqual(top_k([3, 1], 5), [3, 1])
+
+    def test_bounded_size_and_threshold(self):
+        """Tests that only k items are kept and the threshold is the worst of them."""
+        accumulator = TopK(3)
+        accumulator.extend(range(100))
+        self.assertEqual(len(accumulator), 3)
+        self.assertEqual(accumulator.seen, 100)
+        self.assertEqual(accumulator.threshold(), 97)
+        self.assertIsNone(TopK(3).threshold())
+
+    def test_key_and_ties(self):
+        """Tests a key on uncomparable items, with ties kept in arrival order."""
+        events = [{'id': i, 'score': score} for i, score in enumerate([5, 9, 5, 7, 9, 1])]
+        best = top_k(events, 3, key=lambda event: event['score'])
+        self.assertEqual([event['id'] for event in best], [1, 4, 3])
+        worst = top_k(events, 2, key=lambda event: event['score'], largest=False)
+        self.assertEqual([event['id'] for event in worst], [5, 0])
+
+    def test_top_k_stream(self):
+        """Tests the running top k snapshots, including the final partial one."""
+        snapshots = list(top_k_stream([4, 8, 1, 9, 3], 2, every=2))
+        self.assertEqual(snapshots, [[8, 4], [9, 8], [9, 8]])
+        self.assertEqual(list(top_k_stream([4, 8, 1, 9, 3], 2)), [[8, 4], [9, 8], [9, 8]])
+        self.assertEqual(list(top_k_stream([], 2)), [])
+        for every in (0, -1):
+            with self.assertRaises(ValueError):
+                next(top_k_stream([1], 2, every=every))
+
+    def test_top_k_stream_default_is_log_k_per_item(self):
+        """Tests that the default snapshots add O(log k) comparisons per item, not O(k log k)."""
+        comparisons = [0]
+
+        class Value(float):
+            def __lt__(self, other):
+                comparisons[0] += 1
+                return float(self) < float(other)
+
+        n, k = 20000, 1000
+        rng = random.Random(6)
+        for _ in top_k_stream((Value(rng.random()) for _ in range(n)), k):
+            pass
+        # Sorting a snapshot per item would take about n * k * log2(k) = 2e8 comparisons
+        self.assertLess(comparisons[0], 40 * n)
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestTopKArray(unittest.TestCase):
+    def test_chunks_against_sorted(self):
+        """Tests the chunked top k of both kinds against sorting all values."""
+        values = np.random.default_rng(3).integers(0, 10 ** 6, 20000)
+        for largest in (True, False):
+            accumulator = TopKArray(50, largest)
+            for chunk in np.array_split(values, 7):
+                accumulator.push_batch(chunk)
+                self.assertLessEqual(len(accumulator), 50)
+            expected = np.sort(values)[::-1][:50] if largest else np.sort(values)[:50]
+            np.testing.assert_array_equal(accumulator.result(), expected)
+            self.assertEqual(accumulator.seen, len(values))
+
+    def test_ids_follow_values(self):
+        """Tests that ids are kept with their values and must be given consistently."""
+        accumulator = TopKArray(2)
+        accumulator.push_batch([0.5, 0.9, 0.1], ids=[10, 11, 12])
+        accumulator.push_batch([0.7], ids=[13])
+        values, ids = accumulator.result()
+        np.testing.assert_array_equal(values, [0.9, 0.7])
+        np.testing.assert_array_equal(ids, [11, 13])
+        with self.assertRaises(ValueError):
+            accumulator.push_batch([0.3])
+        with self.assertRaises(ValueError):
+            accumulator.push_batch([0.3], ids=[1, 2])
+
+    def test_top_k_chunks_and_batches(self):
+        """Tests the chunked stage over batches cut from a plain iterable."""
+        values = [random.Random(4).random() for _ in range(1000)]
+        *_, last = top_k_chunks(batches(values, 64), 5)
+        np.testing.assert_array_equal(last, heapq.nlargest(5, values))
+        self.assertEqual([len(batch) for batch in batches(range(10), 4)], [4, 4, 2])
+        self.assertEqual(len(TopKArray(3).result()), 0)
+
+    def test_ties_keep_arrival_order_like_top_k(self):
+        """Tests that tied values are kept and returned in arrival order, as TopK does."""
+        values = [3, 7, 5, 7, 1, 7, 5, 2]
+        for largest in (True, False):
+            accumulator = TopKArray(4, largest)
+            accumulator.push_batch(values[:5], ids=range(5))
+            accumulator.push_batch(values[5:], ids=range(5, 8))
+            expected = top_k(list(zip(values, range(8))), 4, key=lambda pair: pair[0], largest=largest)
+            result_values, ids = accumulator.result()
+            self.assertEqual(list(zip(result_values.tolist(), ids.tolist())), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+import functools
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from look_up.union_find import UnionFind
+from priority_queue.removable_heap import RemovableHeapQ
+from queue_and_stack.circular_queue import CircularQueue
+from queue_and_stack.min_stack import MinStack
+
+"""
+    Opt-in instrumentation of the hot paths of UnionFind, RemovableHeapQ, CircularQueue and MinStack.
+
+    Nothing is hooked by default. enable() replaces the listed methods on the classes with counting
+    wrappers and disable() puts the original functions back, so a disabled instrumentation costs
+    exactly nothing, not even a flag check. Once enabled it affects every instance of those classes.
+
+    Besides a counter per operation it records
+    - the path length of every UnionFind.find (the number of parent hops to the root),
+    - the number of masked items every RemovableHeapQ.pop discarded before returning,
+    - failed CircularQueue.enQueue/deQueue calls,
+    - the latency of every sample_every-th call of each operation, kept in a bounded list per
+      operation and passed to the optional callback(op, seconds).
+
+    stats() exports everything as a plain dict. profile() enables an Instrumentation around a
+    block of code and prints summary() when the block exits.
+"""
+
+TARGETS: Dict[type, Tuple[str, ...]] = {
+    UnionFind: ('find', 'union'),
+    RemovableHeapQ: ('add', 'remove', 'pop', 'compact', 'peek_k'),
+    CircularQueue: ('enQueue', 'deQueue', 'Front', 'Rear'),
+    MinStack: ('push', 'pop', 'top', 'getMin'),
+}
+
+_active: Optional['Instrumentation'] = None
+_lock = threading.Lock()
+
+
+class Instrumentation:
+
+    def __init__(self, sample_every: int = 100, max_samples: int = 10000,
+                 callback: Optional[Callable[[str, float], None]] = None):
+        if sample_every < 1:
+            raise ValueError('Invalid sample rate, sample_every must be at least 1')
+        self.sample_every = sample_every
+        self.max_samples = max_samples
+        self.callback = callback
+        self.counters = Counter()
+        self.histograms: Dict[str, Counter] = {}
+        self.latencies: Dict[str, List[float]] = {}
+        self.originals: Dict[Tuple[type, str], Any] = {}
+        self.local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.originals)
+
+    def enable(self, targets: Optional[Dict[type, Tuple[str, ...]]] = None) -> 'Instrumentation':
+        global _active
+        with _lock:
+            if _active is not None:
+                raise RuntimeError('Invalid enable, another instrumentation is already active')
+            _active = self
+            try:
+                for cls, names in (TARGETS if targets is None else targets).items():
+                    for name in names:
+                        original = cls.__dict__[name]
+                        setattr(cls, name, self._wrap(cls, name, original))
+                        self.originals[(cls, name)] = original
+            except BaseException:
+                # A missing or read-only target must not leave half of the classes patched
+                self._restore()
+                raise
+        return self
+
+    def disable(self) -> None:
+        with _lock:
+            self._restore()
+
+    def _restore(self) -> None:
+        global _active
+        for (cls, name), original in self.originals.items():
+            setattr(cls, name, original)
+        self.originals.clear()
+        if _active is self:
+            _active = None
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.histograms.clear()
+        self.latencies.clear()
+
+    def record(self, histogram: str, value: int) -> None:
+        counts = self.histograms.get(histogram)
+        if counts is None:
+            counts = self.histograms[histogram] = Counter()
+        counts[value] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'counters': dict(self.counters),
+            'histograms': {name: dict(sorted(counts.items())) for name, counts in self.histograms.items()},
+            'latency': {op: _latency_summary(samples) for op, samples in self.latencies.items()},
+        }
+
+    def summary(self) -> str:
+        lines = ['operation                      calls    p50 us    p99 us    max us']
+        for op, calls in sorted(self.counters.items()):
+            latency = _latency_summary(self.latencies.get(op, []))
+            lines.append(f"{op:<28} {calls:>7} " + ' '.join(
+                f"{latency[key] * 1e6:>9.2f}" if latency['samples'] else f"{'-':>9}"
+                for key in ('p50', 'p99', 'max')))
+        for name, counts in sorted(self.histograms.items()):
+            total = sum(counts.values())
+            mean = sum(value * count for value, count in counts.items()) / total
+            lines.append(f"{name}: mean {mean:.2f}, max {max(counts)}, "
+                         + ', '.join(f'{value}: {count}' for value, count in sorted(counts.items())[:10]))
+        return '\n'.join(lines)
+
+    def _wrap(self, cls: type, name: str, original: Callable) -> Callable:
+        op = f'{cls.__name__}.{name}'
+        observe = _OBSERVERS.get((cls, name))
+        counters, every, local = self.counters, self.sample_every, self.local
+        before, after = observe if observe else (None, None)
+
+        @functools.wraps(original)
+        def wrapper(obj, *args, **kwargs):
+            # Recursive calls (UnionFind.find) belong to the outer call of the same operation
+            busy = local.__dict__.setdefault('busy', set())
+            if op in busy:
+                return original(obj, *args, **kwargs)
+            busy.add(op)
+            try:
+                counters[op] += 1
+                state = before(self, obj, *args) if before else None
+                if counters[op] % every:
+                    result = original(obj, *args, **kwargs)
+                else:
+                    start = time.perf_counter()
+                    result = original(obj, *args, **kwargs)
+                    self._sample(op, time.perf_counter() - start)
+                if after:
+                    after(self, obj, state, result)
+                return result
+            finally:
+                busy.discard(op)
+        return wrapper
+
+    def _sample(self, op: str, seconds: float) -> None:
+        samples = self.latencies.get(op)
+        if samples is None:
+            samples = self.latencies[op] = []
+        if len(samples) < self.max_samples:
+            samples.append(seconds)
+        else:
+            samples[self.counters[op] // self.sample_every % self.max_samples] = seconds
+        if self.callback is not None:
+            self.callback(op, seconds)
+
+
+def _find_path_length(instrumentation: Instrumentation, uf: UnionFind, x: int) -> None:
+    parent, hops = uf.parent, 0
+    if 0 <= x < len(parent):
+        while parent[x] != x:
+            x = parent[x]
+            hops += 1
+        instrumentation.record('UnionFind.find.path_length', hops)
+
+
+def _heap_size(instrumentation: Instrumentation, heap: RemovableHeapQ) -> int:
+    return len(heap.heap)
+
+
+def _pop_skips(instrumentation: Instrumentation, heap: RemovableHeapQ, size: int, result: Any) -> None:
+    instrumentation.record('RemovableHeapQ.pop.skipped', size - len(heap.heap) - (result is not None))
+
+
+def _queue_failure(op: str) -> Callable:
+    def after(instrumentation: Instrumentation, queue: CircularQueue, before: Any, result: bool) -> None:
+        if not result:
+            instrumentation.counters[op] += 1
+    return after
+
+
+# (before, after) hooks: before(instrumentation, obj, *args) returns the state handed to
+# after(instrumentation, obj, state, result)
+_OBSERVERS: Dict[Tuple[type, str], Tuple[Optional[Callable], Optional[Callable]]] = {
+    (UnionFind, 'find'): (_find_path_length, None),
+    (RemovableHeapQ, 'pop'): (_heap_size, _pop_skips),
+    (CircularQueue, 'enQueue'): (None, _queue_failure('CircularQueue.enQueue.full')),
+    (CircularQueue, 'deQueue'): (None, _queue_failure('CircularQueue.deQueue.empty')),
+}
+
+
+def _latency_summary(samples: List[float]) -> Dict[str, Any]:
+    if not samples:
+        return {'samples': 0, 'mean': 0.0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+    ordered = sorted(samples)
+    return {
+        'samples': len(ordered),
+        'mean': sum(ordered) / len(ordered),
+        'p50': ordered[len(ordered) // 2],
+        'p99': ordered[min(len(ordered) - 1, len(ordered) * 99 // 100)],
+        'max': ordered[-1],
+    }
+
+
+@contextmanager
+def profile(sample_every: int = 100, targets: Optional[Dict[type, Tuple[str, ...]]] = None,
+            callback: Optional[Callable[[str, float], None]] = None,
+            file: Optional[TextIO] = None) -> Iterator[Instrumentation]:
+    instrumentation = Instrumentation(sample_every=sample_every, callback=callback).enable(targets)
+    try:
+        yield instrumentation
+    finally:
+        instrumentation.disable()
+        print(instrumentation.summary(), file=file or sys.stdout)
@@ -0,0 +1,89 @@
+import io
+import unittest
+
+from profiling.instrumentation import Instrumentation, profile
+from look_up.union_find import UnionFind
+from priority_queue.removable_heap import RemovableHeapQ
+from queue_and_stack.circular_queue import CircularQueue
+from queue_and_stack.min_stack import MinStack
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_disabled_leaves_classes_untouched(self):
+        """Tests that disable() restores the original functions."""
+        original = UnionFind.__dict__['find']
+        instrumentation = Instrumentation().enable()
+        self.assertIsNot(UnionFind.__dict__['find'], original)
+        instrumentation.disable()
+        self.assertIs(UnionFind.__dict__['find'], original)
+        UnionFind(3).find(2)
+        self.assertEqual(instrumentation.counters, {})
+
+    def test_union_find_path_lengths(self):
+        """Tests that recursive finds count once, with the hops to the root."""
+        uf = UnionFind(4)
+        # Build the chain 3 -> 2 -> 1 -> 0 by hand so the first find walks three hops
+        uf.parent = [0, 0, 1, 2]
+        with profile(sample_every=1, file=io.StringIO()) as instrumentation:
+            self.assertEqual(uf.find(3), 0)
+            uf.find(3)
+            uf.union(0, 1)
+        self.assertEqual(instrumentation.counters['UnionFind.find'], 4)
+        self.assertEqual(instrumentation.counters['UnionFind.union'], 1)
+        self.assertEqual(instrumentation.stats()['histograms']['UnionFind.find.path_length'], {0: 1, 1: 2, 3: 1})
+
+    def test_heap_pop_skips_and_queue_failures(self):
+        """Tests the pop skip histogram and failed queue operations."""
+        heap = RemovableHeapQ(compaction_threshold=None)
+        queue = CircularQueue(1)
+        with profile(file=io.StringIO()) as instrumentation:
+            for item in range(5):
+                heap.add(item)
+            heap.remove(0)
+            heap.remove(1)
+            heap.pop()
+            heap.pop()
+            queue.enQueue(1)
+            queue.enQueue(2)
+            queue.deQueue()
+            queue.deQueue()
+        stats = instrumentation.stats()
+        self.assertEqual(stats['histograms']['RemovableHeapQ.pop.skipped'], {0: 1, 2: 1})
+        self.assertEqual(stats['counters']['RemovableHeapQ.add'], 5)
+        self.assertEqual(stats['counters']['CircularQueue.enQueue.full'], 1)
+        self.assertEqual(stats['counters']['CircularQueue.deQueue.empty'], 1)
+
+    def test_latency_sampling_and_callback(self):
+        """Tests that every n-th call is timed and passed to the callback."""
+        events = []
+        stack = MinStack()
+        output = io.StringIO()
+        with profile(sample_every=10, callback=lambda op, seconds: events.append(op), file=output) as instrumentation:
+            for value in range(100):
+                stack.push(value)
+        self.assertEqual(events, ['MinStack.push'] * 10)
+        self.assertEqual(instrumentation.stats()['latency']['MinStack.push']['samples'], 10)
+        self.assertIn('MinStack.push', output.getvalue())
+
+    def test_only_one_active(self):
+        """Tests that two instrumentations cannot patch the classes at once."""
+        with profile(file=io.StringIO()):
+            with self.assertRaises(RuntimeError):
+                Instrumentation().enable()
+        Instrumentation().enable().disable()
+
+    def test_failed_enable_rolls_back(self):
+        """Tests that a target that cannot be patched leaves no class patched and nothing active."""
+        originals = {name: MinStack.__dict__[name] for name in ('push', 'pop')}
+        instrumentation = Instrumentation()
+        with self.assertRaises(KeyError):
+            instrumentation.enable({MinStack: ('push', 'pop', 'no_such_method')})
+        self.assertFalse(instrumentation.enabled)
+        for name, original in originals.items():
+            self.assertIs(MinStack.__dict__[name], original)
+        Instrumentation().enable().disable()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,22 @@
+import struct
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional, Tuple, Union
+
 """
     An implementation of circular queue. In reality, deque (built-in double - ended queue) is a 
     better choice in most cases.
+
+    SharedCircularQueue brings the same ring to several processes on one host without pickling.
+    It lives in multiprocessing.shared_memory and is safe for a single producer and a single
+    consumer. Head and tail are monotonic byte counters in the shared header, each on its own cache
+    line and each written by one side only, so no lock is needed. With a struct record_format
+    every slot is one fixed size record; without it the ring carries length framed byte strings.
+    A frame is never split at the end of the ring, the bytes left there are skipped, so a payload
+    may take at most max_payload bytes (about half the ring): larger ones could wait forever for
+    room even in an empty ring, and put_bytes() refuses them with ValueError.
+    peek_view() hands the consumer a memoryview into the shared block without copying, which stays
+    valid until consume() is called and must be released before close(). consume() raises
+    ValueError if the peeked record was already read by get() or get_bytes() in between.
 """
 
 class CircularQueue:
@@ -47,4 +63,175 @@ class CircularQueue:
         return self.head == -1
 
     def isFull(self) -> bool:
-        return (self.tail + 1) % self.size == self.head 
\ No newline at end of file
+        return (self.tail + 1) % self.size == self.head
+
+
+class SharedCircularQueue:
+    MAGIC = b'CIRQSHM1'
+    # magic, capacity in bytes, record size (0 for framed bytes), record format
+    HEADER = struct.Struct('<8sQQ32s')
+    # Counter slots in the header viewed as native 8 byte words, on separate cache lines
+    HEAD_INDEX = 8
+    TAIL_INDEX = 16
+    DATA_OFFSET = 192
+    FRAME = struct.Struct('<I')
+    WRAP_MARKER = 0xFFFFFFFF
+
+    def __init__(self, k: int, record_format: Optional[str] = None, name: Optional[str] = None):
+        if k < 1:
+            raise ValueError('Invalid capacity, cannot be smaller than 1')
+        record_size = struct.calcsize(record_format) if record_format else 0
+        if record_format and len(record_format.encode()) > 32:
+            raise ValueError('Invalid record format, cannot be longer than 32 bytes')
+        capacity = k * record_size if record_format else k
+        self.shm = SharedMemory(name=name, create=True, size=self.DATA_OFFSET + capacity)
+        self.HEADER.pack_into(self.shm.buf, 0, self.MAGIC, capacity, record_size,
+                              (record_format or '').encode())
+        self._load_layout()
+        self.counters[self.HEAD_INDEX] = 0
+        self.counters[self.TAIL_INDEX] = 0
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedCircularQueue':
+        queue = cls.__new__(cls)
+        try:
+            # Python 3.13+ can skip the resource tracker, which would otherwise unlink the block
+            # when an unrelated attaching process exits
+            queue.shm = SharedMemory(name=name, track=False)
+        except TypeError:
+            queue.shm = SharedMemory(name=name)
+        queue._load_layout()
+        return queue
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def isEmpty(self) -> bool:
+        return self._head() == self._tail()
+
+    def isFull(self) -> bool:
+        if self.record is None:
+            return self.capacity - (self._tail() - self._head()) < self.FRAME.size + 1
+        return self._tail() - self._head() == self.capacity
+
+    def put(self, *values: Any) -> bool:
+        if self.record is None:
+            raise ValueError('Invalid put, this queue carries framed bytes, use put_bytes')
+        tail = self._tail()
+        if tail - self._head() == self.capacity:
+            return False
+        self.record.pack_into(self.shm.buf, self.DATA_OFFSET + tail % self.capacity, *values)
+        self._set_tail(tail + self.record.size)
+        return True
+
+    def get(self) -> Union[Tuple[Any, ...], None]:
+        if self.record is None:
+            raise ValueError('Invalid get, this queue carries framed bytes, use get_bytes')
+        head = self._head()
+        if head == self._tail():
+            return None
+        values = self.record.unpack_from(self.shm.buf, self.DATA_OFFSET + head % self.capacity)
+        self._set_head(head + self.record.size)
+        return values
+
+    def put_bytes(self, payload: Union[bytes, bytearray, memoryview]) -> bool:
+        if self.record is not None:
+            raise ValueError('Invalid put_bytes, this queue carries fixed size records, use put')
+        size = len(payload)
+        if size > self.max_payload:
+            raise ValueError(f'Invalid payload, {size} bytes exceed the {self.max_payload} bytes that '
+                             'always fit into the queue')
+        tail = self._tail()
+        free = self.capacity - (tail - self._head())
+        position = tail % self.capacity
+        skip = self.capacity - position
+        # A frame is never split: if it does not fit before the end, mark the rest as skipped
+        if skip >= self.FRAME.size + size:
+            skip = 0
+        if free < skip + self.FRAME.size + size:
+            return False
+        buf = self.shm.buf
+        if skip:
+            if skip >= self.FRAME.size:
+                self.FRAME.pack_into(buf, self.DATA_OFFSET + position, self.WRAP_MARKER)
+            tail += skip
+            position = 0
+        self.FRAME.pack_into(buf, self.DATA_OFFSET + position, size)
+        start = self.DATA_OFFSET + position + self.FRAME.size
+        buf[start:start + size] = payload
+        self._set_tail(tail + self.FRAME.size + size)
+        return True
+
+    def get_bytes(self) -> Union[bytes, None]:
+        view = self.peek_view()
+        if view is None:
+            return None
+        with view:
+            payload = bytes(view)
+        self.consume()
+        return payload
+
+    def peek_view(self) -> Union[memoryview, None]:
+        head = self._head()
+        if head == self._tail():
+            return None
+        buf = self.shm.buf
+        if self.record is not None:
+            start = self.DATA_OFFSET + head % self.capacity
+            self._pending = (head, self.record.size)
+            return buf[start:start + self.record.size]
+        position = head % self.capacity
+        skip = 0
+        remaining = self.capacity - position
+        if remaining < self.FRAME.size or \
+                self.FRAME.unpack_from(buf, self.DATA_OFFSET + position)[0] == self.WRAP_MARKER:
+            skip, position = remaining, 0
+        size = self.FRAME.unpack_from(buf, self.DATA_OFFSET + position)[0]
+        start = self.DATA_OFFSET + position + self.FRAME.size
+        self._pending = (head, skip + self.FRAME.size + size)
+        return buf[start:start + size]
+
+    def consume(self) -> None:
+        if self._pending is not None and self._pending[0] != self._head():
+            # get() or get_bytes() read past the peeked record, moving head back would replay it
+            self._pending = None
+            raise ValueError('Invalid consume, the peeked record was already read')
+        if self._pending is None and self.peek_view() is None:
+            raise ValueError('Invalid consume, the queue is empty')
+        head, size = self._pending
+        self._pending = None
+        self._set_head(head + size)
+
+    def close(self) -> None:
+        self.counters.release()
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.shm.unlink()
+
+    def _load_layout(self) -> None:
+        magic, self.capacity, record_size, record_format = self.HEADER.unpack_from(self.shm.buf, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f'Invalid shared memory block {self.shm.name}, it does not hold a queue')
+        record_format = record_format.rstrip(b'\0').decode()
+        self.record = struct.Struct(record_format) if record_size else None
+        # A frame that does not fit before the end skips up to its own size minus one byte, so
+        # 2 * (frame + payload) - 1 bytes must fit into an empty ring wherever its tail stands
+        self.max_payload = (self.capacity + 1) // 2 - self.FRAME.size
+        self._pending = None
+        # struct packs '<Q' byte by byte, which the other side could read half written. A native
+        # 'Q' memoryview stores the aligned word in one instruction.
+        self.counters = self.shm.buf[:self.DATA_OFFSET].cast('Q')
+
+    def _head(self) -> int:
+        return self.counters[self.HEAD_INDEX]
+
+    def _tail(self) -> int:
+        return self.counters[self.TAIL_INDEX]
+
+    def _set_head(self, value: int) -> None:
+        self.counters[self.HEAD_INDEX] = value
+
+    def _set_tail(self, value: int) -> None:
+        self.counters[self.TAIL_INDEX] = value
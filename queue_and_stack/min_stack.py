@@ -1,8 +1,16 @@
-from typing import Union 
+from array import array
+from typing import Any, Callable, Iterable, List, Optional, Union 
 
 """
     An implementation of min stack which can provide a fast query at O(1) of the min value in the stack. 
     In reality, you can also use just list (for python), and another varible to track min value.
+
+    CompactMinStack stores the min only when it changes, as (value, count) runs, instead of once per
+    push, so a stack whose min rarely changes needs almost no extra memory. With a typecode the
+    values live in a typed array. With track_max=True it also tracks the max, and optionally any
+    other aggregate whose result often stays the same (gcd, bitwise and/or, ...), with the same run
+    encoding. It supports bulk push_many/pop_many. The max is off by default: on increasing input
+    it changes on every push, and its runs then take more memory than MinStack's min list.
 """
 
 class MinStack:
@@ -35,4 +43,125 @@ class MinStack:
     def getMin(self) -> Union[int, None]:
         if self.min:
             return self.min[-1]
-        return None
\ No newline at end of file
+        return None
+
+
+class AggregateRuns:
+
+    def __init__(self, op: Callable[[Any, Any], Any], typecode: Optional[str] = None):
+        self.op = op
+        self.values = array(typecode) if typecode else []
+        self.counts = array('q')
+
+    def push(self, val: Any) -> None:
+        values = self.values
+        if values:
+            new = self.op(values[-1], val)
+            if new == values[-1]:
+                self.counts[-1] += 1
+                return
+            val = new
+        values.append(val)
+        self.counts.append(1)
+
+    def extend(self, vals: Iterable[Any]) -> None:
+        it = iter(vals)
+        values, counts, op = self.values, self.counts, self.op
+        if not values:
+            for val in it:
+                self.push(val)
+                break
+            else:
+                return
+        current, count = values[-1], counts[-1]
+        # min and max are compared inline, calling op per value costs more than the loop itself
+        if op is min or op is max:
+            for val in it:
+                if (val < current) if op is min else (val > current):
+                    counts[-1] = count
+                    values.append(val)
+                    counts.append(1)
+                    current, count = val, 1
+                else:
+                    count += 1
+        else:
+            for val in it:
+                new = op(current, val)
+                if new == current:
+                    count += 1
+                else:
+                    counts[-1] = count
+                    values.append(new)
+                    counts.append(1)
+                    current, count = new, 1
+        counts[-1] = count
+
+    def pop_many(self, n: int) -> None:
+        values, counts = self.values, self.counts
+        while n > 0 and values:
+            if counts[-1] > n:
+                counts[-1] -= n
+                return
+            n -= counts.pop()
+            values.pop()
+
+    def top(self) -> Union[Any, None]:
+        if self.values:
+            return self.values[-1]
+        return None
+
+
+class CompactMinStack:
+
+    def __init__(self, typecode: Optional[str] = None, track_max: bool = False,
+                 aggregate: Optional[Callable[[Any, Any], Any]] = None):
+        self.data = array(typecode) if typecode else []
+        self.min = AggregateRuns(min, typecode)
+        self.max = AggregateRuns(max, typecode) if track_max else None
+        self.aggregate = AggregateRuns(aggregate) if aggregate else None
+        self.runs = [runs for runs in (self.min, self.max, self.aggregate) if runs is not None]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def push(self, val: Any) -> None:
+        self.data.append(val)
+        for runs in self.runs:
+            runs.push(val)
+
+    def push_many(self, values: Iterable[Any]) -> None:
+        values = values if isinstance(values, (list, array, range)) else list(values)
+        self.data.extend(values)
+        for runs in self.runs:
+            runs.extend(values)
+
+    def pop(self) -> None:
+        self.pop_many(1)
+
+    def pop_many(self, n: int) -> Union[List[Any], array]:
+        n = max(0, min(n, len(self.data)))
+        if n == 0:
+            return self.data[:0]
+        popped = self.data[-n:]
+        del self.data[-n:]
+        for runs in self.runs:
+            runs.pop_many(n)
+        return popped
+
+    def top(self) -> Union[Any, None]:
+        if self.data:
+            return self.data[-1]
+        return None
+
+    def getMin(self) -> Union[Any, None]:
+        return self.min.top()
+
+    def getMax(self) -> Union[Any, None]:
+        if self.max is None:
+            raise ValueError('Invalid max query, the stack was created with track_max=False')
+        return self.max.top()
+
+    def getAggregate(self) -> Union[Any, None]:
+        if self.aggregate is None:
+            raise ValueError('Invalid aggregate query, no aggregate operator was given')
+        return self.aggregate.top()
@@ -0,0 +1,153 @@
+from array import array
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+"""
+    A ring buffer for bursts of data. Unlike CircularQueue it never refuses a write: when it is
+    full it either grows geometrically (overflow='grow') or overwrites the oldest entries
+    (overflow='overwrite', counting them in dropped).
+
+    With a typecode, e.g. 'd' or 'q', the slots live in a typed array instead of a list of boxed
+    values. extend(), pop_many() and peek_many() move data as contiguous slices, so a batch is
+    copied at most twice, once for each side of the wraparound. segments() exposes the stored
+    items as at most two memoryviews without copying.
+"""
+
+class RingBuffer:
+
+    def __init__(self, capacity: int, typecode: Optional[str] = None, overflow: str = 'grow'):
+        if capacity < 1:
+            raise ValueError('Invalid capacity, cannot be smaller than 1')
+        if overflow not in ('grow', 'overwrite'):
+            raise ValueError(f'Invalid overflow {overflow}, expected grow or overwrite')
+        self.typecode = typecode
+        self.overflow = overflow
+        self.buffer = self._allocate(capacity)
+        self.head = 0
+        self.count = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Any]:
+        buffer, capacity = self.buffer, len(self.buffer)
+        for i in range(self.count):
+            yield buffer[(self.head + i) % capacity]
+
+    @property
+    def capacity(self) -> int:
+        return len(self.buffer)
+
+    def append(self, value: Any) -> None:
+        capacity = len(self.buffer)
+        if self.count == capacity:
+            if self.overflow == 'grow':
+                self._grow(self.count + 1)
+                capacity = len(self.buffer)
+            else:
+                self.head = (self.head + 1) % capacity
+                self.count -= 1
+                self.dropped += 1
+        self.buffer[(self.head + self.count) % capacity] = value
+        self.count += 1
+
+    def popleft(self) -> Any:
+        if not self.count:
+            raise IndexError('pop from an empty RingBuffer')
+        value = self.buffer[self.head]
+        if self.typecode is None:
+            self.buffer[self.head] = None
+        self.head = (self.head + 1) % len(self.buffer)
+        self.count -= 1
+        return value
+
+    def extend(self, values: Iterable[Any]) -> None:
+        if self.typecode is None:
+            values = values if isinstance(values, list) else list(values)
+        elif not (isinstance(values, array) and values.typecode == self.typecode):
+            values = array(self.typecode, values)
+        n = len(values)
+        capacity = len(self.buffer)
+        if self.count + n > capacity:
+            if self.overflow == 'grow':
+                self._grow(self.count + n)
+                capacity = len(self.buffer)
+            elif n >= capacity:
+                # Only the newest capacity values survive
+                self.dropped += self.count + n - capacity
+                values = values[n - capacity:]
+                n = capacity
+                self.head = 0
+                self.count = 0
+            else:
+                excess = self.count + n - capacity
+                self.head = (self.head + excess) % capacity
+                self.count -= excess
+                self.dropped += excess
+        tail = (self.head + self.count) % capacity
+        first = min(n, capacity - tail)
+        self._copy_in(tail, values, 0, first)
+        self._copy_in(0, values, first, n)
+        self.count += n
+
+    def peek_many(self, n: int) -> Any:
+        n = max(0, min(n, self.count))
+        first = min(n, len(self.buffer) - self.head)
+        buffer = self.buffer
+        result = buffer[self.head:self.head + first]
+        if n > first:
+            if self.typecode is None:
+                result.extend(buffer[:n - first])
+            else:
+                with memoryview(buffer) as view:
+                    result.frombytes(view[:n - first].cast('B'))
+        return result
+
+    def pop_many(self, n: int) -> Any:
+        result = self.peek_many(n)
+        n = len(result)
+        if self.typecode is None:
+            # Drop the references so popped objects can be freed
+            first = min(n, len(self.buffer) - self.head)
+            self.buffer[self.head:self.head + first] = [None] * first
+            self.buffer[:n - first] = [None] * (n - first)
+        self.head = (self.head + n) % len(self.buffer)
+        self.count -= n
+        return result
+
+    def segments(self) -> Tuple[memoryview, ...]:
+        if self.typecode is None:
+            raise ValueError('Invalid segments call, only typed buffers can be viewed as memory')
+        view = memoryview(self.buffer)
+        first = min(self.count, len(self.buffer) - self.head)
+        if first == self.count:
+            return (view[self.head:self.head + first],)
+        return view[self.head:self.head + first], view[:self.count - first]
+
+    def clear(self) -> None:
+        self.buffer = self._allocate(len(self.buffer))
+        self.head = 0
+        self.count = 0
+
+    def _allocate(self, capacity: int) -> Any:
+        if self.typecode is None:
+            return [None] * capacity
+        return array(self.typecode, [0]) * capacity
+
+    def _copy_in(self, start: int, values: Any, lo: int, hi: int) -> None:
+        if lo >= hi:
+            return
+        if self.typecode is None:
+            self.buffer[start:start + hi - lo] = values[lo:hi]
+        else:
+            with memoryview(self.buffer) as target, memoryview(values) as source:
+                target[start:start + hi - lo] = source[lo:hi]
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.buffer)
+        while capacity < needed:
+            capacity *= 2
+        items = self.peek_many(self.count)
+        self.buffer = self._allocate(capacity)
+        self.head = 0
+        self._copy_in(0, items, 0, len(items))
@@ -0,0 +1,182 @@
+import operator
+from collections import deque
+from typing import Any, Callable, Iterable, List, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+"""
+    Rolling aggregates over a fixed size window of a stream, all with amortized O(1) push and evict.
+
+    MonotonicQueue keeps only the values that can still become the window min (or max), in order,
+    so the answer is always at its front.
+
+    TwoStackQueue works for any associative operator (sum, gcd, string concatenation, ...). Like
+    MinStack, each AggregateStack stores next to every value the aggregate of everything below it.
+    New values go onto the back stack, evictions pop the front stack, and when the front stack is
+    empty the back stack is poured into it. The window aggregate combines the two stack tops.
+
+    SlidingWindow picks the right queue for an operator and rolling() computes all windows of an
+    array at once. With NumPy and a ufunc such as np.minimum, np.add or np.gcd it uses the van Herk /
+    Gil-Werman scheme: blockwise prefix and suffix accumulations, then one vectorized combine.
+"""
+
+class MonotonicQueue:
+
+    def __init__(self, kind: str = 'min'):
+        if kind not in ('min', 'max'):
+            raise ValueError(f'Invalid kind {kind}, expected min or max')
+        self.better = operator.lt if kind == 'min' else operator.gt
+        # (sequence number, value) of every value that can still be the answer
+        self.candidates = deque()
+        self.pushed = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return self.pushed - self.evicted
+
+    def push(self, value: Any) -> None:
+        candidates, better = self.candidates, self.better
+        while candidates and not better(candidates[-1][1], value):
+            candidates.pop()
+        candidates.append((self.pushed, value))
+        self.pushed += 1
+
+    def popleft(self) -> None:
+        if self.evicted == self.pushed:
+            raise IndexError('pop from an empty MonotonicQueue')
+        if self.candidates[0][0] == self.evicted:
+            self.candidates.popleft()
+        self.evicted += 1
+
+    def get(self) -> Union[Any, None]:
+        if self.candidates:
+            return self.candidates[0][1]
+        return None
+
+
+class AggregateStack:
+
+    def __init__(self, op: Callable[[Any, Any], Any], prepend: bool = False):
+        self.op = op
+        # The front stack of a queue holds older values above newer ones, so it folds from the left
+        self.prepend = prepend
+        self.data = []
+        self.aggregates = []
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def push(self, val: Any) -> None:
+        if not self.data:
+            self.aggregates.append(val)
+        elif self.prepend:
+            self.aggregates.append(self.op(val, self.aggregates[-1]))
+        else:
+            self.aggregates.append(self.op(self.aggregates[-1], val))
+        self.data.append(val)
+
+    def pop(self) -> Any:
+        self.aggregates.pop()
+        return self.data.pop()
+
+    def top(self) -> Union[Any, None]:
+        if self.data:
+            return self.data[-1]
+        return None
+
+    def aggregate(self) -> Union[Any, None]:
+        if self.aggregates:
+            return self.aggregates[-1]
+        return None
+
+
+class TwoStackQueue:
+
+    def __init__(self, op: Callable[[Any, Any], Any]):
+        self.op = op
+        self.front = AggregateStack(op, prepend=True)
+        self.back = AggregateStack(op)
+
+    def __len__(self) -> int:
+        return len(self.front) + len(self.back)
+
+    def push(self, value: Any) -> None:
+        self.back.push(value)
+
+    def popleft(self) -> Any:
+        if not self.front.data:
+            if not self.back.data:
+                raise IndexError('pop from an empty TwoStackQueue')
+            while self.back.data:
+                self.front.push(self.back.pop())
+        return self.front.pop()
+
+    def aggregate(self) -> Union[Any, None]:
+        if not self.front.data:
+            return self.back.aggregate()
+        if not self.back.data:
+            return self.front.aggregate()
+        return self.op(self.front.aggregate(), self.back.aggregate())
+
+
+OPERATORS = {'min': min, 'max': max, 'sum': operator.add}
+
+
+class SlidingWindow:
+
+    def __init__(self, window: int, op: Union[str, Callable[[Any, Any], Any]] = 'min'):
+        if window < 1:
+            raise ValueError('Invalid window, cannot be smaller than 1')
+        self.window = window
+        if op in ('min', 'max'):
+            self.queue = MonotonicQueue(op)
+            self.aggregate = self.queue.get
+        else:
+            self.queue = TwoStackQueue(OPERATORS.get(op, op))
+            self.aggregate = self.queue.aggregate
+
+    def push(self, value: Any) -> Any:
+        self.queue.push(value)
+        if len(self.queue) > self.window:
+            self.queue.popleft()
+        return self.aggregate()
+
+
+def rolling(values: Iterable[Any], window: int, op: Union[str, Callable] = 'min') -> Any:
+    """
+        Returns the aggregate of every full window, i.e. len(values) - window + 1 results.
+        NumPy ufuncs (or 'min', 'max', 'sum' when NumPy is installed) are vectorized; any other
+        associative callable runs through SlidingWindow.
+    """
+    if window < 1:
+        raise ValueError('Invalid window, cannot be smaller than 1')
+    ufunc = _as_ufunc(op)
+    if ufunc is None:
+        sliding = SlidingWindow(window, op)
+        results = [sliding.push(value) for value in values]
+        return results[window - 1:]
+
+    values = np.asarray(values)
+    n = len(values)
+    if n < window:
+        return values[:0]
+    blocks = -(-n // window)
+    padded = np.concatenate((values, np.repeat(values[-1:], blocks * window - n))).reshape(blocks, window)
+    prefix = ufunc.accumulate(padded, axis=1).ravel()
+    suffix = ufunc.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+    # A window starting inside a block spans the end of that block and the start of the next one
+    result = ufunc(suffix[:n - window + 1], prefix[window - 1:n])
+    # A window starting on a block boundary is exactly one block
+    result[::window] = suffix[:n - window + 1:window]
+    return result
+
+
+def _as_ufunc(op: Union[str, Callable]) -> Optional[Any]:
+    if np is None:
+        return None
+    if isinstance(op, np.ufunc):
+        return op
+    return {'min': np.minimum, 'max': np.maximum, 'sum': np.add}.get(op) if isinstance(op, str) else None
@@ -1,5 +1,6 @@
+import multiprocessing
 import unittest
-from queue_and_stack.circular_queue import CircularQueue
+from queue_and_stack.circular_queue import CircularQueue, SharedCircularQueue
 
 class TestCircularQueue(unittest.TestCase):
 
@@ -103,5 +104,152 @@ class TestCircularQueue(unittest.TestCase):
         self.assertFalse(q.deQueue())
 
 
+def produce_records(name, count):
+    queue = SharedCircularQueue.attach(name)
+    sent = 0
+    while sent < count:
+        if queue.put(sent, sent * 0.5):
+            sent += 1
+    queue.close()
+
+
+def produce_frames(name, count):
+    queue = SharedCircularQueue.attach(name)
+    sent = 0
+    while sent < count:
+        if queue.put_bytes(b'x' * (sent % 23)):
+            sent += 1
+    queue.close()
+
+
+class TestSharedCircularQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.queues = []
+
+    def tearDown(self):
+        for queue in self.queues:
+            queue.close()
+            queue.unlink()
+
+    def make_queue(self, *args, **kwargs):
+        queue = SharedCircularQueue(*args, **kwargs)
+        self.queues.append(queue)
+        return queue
+
+    def test_fixed_records(self):
+        """Tests that fixed size records wrap around and report full and empty."""
+        queue = self.make_queue(2, record_format='<qd')
+        self.assertTrue(queue.isEmpty())
+        self.assertTrue(queue.put(1, 0.5))
+        self.assertTrue(queue.put(2, 1.5))
+        self.assertTrue(queue.isFull())
+        self.assertFalse(queue.put(3, 2.5))
+        self.assertEqual(queue.get(), (1, 0.5))
+        self.assertTrue(queue.put(3, 2.5))
+        self.assertEqual(queue.get(), (2, 1.5))
+        self.assertEqual(queue.get(), (3, 2.5))
+        self.assertIsNone(queue.get())
+
+    def test_framed_bytes_wrap_around(self):
+        """Tests variable length frames that do not fit before the end of the ring."""
+        queue = self.make_queue(32)
+        self.assertTrue(queue.put_bytes(b'a' * 10))
+        self.assertTrue(queue.put_bytes(b'b' * 10))
+        self.assertFalse(queue.put_bytes(b'c' * 10))
+        self.assertEqual(queue.get_bytes(), b'a' * 10)
+        self.assertTrue(queue.put_bytes(b'c' * 6))   # skips the 4 bytes left at the end
+        self.assertEqual(queue.get_bytes(), b'b' * 10)
+        self.assertEqual(queue.get_bytes(), b'c' * 6)
+        self.assertIsNone(queue.get_bytes())
+        with self.assertRaises(ValueError):
+            queue.put_bytes(b'd' * 40)
+
+    def test_largest_payload_fits_into_an_empty_ring_anywhere(self):
+        """Tests that payloads up to max_payload always fit into an empty ring and larger ones raise."""
+        queue = self.make_queue(100)
+        self.assertEqual(queue.max_payload, 46)
+        for offset in range(100):
+            self.assertTrue(queue.put_bytes(b'o' * offset if offset <= 46 else b'o'))
+            queue.get_bytes()
+            self.assertTrue(queue.isEmpty())
+            self.assertTrue(queue.put_bytes(b'x' * 46))
+            self.assertEqual(queue.get_bytes(), b'x' * 46)
+        with self.assertRaises(ValueError):
+            queue.put_bytes(b'x' * 47)
+        with self.assertRaises(ValueError):
+            queue.put_bytes(b'x' * 90)
+
+    def test_peek_view_does_not_copy(self):
+        """Tests that the consumer reads frames straight from shared memory."""
+        queue = self.make_queue(64)
+        queue.put_bytes(b'hello')
+        view = queue.peek_view()
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(bytes(view), b'hello')
+        view.release()
+        queue.consume()
+        self.assertTrue(queue.isEmpty())
+        with self.assertRaises(ValueError):
+            queue.consume()
+
+    def test_consume_after_get_does_not_rewind(self):
+        """Tests that consume() refuses a peek that get() already read instead of moving head back."""
+        queue = self.make_queue(4, record_format='<i')
+        for value in (1, 2, 3):
+            queue.put(value)
+        queue.peek_view().release()
+        self.assertEqual(queue.get(), (1,))
+        self.assertEqual(queue.get(), (2,))
+        with self.assertRaises(ValueError):
+            queue.consume()
+        self.assertEqual(queue.get(), (3,))
+        self.assertIsNone(queue.get())
+
+    def test_attach_reads_layout(self):
+        """Tests that an attached queue sees the same records."""
+        queue = self.make_queue(4, record_format='<i')
+        queue.put(42)
+        other = SharedCircularQueue.attach(queue.name)
+        self.assertEqual(other.get(), (42,))
+        other.close()
+        self.assertTrue(queue.isEmpty())
+
+    def test_wrong_mode_raises_error(self):
+        """Tests that record calls on a byte queue and the opposite raise ValueError."""
+        queue = self.make_queue(16)
+        with self.assertRaises(ValueError):
+            queue.put(1)
+        records = self.make_queue(2, record_format='<i')
+        with self.assertRaises(ValueError):
+            records.put_bytes(b'x')
+
+    def test_cross_process_records(self):
+        """Tests a producer process feeding a consumer through the ring."""
+        queue = self.make_queue(8, record_format='<qd')
+        producer = multiprocessing.Process(target=produce_records, args=(queue.name, 2000))
+        producer.start()
+        received = []
+        while len(received) < 2000:
+            record = queue.get()
+            if record is not None:
+                received.append(record)
+        producer.join(10)
+        self.assertEqual(received, [(i, i * 0.5) for i in range(2000)])
+
+    def test_cross_process_frames(self):
+        """Tests framed bytes sent from another process."""
+        queue = self.make_queue(100)
+        producer = multiprocessing.Process(target=produce_frames, args=(queue.name, 300))
+        producer.start()
+        received = []
+        while len(received) < 300:
+            payload = queue.get_bytes()
+            if payload is not None:
+                received.append(payload)
+        producer.join(10)
+        self.assertEqual(received, [b'x' * (i % 23) for i in range(300)])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
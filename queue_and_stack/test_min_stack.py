@@ -1,5 +1,8 @@
+import math
+import random
 import unittest
-from queue_and_stack.min_stack import MinStack
+from array import array
+from queue_and_stack.min_stack import MinStack, CompactMinStack
 
 class TestMinStack(unittest.TestCase):
 
@@ -88,5 +91,78 @@ class TestMinStack(unittest.TestCase):
         self.assertEqual(stack.getMin(), 5)
 
 
+class TestCompactMinStack(unittest.TestCase):
+
+    def test_behaves_like_min_stack(self):
+        """Tests random pushes and pops against MinStack."""
+        rng = random.Random(3)
+        stack, compact = MinStack(), CompactMinStack()
+        for _ in range(2000):
+            if rng.random() < 0.6:
+                value = rng.randrange(100)
+                stack.push(value)
+                compact.push(value)
+            else:
+                stack.pop()
+                compact.pop()
+            self.assertEqual(compact.top(), stack.top())
+            self.assertEqual(compact.getMin(), stack.getMin())
+
+    def test_min_is_stored_as_runs(self):
+        """Tests that an unchanged min costs a count, not a copy."""
+        stack = CompactMinStack(track_max=True)
+        stack.push_many([5, 7, 9, 6, 3, 8])
+        self.assertEqual(stack.min.values, [5, 3])
+        self.assertEqual(list(stack.min.counts), [4, 2])
+        self.assertEqual(list(stack.max.counts), [1, 1, 4])
+        self.assertEqual(stack.getMax(), 9)
+        stack.pop_many(2)
+        self.assertEqual(stack.getMin(), 5)
+        self.assertEqual(stack.min.values, [5])
+
+    def test_max_and_pop_many(self):
+        """Tests getMax and that pop_many returns the popped values in stack order."""
+        stack = CompactMinStack(typecode='q', track_max=True)
+        stack.push_many(range(10))
+        self.assertIsInstance(stack.data, array)
+        self.assertEqual(stack.getMax(), 9)
+        self.assertEqual(list(stack.pop_many(3)), [7, 8, 9])
+        self.assertEqual((stack.getMin(), stack.getMax(), stack.top()), (0, 6, 6))
+        self.assertEqual(list(stack.pop_many(100)), list(range(7)))
+        self.assertIsNone(stack.getMin())
+        self.assertIsNone(stack.getMax())
+        stack.pop()  # Popping from an empty stack should not raise an error
+
+    def test_custom_aggregate(self):
+        """Tests a gcd aggregate, which rarely changes once it drops."""
+        stack = CompactMinStack(aggregate=math.gcd)
+        stack.push_many([24, 36, 60, 7, 14])
+        self.assertEqual(stack.getAggregate(), 1)
+        self.assertEqual(stack.aggregate.values, [24, 12, 1])
+        stack.push(3)
+        self.assertEqual(list(stack.aggregate.counts), [1, 2, 3])
+        stack.pop_many(3)
+        self.assertEqual(stack.getAggregate(), 12)
+        stack.push(3)
+        self.assertEqual(stack.aggregate.values, [24, 12, 3])
+        with self.assertRaises(ValueError):
+            CompactMinStack().getAggregate()
+        with self.assertRaises(ValueError):
+            CompactMinStack().getMax()
+
+    def test_push_many_matches_push(self):
+        """Tests that bulk and single pushes build the same runs."""
+        rng = random.Random(5)
+        values = [rng.randrange(50) for _ in range(500)]
+        bulk, single = CompactMinStack(typecode='q', track_max=True), CompactMinStack(typecode='q', track_max=True)
+        bulk.push_many(values[:1])
+        bulk.push_many(iter(values[1:]))
+        for value in values:
+            single.push(value)
+        for attr in ('min', 'max'):
+            self.assertEqual(getattr(bulk, attr).values, getattr(single, attr).values)
+            self.assertEqual(getattr(bulk, attr).counts, getattr(single, attr).counts)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
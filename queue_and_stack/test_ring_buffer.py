@@ -0,0 +1,91 @@
+import random
+import unittest
+from array import array
+from collections import deque
+from queue_and_stack.ring_buffer import RingBuffer
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_grow_keeps_order_across_wraparound(self):
+        """Tests that growing a wrapped buffer keeps the items in order."""
+        ring = RingBuffer(4)
+        ring.extend([1, 2, 3])
+        self.assertEqual(ring.popleft(), 1)
+        ring.extend([4, 5])          # wraps around
+        ring.extend([6, 7, 8])       # needs to grow
+        self.assertEqual(ring.capacity, 8)
+        self.assertEqual(list(ring), [2, 3, 4, 5, 6, 7, 8])
+        self.assertEqual(ring.pop_many(10), [2, 3, 4, 5, 6, 7, 8])
+        self.assertEqual(len(ring), 0)
+
+    def test_overwrite_drops_oldest(self):
+        """Tests that overwrite mode keeps only the newest items."""
+        ring = RingBuffer(3, overflow='overwrite')
+        ring.extend([1, 2])
+        ring.append(3)
+        ring.append(4)
+        self.assertEqual(list(ring), [2, 3, 4])
+        ring.extend([5, 6])
+        self.assertEqual(list(ring), [4, 5, 6])
+        ring.extend(range(10, 20))
+        self.assertEqual(list(ring), [17, 18, 19])
+        self.assertEqual(ring.dropped, 1 + 2 + 10)
+        self.assertEqual(ring.capacity, 3)
+
+    def test_typed_storage(self):
+        """Tests that typed buffers store and return arrays."""
+        ring = RingBuffer(4, typecode='d')
+        self.assertIsInstance(ring.buffer, array)
+        ring.extend([1.5, 2.5, 3.5])
+        self.assertEqual(ring.pop_many(2), array('d', [1.5, 2.5]))
+        ring.extend(array('d', [4.5, 5.5, 6.5]))
+        peeked = ring.peek_many(4)
+        self.assertEqual(peeked, array('d', [3.5, 4.5, 5.5, 6.5]))
+        self.assertEqual(len(ring), 4)
+
+    def test_segments_are_views(self):
+        """Tests that segments cover the items in order without copying."""
+        ring = RingBuffer(4, typecode='q')
+        ring.extend([1, 2, 3, 4])
+        ring.pop_many(3)
+        ring.extend([5, 6])
+        segments = ring.segments()
+        self.assertEqual([list(segment) for segment in segments], [[4], [5, 6]])
+        self.assertEqual(segments[0].obj, ring.buffer)
+        with self.assertRaises(ValueError):
+            RingBuffer(2).segments()
+
+    def test_popleft_from_empty_buffer(self):
+        """Tests that popping an empty buffer raises IndexError and pop_many returns nothing."""
+        ring = RingBuffer(2)
+        with self.assertRaises(IndexError):
+            ring.popleft()
+        self.assertEqual(ring.pop_many(3), [])
+
+    def test_invalid_arguments_raise_error(self):
+        """Tests capacity and overflow validation."""
+        with self.assertRaises(ValueError):
+            RingBuffer(0)
+        with self.assertRaises(ValueError):
+            RingBuffer(2, overflow='block')
+
+    def test_random_operations_against_deque(self):
+        """Tests random batches against collections.deque."""
+        rng = random.Random(9)
+        for typecode in (None, 'q'):
+            for overflow, maxlen in (('grow', None), ('overwrite', 16)):
+                ring, expected = RingBuffer(4 if maxlen is None else maxlen, typecode, overflow), deque(maxlen=maxlen)
+                for _ in range(500):
+                    if rng.random() < 0.5:
+                        values = [rng.randrange(1000) for _ in range(rng.randrange(20))]
+                        ring.extend(values)
+                        expected.extend(values)
+                    else:
+                        n = rng.randrange(20)
+                        popped = [expected.popleft() for _ in range(min(n, len(expected)))]
+                        self.assertEqual(list(ring.pop_many(n)), popped)
+                    self.assertEqual(list(ring), list(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
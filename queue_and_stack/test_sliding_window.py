@@ -0,0 +1,95 @@
+import math
+import random
+import unittest
+import unittest.mock
+import queue_and_stack.sliding_window
+from queue_and_stack.sliding_window import MonotonicQueue, TwoStackQueue, SlidingWindow, rolling
+
+class TestMonotonicQueue(unittest.TestCase):
+
+    def test_min_and_max_with_evictions(self):
+        """Tests the front value while values are pushed and evicted."""
+        low, high = MonotonicQueue('min'), MonotonicQueue('max')
+        for value in [4, 2, 5, 2, 7]:
+            low.push(value)
+            high.push(value)
+        self.assertEqual((low.get(), high.get()), (2, 7))
+        low.popleft()
+        low.popleft()  # evicts 4 and the first 2
+        self.assertEqual(low.get(), 2)
+        low.popleft()
+        low.popleft()
+        self.assertEqual(low.get(), 7)
+        low.popleft()
+        self.assertIsNone(low.get())
+        with self.assertRaises(IndexError):
+            low.popleft()
+
+
+class TestTwoStackQueue(unittest.TestCase):
+
+    def test_non_commutative_operator(self):
+        """Tests that the aggregate keeps queue order for string concatenation."""
+        q = TwoStackQueue(lambda a, b: a + b)
+        for value in 'abc':
+            q.push(value)
+        self.assertEqual(q.aggregate(), 'abc')
+        self.assertEqual(q.popleft(), 'a')
+        q.push('d')
+        self.assertEqual(q.aggregate(), 'bcd')
+        self.assertEqual([q.popleft() for _ in range(3)], ['b', 'c', 'd'])
+        self.assertIsNone(q.aggregate())
+        with self.assertRaises(IndexError):
+            q.popleft()
+
+
+class TestSlidingWindow(unittest.TestCase):
+
+    def naive(self, values, window, fold):
+        return [fold(values[i:i + window]) for i in range(len(values) - window + 1)]
+
+    def test_streaming_windows(self):
+        """Tests push results against recomputing every window."""
+        rng = random.Random(1)
+        values = [rng.randrange(-100, 100) for _ in range(300)]
+        for op, fold in (('min', min), ('max', max), ('sum', sum)):
+            window = SlidingWindow(7, op)
+            results = [window.push(value) for value in values][6:]
+            self.assertEqual(results, self.naive(values, 7, fold))
+
+    def test_rolling_matches_naive(self):
+        """Tests rolling() for many sizes, with and without NumPy."""
+        rng = random.Random(2)
+        for n in (1, 5, 17, 64):
+            values = [rng.randrange(-50, 50) for _ in range(n)]
+            for window in (1, 3, 8, n):
+                for op, fold in (('min', min), ('max', max), ('sum', sum)):
+                    expected = self.naive(values, window, fold)
+                    self.assertEqual(list(rolling(values, window, op)), expected)
+                    with unittest.mock.patch.object(queue_and_stack.sliding_window, 'np', None):
+                        self.assertEqual(list(rolling(values, window, op)), expected)
+
+    def test_rolling_custom_monoid(self):
+        """Tests rolling gcd through a plain callable."""
+        values = [12, 18, 24, 9, 27, 4]
+        self.assertEqual(rolling(values, 2, math.gcd), [6, 6, 3, 9, 1])
+
+    def test_rolling_with_numpy_ufunc(self):
+        """Tests the vectorized path with a ufunc that has no string alias."""
+        np = queue_and_stack.sliding_window.np
+        if np is None:
+            self.skipTest('NumPy is not installed')
+        values = np.array([12, 18, 24, 9, 27, 4])
+        self.assertEqual(list(rolling(values, 3, np.gcd)), [6, 3, 3, 1])
+
+    def test_window_longer_than_values(self):
+        """Tests that no full window gives no result and bad windows raise ValueError."""
+        self.assertEqual(len(rolling([1, 2], 3)), 0)
+        with self.assertRaises(ValueError):
+            rolling([1, 2], 0)
+        with self.assertRaises(ValueError):
+            SlidingWindow(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import queue
+import threading
+import unittest
+from queue_and_stack.threaded_queues import SPSCQueue, BoundedQueue
+
+class TestSPSCQueue(unittest.TestCase):
+
+    def test_try_put_and_try_get(self):
+        """Tests the non blocking fast path and the capacity limit."""
+        q = SPSCQueue(2)
+        self.assertTrue(q.try_put(1))
+        self.assertTrue(q.try_put(2))
+        self.assertFalse(q.try_put(3))
+        self.assertEqual(len(q), 2)
+        self.assertEqual(q.try_get(), 1)
+        self.assertTrue(q.try_put(3))
+        self.assertEqual([q.try_get(), q.try_get()], [2, 3])
+        self.assertIsNone(q.try_get())
+
+    def test_timeouts(self):
+        """Tests that blocking calls raise queue.Empty and queue.Full on timeout."""
+        q = SPSCQueue(1)
+        with self.assertRaises(queue.Empty):
+            q.get(timeout=0.01)
+        q.put(None)
+        with self.assertRaises(queue.Full):
+            q.put(2, timeout=0.01)
+        self.assertIsNone(q.get(timeout=0.01))
+
+    def test_producer_and_consumer_threads(self):
+        """Tests that one producer and one consumer pass every item in order."""
+        q = SPSCQueue(16)
+        received = []
+
+        def consume():
+            for _ in range(5000):
+                received.append(q.get(timeout=5))
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        for i in range(5000):
+            q.put(i, timeout=5)
+        consumer.join(10)
+        self.assertEqual(received, list(range(5000)))
+
+
+class TestBoundedQueue(unittest.TestCase):
+
+    def test_put_get_and_capacity(self):
+        """Tests FIFO order and the non blocking variants."""
+        q = BoundedQueue(2)
+        q.put(1)
+        q.put_nowait(2)
+        with self.assertRaises(queue.Full):
+            q.put_nowait(3)
+        with self.assertRaises(queue.Full):
+            q.put(3, timeout=0.01)
+        self.assertEqual(q.get(), 1)
+        self.assertEqual(q.get_nowait(), 2)
+        with self.assertRaises(queue.Empty):
+            q.get(timeout=0.01)
+
+    def test_get_many_across_wraparound(self):
+        """Tests that get_many drains a wrapped ring in order."""
+        q = BoundedQueue(4)
+        for item in range(4):
+            q.put(item)
+        self.assertEqual(q.get_many(3), [0, 1, 2])
+        for item in range(4, 7):
+            q.put(item)
+        self.assertEqual(q.get_many(10), [3, 4, 5, 6])
+        self.assertEqual(q.queue, [None] * 4)
+        with self.assertRaises(queue.Empty):
+            q.get_many(2, block=False)
+        with self.assertRaises(ValueError):
+            q.get_many(0)
+
+    def test_many_producers_and_consumers(self):
+        """Tests that every item is delivered exactly once under contention."""
+        q = BoundedQueue(8)
+        received = []
+        lock = threading.Lock()
+
+        def produce(offset):
+            for i in range(1000):
+                q.put(offset + i)
+
+        def consume():
+            while True:
+                try:
+                    items = q.get_many(5, timeout=0.2)
+                except queue.Empty:
+                    return
+                with lock:
+                    received.extend(items)
+
+        threads = [threading.Thread(target=produce, args=(p * 1000,)) for p in range(4)]
+        threads += [threading.Thread(target=consume) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(received), list(range(4000)))
+
+
+if __name__ == '__main__':
+    unittest.main()
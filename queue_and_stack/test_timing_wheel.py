@@ -0,0 +1,183 @@
+import asyncio
+import random
+import time
+import unittest
+from queue_and_stack.timing_wheel import AsyncTimingWheel, TimingWheel
+
+class TestTimingWheel(unittest.TestCase):
+
+    def test_fires_at_deadline(self):
+        """Tests that a timer fires on the advance that reaches its deadline and not before."""
+        wheel = TimingWheel(tick=1.0, slots=4, levels=2)
+        fired = []
+        wheel.schedule(3, fired.append, 'a')
+        self.assertEqual(wheel.advance(2.5), 0)
+        self.assertEqual(fired, [])
+        self.assertEqual(wheel.advance(3.0), 1)
+        self.assertEqual(fired, ['a'])
+        self.assertEqual(len(wheel), 0)
+
+    def test_cancel(self):
+        """Tests that cancelled timers never fire and cancelling twice is a no-op."""
+        wheel = TimingWheel(tick=1.0, slots=4, levels=2)
+        fired = []
+        near = wheel.schedule(2, fired.append, 'near')
+        far = wheel.schedule(100, fired.append, 'far')
+        self.assertTrue(wheel.cancel(near))
+        self.assertFalse(wheel.cancel(near))
+        self.assertTrue(wheel.cancel(far))
+        self.assertFalse(near.active)
+        wheel.advance(200)
+        self.assertEqual(fired, [])
+        self.assertEqual((len(wheel), wheel.counts), (0, [0, 0]))
+
+    def test_cascade_and_overflow_match_brute_force(self):
+        """Tests random schedules, cancels and advances against sorting by deadline."""
+        rng = random.Random(11)
+        wheel = TimingWheel(tick=1.0, slots=4, levels=3)
+        fired, pending, now = [], {}, 0
+        for step in range(3000):
+            roll = rng.random()
+            if roll < 0.5:
+                delay = rng.choice([rng.randrange(1, 5), rng.randrange(1, 70), rng.randrange(1, 300)])
+                timer = wheel.schedule(delay, fired.append, step)
+                pending[step] = (now + delay, timer)
+            elif roll < 0.65 and pending:
+                key = rng.choice(list(pending))
+                self.assertTrue(wheel.cancel(pending.pop(key)[1]))
+            else:
+                now += rng.randrange(0, 40)
+                expected = sorted((deadline, key) for key, (deadline, _) in pending.items() if deadline <= now)
+                del fired[:]
+                wheel.advance(now)
+                # Timers of the same tick may fire in any order
+                self.assertEqual(sorted(fired), sorted(key for _, key in expected))
+                self.assertEqual([pending[key][0] for key in fired], [deadline for deadline, _ in expected])
+                for _, key in expected:
+                    del pending[key]
+            self.assertEqual(len(wheel), len(pending))
+
+    def test_failing_callback_keeps_later_timers(self):
+        """Tests that timers due after a raising callback fire on the next advance."""
+        wheel = TimingWheel(tick=1.0, slots=4, levels=2)
+        fired = []
+        wheel.schedule(1, fired.append, 1)
+        wheel.schedule(1, lambda: 1 / 0)
+        wheel.schedule(1, fired.append, 2)
+        with self.assertRaises(ZeroDivisionError):
+            wheel.advance(1)
+        self.assertEqual(fired, [1])
+        self.assertEqual(wheel.advance(1), 1)
+        self.assertEqual(fired, [1, 2])
+
+    def test_cancel_from_a_callback_of_the_same_tick(self):
+        """Tests that a callback can cancel a timer due on the same tick, also after a raise."""
+        wheel = TimingWheel(tick=1.0, slots=4, levels=2)
+        fired, results = [], []
+        first = wheel.schedule(1, lambda: results.append(wheel.cancel(second)))
+        second = wheel.schedule(1, fired.append, 'second')
+        # Whichever fires first cancels the other
+        second.callback = lambda *args: results.append(wheel.cancel(first))
+        self.assertEqual(wheel.advance(1), 1)
+        self.assertEqual(results, [True])
+        self.assertEqual(fired, [])
+        self.assertFalse(first.active or second.active)
+
+        wheel.schedule(1, lambda: 1 / 0)
+        left = wheel.schedule(1, fired.append, 'left')
+        with self.assertRaises(ZeroDivisionError):
+            wheel.advance(2)
+        if fired:
+            # The timer fired before the raising one, nothing is left to cancel
+            self.assertFalse(wheel.cancel(left))
+        else:
+            self.assertTrue(left.active)
+            self.assertTrue(wheel.cancel(left))
+            self.assertEqual(wheel.advance(2), 0)
+            self.assertEqual(fired, [])
+
+    def test_next_wakeup(self):
+        """Tests that the planned wakeup never lies after the earliest deadline."""
+        wheel = TimingWheel(tick=1.0, slots=4, levels=3)
+        self.assertIsNone(wheel.next_wakeup())
+        wheel.schedule(6, print)
+        self.assertEqual(wheel.next_wakeup(), 4.0)
+        wheel.schedule(2, print)
+        self.assertEqual(wheel.next_wakeup(), 2.0)
+
+    def test_invalid_arguments(self):
+        """Tests that a wheel without ticks or slots is refused."""
+        with self.assertRaises(ValueError):
+            TimingWheel(tick=0)
+        with self.assertRaises(ValueError):
+            TimingWheel(slots=1)
+        with self.assertRaises(ValueError):
+            TimingWheel(slots=12)
+
+
+class TestAsyncTimingWheel(unittest.TestCase):
+
+    def test_call_later_from_the_event_loop(self):
+        """Tests that the driver fires timers in order and wakes up for earlier ones."""
+        async def main():
+            wheels = AsyncTimingWheel(tick=0.001)
+            wheels.start()
+            fired = []
+            done = asyncio.get_running_loop().create_future()
+            wheels.call_later(0.05, lambda: done.set_result(None))
+            await asyncio.sleep(0.005)
+            wheels.call_later(0.01, fired.append, 'early')
+            cancelled = wheels.call_later(0.02, fired.append, 'cancelled')
+            wheels.cancel(cancelled)
+            await asyncio.wait_for(done, 1)
+            await wheels.stop()
+            return fired
+
+        self.assertEqual(asyncio.run(main()), ['early'])
+
+    def test_cancel_from_a_callback_of_the_same_tick(self):
+        """Tests that the driver honours a cancel made by a callback of the same tick."""
+        async def main():
+            wheels = AsyncTimingWheel(tick=0.01)
+            results, timers = [], []
+            done = asyncio.get_running_loop().create_future()
+
+            def cancel_other(index):
+                results.append(wheels.cancel(timers[1 - index]))
+
+            timers.append(wheels.call_later(0.02, cancel_other, 0))
+            timers.append(wheels.call_later(0.02, cancel_other, 1))
+            wheels.call_later(0.06, lambda: done.set_result(None))
+            wheels.start()
+            await asyncio.wait_for(done, 1)
+            await wheels.stop()
+            return results
+
+        self.assertEqual(asyncio.run(main()), [True])
+
+    def test_call_later_does_not_fire_due_timers(self):
+        """Tests that call_later() leaves due timers to run() and still counts its delay from now."""
+        async def main():
+            loop = asyncio.get_running_loop()
+            wheels = AsyncTimingWheel(tick=0.001)
+            fired = []
+
+            def fail():
+                fired.append('fail')
+                raise RuntimeError('callback failed')
+
+            wheels.call_later(0.001, fail)
+            wheels.call_later(0.002, fired.append, 'due')
+            # Block the loop past both deadlines, run() has not advanced the wheel yet
+            time.sleep(0.02)
+            now = loop.time()
+            late = wheels.call_later(0.01, fired.append, 'late')
+            self.assertEqual(fired, [])
+            self.assertGreaterEqual(wheels.wheel.start + late.deadline * wheels.wheel.tick, now + 0.01)
+            return fired
+
+        self.assertEqual(asyncio.run(main()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
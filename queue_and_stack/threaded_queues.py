@@ -0,0 +1,147 @@
+import queue
+import threading
+import time
+from typing import Any, List, Optional
+
+"""
+    Queues for threaded pipelines, both with blocking put/get that raise queue.Full/queue.Empty on
+    timeout like queue.Queue.
+
+    SPSCQueue is a ring for exactly one producer thread and one consumer thread. The producer only
+    writes tail and the consumer only writes head, and a single list store or attribute store is
+    atomic under the GIL, so the fast path takes no lock. When the ring is full or empty the
+    waiting side backs off with short sleeps instead of sleeping on a condition.
+
+    BoundedQueue is a bounded multi producer, multi consumer queue over a ring with one lock and
+    two conditions. get_many(max_n) drains up to max_n items per lock acquisition, which cuts the
+    locking cost per item for consumers that can work in batches.
+"""
+
+class SPSCQueue:
+
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError('Invalid capacity, cannot be smaller than 1')
+        # One spare slot tells a full ring apart from an empty one without a shared counter
+        self.size = k + 1
+        self.queue = [None] * self.size
+        self.head = 0
+        self.tail = 0
+
+    def __len__(self) -> int:
+        return (self.tail - self.head) % self.size
+
+    def try_put(self, item: Any) -> bool:
+        tail = self.tail
+        next_tail = tail + 1 if tail + 1 < self.size else 0
+        if next_tail == self.head:
+            return False
+        self.queue[tail] = item
+        self.tail = next_tail
+        return True
+
+    def try_get(self, default: Any = None) -> Any:
+        head = self.head
+        if head == self.tail:
+            return default
+        item = self.queue[head]
+        self.queue[head] = None
+        self.head = head + 1 if head + 1 < self.size else 0
+        return item
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = 0.0
+        while not self.try_put(item):
+            delay = _back_off(delay, deadline, queue.Full)
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = 0.0
+        while True:
+            item = self.try_get(_MISSING)
+            if item is not _MISSING:
+                return item
+            delay = _back_off(delay, deadline, queue.Empty)
+
+
+class BoundedQueue:
+
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError('Invalid capacity, cannot be smaller than 1')
+        self.size = k
+        self.queue = [None] * k
+        self.head = 0
+        self.count = 0
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.count
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None) -> None:
+        with self.not_full:
+            full = self.count == self.size
+            if full and not self._wait(self.not_full, lambda: self.count < self.size, block, timeout):
+                raise queue.Full
+            self.queue[(self.head + self.count) % self.size] = item
+            self.count += 1
+            self.not_empty.notify()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        with self.not_empty:
+            empty = self.count == 0
+            if empty and not self._wait(self.not_empty, lambda: self.count > 0, block, timeout):
+                raise queue.Empty
+            item = self.queue[self.head]
+            self.queue[self.head] = None
+            self.head = (self.head + 1) % self.size
+            self.count -= 1
+            self.not_full.notify()
+            return item
+
+    def get_many(self, max_n: int, block: bool = True, timeout: Optional[float] = None) -> List[Any]:
+        if max_n < 1:
+            raise ValueError('Invalid batch size, cannot be smaller than 1')
+        with self.not_empty:
+            empty = self.count == 0
+            if empty and not self._wait(self.not_empty, lambda: self.count > 0, block, timeout):
+                raise queue.Empty
+            n = min(max_n, self.count)
+            # At most two contiguous slices, one on each side of the wraparound
+            first = min(n, self.size - self.head)
+            items = self.queue[self.head:self.head + first] + self.queue[:n - first]
+            self.queue[self.head:self.head + first] = [None] * first
+            self.queue[:n - first] = [None] * (n - first)
+            self.head = (self.head + n) % self.size
+            self.count -= n
+            self.not_full.notify(n)
+            return items
+
+    def put_nowait(self, item: Any) -> None:
+        self.put(item, block=False)
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    @staticmethod
+    def _wait(condition: threading.Condition, ready, block: bool, timeout: Optional[float]) -> bool:
+        if not block:
+            return False
+        if timeout is not None and timeout < 0:
+            raise ValueError('Invalid timeout, cannot be smaller than 0')
+        return condition.wait_for(ready, timeout)
+
+
+_MISSING = object()
+
+
+def _back_off(delay: float, deadline: Optional[float], error: type) -> float:
+    if deadline is not None and time.monotonic() >= deadline:
+        raise error
+    # Yield first, then sleep up to a millisecond so an idle side does not burn a core
+    time.sleep(delay)
+    return min(delay * 2 or 1e-6, 1e-3)
@@ -0,0 +1,240 @@
+import asyncio
+import math
+from collections import deque
+from typing import Any, Callable, Optional
+
+"""
+    A hierarchical timing wheel for large numbers of timeouts.
+
+    Like CircularQueue, every wheel is a fixed ring of slots addressed modulo its size, which must
+    be a power of two here. Level 0 has one slot per tick, and every slot of level l spans
+    slots ** l ticks. A timer goes to the lowest level whose span covers its delay, in the slot of
+    its deadline, so schedule() and cancel() are O(1) dict operations no matter how many timers are
+    pending. Timers further away than the top level can hold wait in an overflow dict.
+
+    advance(now) moves the wheel tick by tick up to now. Whenever a level wraps, the timers of the
+    next slot of the level above are cascaded down, and the level 0 slot of every tick is fired in
+    bulk. Ticks whose lower levels are empty are skipped, so advancing over an idle stretch costs
+    time proportional to the number of cascades, not to the number of ticks. Delays are counted
+    from the tick of the last advance() and rounded up to whole ticks. Timers fire in deadline
+    order; timers that share a tick fire in no particular order.
+
+    If a callback raises, the exception propagates out of advance() and the timers that were due
+    after it stay queued. The next advance() fires them first. A timer can be cancelled until its
+    callback runs, also by another callback of the same tick.
+
+    AsyncTimingWheel drives a wheel from an asyncio event loop. It sleeps until the next level 0
+    slot that holds a timer, or until the next cascade, and call_later() wakes it up when an earlier
+    timer arrives. call_later() counts the delay from the loop's clock rather than from the last
+    tick the wheel reached, and never fires callbacks itself, that is left to run().
+"""
+
+class Timer:
+    __slots__ = ('deadline', 'callback', 'args', 'slot', 'level')
+
+    def __init__(self, deadline: int, callback: Callable[..., Any], args: tuple):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        # The dict the timer currently sits in, the wheel's due queue once its tick was reached,
+        # None once it fired or was cancelled
+        self.slot = None
+        self.level = 0
+
+    @property
+    def active(self) -> bool:
+        return self.slot is not None
+
+
+class TimingWheel:
+
+    def __init__(self, tick: float = 0.001, slots: int = 256, levels: int = 4, start: float = 0.0):
+        if tick <= 0:
+            raise ValueError('Invalid tick, must be larger than 0')
+        if slots < 2 or slots & (slots - 1) or levels < 1:
+            raise ValueError('Invalid wheel, needs a power of two slots (at least 2) and 1 level')
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        # With a power of two slots, levels and slot indices are bit shifts and masks
+        self.shift = slots.bit_length() - 1
+        self.mask = slots - 1
+        self.start = start
+        self.current = 0
+        self.wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self.counts = [0] * levels
+        self.overflow = {}
+        self.due = deque()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> Timer:
+        ticks = math.ceil(delay / self.tick)
+        timer = Timer(self.current + (ticks if ticks > 0 else 1), callback, args)
+        self._insert(timer)
+        self.size += 1
+        return timer
+
+    def cancel(self, timer: Timer) -> bool:
+        slot = timer.slot
+        if slot is None:
+            return False
+        if slot is self.due:
+            # Already taken off the wheel, _fire_due() skips it
+            timer.slot = None
+            return True
+        del slot[timer]
+        timer.slot = None
+        self.size -= 1
+        if timer.level < self.levels:
+            self.counts[timer.level] -= 1
+        return True
+
+    def advance(self, now: float) -> int:
+        target = math.floor((now - self.start) / self.tick)
+        fired = self._fire_due()
+        slots = self.slots
+        while self.current < target:
+            if not self.size:
+                self.current = target
+                break
+            # Skip ahead to the next tick that fires a level 0 slot or cascades a higher level
+            level = 0
+            while level < self.levels and not self.counts[level]:
+                level += 1
+            step = slots ** min(level, self.levels)
+            tick = min(target, (self.current // step + 1) * step) if level else self.current + 1
+            self.current = tick
+            self._cascade(tick)
+            bucket = self.wheels[0][tick % slots]
+            if bucket:
+                self.counts[0] -= len(bucket)
+                self.size -= len(bucket)
+                due = self.due
+                for timer in bucket:
+                    timer.slot = due
+                due.extend(bucket)
+                bucket.clear()
+                fired += self._fire_due()
+        return fired
+
+    def next_wakeup(self) -> Optional[float]:
+        """
+            Returns the time of the next tick that can fire a timer or cascade one, or None when no
+            timer is pending. It never lies after the earliest deadline.
+        """
+        if self.due:
+            return self.start + self.current * self.tick
+        if not self.size:
+            return None
+        slots = self.slots
+        if self.counts[0]:
+            level0 = self.wheels[0]
+            for tick in range(self.current + 1, self.current + slots + 1):
+                if level0[tick % slots]:
+                    break
+            # A cascade before that tick may still bring an earlier timer down
+            tick = min(tick, (self.current // slots + 1) * slots)
+        else:
+            level = 1
+            while level < self.levels and not self.counts[level]:
+                level += 1
+            step = slots ** level
+            tick = (self.current // step + 1) * step
+        return self.start + tick * self.tick
+
+    def _fire_due(self) -> int:
+        fired, due = 0, self.due
+        while due:
+            timer = due.popleft()
+            if timer.slot is not due:
+                continue
+            timer.slot = None
+            timer.callback(*timer.args)
+            fired += 1
+        return fired
+
+    def _insert(self, timer: Timer) -> None:
+        deadline = timer.deadline
+        level = ((deadline - self.current).bit_length() - 1) // self.shift if deadline > self.current else 0
+        if level >= self.levels:
+            level = self.levels
+            slot = self.overflow
+        else:
+            slot = self.wheels[level][(deadline >> self.shift * level) & self.mask]
+            self.counts[level] += 1
+        slot[timer] = None
+        timer.slot = slot
+        timer.level = level
+
+    def _cascade(self, tick: int) -> None:
+        slots = self.slots
+        if self.overflow and tick % slots ** self.levels == 0:
+            pending, self.overflow = self.overflow, {}
+            for timer in pending:
+                self._insert(timer)
+        for level in range(self.levels - 1, 0, -1):
+            span = slots ** level
+            if tick % span:
+                continue
+            bucket = self.wheels[level][(tick // span) % slots]
+            if bucket:
+                self.counts[level] -= len(bucket)
+                timers = list(bucket)
+                bucket.clear()
+                for timer in timers:
+                    self._insert(timer)
+
+
+class AsyncTimingWheel:
+
+    def __init__(self, tick: float = 0.001, slots: int = 256, levels: int = 4,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop or asyncio.get_running_loop()
+        self.wheel = TimingWheel(tick, slots, levels, start=self.loop.time())
+        self.wakeup = asyncio.Event()
+        self.planned: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.wheel)
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> Timer:
+        wheel = self.wheel
+        # The wheel may lag behind the clock until run() catches up, add the lag so it does not
+        # shorten the delay
+        lag = self.loop.time() - (wheel.start + wheel.current * wheel.tick)
+        timer = wheel.schedule(delay + max(lag, 0.0), callback, *args)
+        if self.planned is None or wheel.start + timer.deadline * wheel.tick < self.planned:
+            self.wakeup.set()
+        return timer
+
+    def cancel(self, timer: Timer) -> bool:
+        return self.wheel.cancel(timer)
+
+    def start(self) -> asyncio.Task:
+        if self.task is None or self.task.done():
+            self.task = self.loop.create_task(self.run())
+        return self.task
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self) -> None:
+        while True:
+            self.wheel.advance(self.loop.time())
+            self.planned = self.wheel.next_wakeup()
+            self.wakeup.clear()
+            timeout = None if self.planned is None else max(0.0, self.planned - self.loop.time())
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass